@@ -25,13 +25,17 @@ interface RateLimitStats {
   requestsToday: number;
   rateLimitHits: number;
   fallbackUsage: number;
+  cacheHits?: number;
   costToday: number;
+  tokensToday?: number;
   modelBreakdown: {
     modelName: string;
     requests: number;
     fallbacks: number;
     errors: number;
     avgResponseTime: number;
+    tokens?: number;
+    cost?: number;
   }[];
   hourlyBreakdown: {
     hour: string;
@@ -45,6 +49,18 @@ interface RateLimitStats {
     responseTime: number;
     error: boolean;
   }[];
+  providerHealth?: {
+    provider: string;
+    model: string;
+    state: 'closed' | 'open' | 'half-open';
+    requests: number;
+    errorRate: number;
+    avgLatencyMs: number;
+    p95LatencyMs: number;
+    consecutiveFailures: number;
+    openedAt: string | null;
+    lastError: string | null;
+  }[];
 }
 
 // Free tier limits for each provider
@@ -205,6 +221,7 @@ export default function AdminDashboard() {
                 <h3 className="text-gray-400 text-sm">Fallback Requests</h3>
                 <div className="mt-2 text-xs text-gray-500">
                   {((stats.fallbackUsage / stats.requestsToday) * 100).toFixed(1)}% fallback rate
+                  {stats.cacheHits ? ` · ${stats.cacheHits} cache hits` : ''}
                 </div>
               </div>
 
@@ -217,6 +234,7 @@ export default function AdminDashboard() {
                 <h3 className="text-gray-400 text-sm">Cost Today</h3>
                 <div className="mt-2 text-xs text-gray-500">
                   ${(stats.costToday / stats.requestsToday).toFixed(4)} per request
+                  {stats.tokensToday ? ` · ${stats.tokensToday.toLocaleString()} tokens` : ''}
                 </div>
               </div>
             </div>
@@ -384,6 +402,7 @@ export default function AdminDashboard() {
                       <th className="text-right py-3 px-4">Fallbacks</th>
                       <th className="text-right py-3 px-4">Errors</th>
                       <th className="text-right py-3 px-4">Avg Response</th>
+                      <th className="text-right py-3 px-4">Tokens</th>
                       <th className="text-right py-3 px-4">Status</th>
                     </tr>
                   </thead>
@@ -403,6 +422,7 @@ export default function AdminDashboard() {
                           </span>
                         </td>
                         <td className="py-3 px-4 text-right">{model.avgResponseTime.toFixed(2)}s</td>
+                        <td className="py-3 px-4 text-right text-gray-400">{(model.tokens || 0).toLocaleString()}</td>
                         <td className="py-3 px-4 text-right">
                           {model.errors === 0 ? (
                             <CheckCircle size={20} className="text-green-500 inline" />
@@ -417,6 +437,63 @@ export default function AdminDashboard() {
               </div>
             </div>
 
+            {/* Provider Health (circuit breakers) */}
+            {stats.providerHealth && stats.providerHealth.length > 0 && (
+              <div className="bg-black/40 border border-gray-800 rounded-xl p-6 mb-8">
+                <h2 className="text-2xl font-bold mb-6 flex items-center gap-2">
+                  <Zap className="text-orange-500" />
+                  Provider Health (Last 5 Minutes)
+                </h2>
+
+                <div className="overflow-x-auto">
+                  <table className="w-full">
+                    <thead>
+                      <tr className="border-b border-gray-800">
+                        <th className="text-left py-3 px-4">Provider</th>
+                        <th className="text-left py-3 px-4">Model</th>
+                        <th className="text-right py-3 px-4">Requests</th>
+                        <th className="text-right py-3 px-4">Error Rate</th>
+                        <th className="text-right py-3 px-4">Avg / p95</th>
+                        <th className="text-right py-3 px-4">Breaker</th>
+                      </tr>
+                    </thead>
+                    <tbody>
+                      {stats.providerHealth.map((entry) => (
+                        <tr
+                          key={`${entry.provider}:${entry.model}`}
+                          className="border-b border-gray-800/50 hover:bg-gray-900/30"
+                          title={entry.lastError || undefined}
+                        >
+                          <td className="py-3 px-4 font-semibold">{entry.provider}</td>
+                          <td className="py-3 px-4">{entry.model}</td>
+                          <td className="py-3 px-4 text-right">{entry.requests}</td>
+                          <td className="py-3 px-4 text-right">
+                            <span className={entry.errorRate > 0 ? 'text-red-500' : 'text-gray-500'}>
+                              {(entry.errorRate * 100).toFixed(0)}%
+                            </span>
+                          </td>
+                          <td className="py-3 px-4 text-right">
+                            {(entry.avgLatencyMs / 1000).toFixed(2)}s / {(entry.p95LatencyMs / 1000).toFixed(2)}s
+                          </td>
+                          <td className="py-3 px-4 text-right">
+                            <span className={
+                              entry.state === 'closed'
+                                ? 'text-green-500'
+                                : entry.state === 'open'
+                                ? 'text-red-500'
+                                : 'text-orange-500'
+                            }>
+                              {entry.state}
+                            </span>
+                          </td>
+                        </tr>
+                      ))}
+                    </tbody>
+                  </table>
+                </div>
+              </div>
+            )}
+
             {/* Hourly Breakdown */}
             <div className="bg-black/40 border border-gray-800 rounded-xl p-6 mb-8">
               <h2 className="text-2xl font-bold mb-6 flex items-center gap-2">
@@ -1,10 +1,19 @@
-import { NextResponse } from "next/server";
-import { a4fClient, AI_MODELS } from "@/lib/a4fClient";
-import { openRouterClient } from "@/lib/openRouterClient";
+import { after, NextResponse } from "next/server";
+import { createHash } from "crypto";
+import { AI_MODELS, AIModel } from "@/lib/a4fClient";
 import { callGemini } from "@/lib/googleClient";
-import { callGroq } from "@/lib/groqClient";
 import { checkIpRateLimit, checkUserRateLimit, getClientIp } from "@/lib/rateLimit";
-import { logApiRequest } from "@/lib/apiLogger";
+import { drainRateLimitReconciles } from "@/lib/localRateLimit";
+import { enqueueApiLogs, flushApiLogs, logApiRequest } from "@/lib/apiLogger";
+import { hedge, isHedgingEnabled } from "@/lib/hedging";
+import { Provider } from "@/lib/providerHealth";
+import { completeWithRoute, getRoutes, ModelRoute, planRoutes, PROVIDER_LIMITS, RouteCompletion } from "@/lib/modelRouter";
+import { callCost, CallTiming, TokenUsage } from "@/lib/usage";
+import { getCachedResponse, isCacheable, responseCacheKey, setCachedResponse } from "@/lib/responseCache";
+import { singleFlight } from "@/lib/singleFlight";
+import { getVisionAnalysis, imageContentHash, setVisionAnalysis } from "@/lib/visionCache";
+import { BattleRequestError, imageContentPart, readBattleRequest } from "@/lib/attachments";
+import { estimateTokens, fitDocument, fitHistory } from "@/lib/tokenBudget";
 import { auth } from "@clerk/nextjs/server";
 
 // Helper function to clean tokenizer artifacts and special tokens from responses
@@ -29,10 +38,386 @@ function cleanModelResponse(text: string): string {
     .trim();
 }
 
+type BattleResult = {
+  model: string;
+  name: string;
+  text: string;
+  usedFallback?: boolean;
+  cached?: boolean;
+  provider?: Provider; // Provider that produced the answer
+  usage?: TokenUsage; // Tokens of the winning provider call
+  timing?: CallTiming;
+  cost?: number; // USD
+};
+
+interface BattleContext {
+  prompt: string;
+  conversationHistory: any[];
+  attachments?: any[];
+  hasImages: boolean;
+  visionAnalysis: string;
+  // Hash of the request (prompt, history, attachments), for deduplicating identical calls
+  requestDigest: string;
+}
+
+// A battle before the image analysis (if any) has finished
+type PendingBattle = Omit<BattleContext, 'visionAnalysis'>;
+
+// Run one model of the battle; never throws, errors become a "⚠️ Error" result
+async function runModel(
+  modelInfo: AIModel,
+  { prompt, conversationHistory, attachments, hasImages, visionAnalysis }: BattleContext
+): Promise<BattleResult> {
+  try {
+    // Build messages based on model capabilities
+    const modelMessages: any[] = [];
+    
+    // Process conversation history (last 4 messages, trimmed to the model's token budget)
+    const recentHistory = fitHistory(conversationHistory, modelInfo.id, 4, estimateTokens(prompt) + 500);
+    {
+      for (const historyItem of recentHistory) {
+        if (historyItem.role === 'user' && Array.isArray(historyItem.content)) {
+          // This is multimodal content
+          if (modelInfo.supportsVision) {
+            // Vision model: send without timestamp
+            modelMessages.push({
+              role: historyItem.role,
+              content: historyItem.content
+            });
+          } else {
+            // Non-vision model: convert to text-only
+            let textContent = '';
+            let hasImage = false;
+            
+            for (const part of historyItem.content) {
+              if (part.type === 'text') {
+                textContent += part.text;
+              } else if (part.type === 'image_url') {
+                hasImage = true;
+              }
+            }
+            
+            if (hasImage) {
+              textContent += '\n\n[Note: Previous message contained an image that was analyzed]';
+            }
+            
+            modelMessages.push({
+              role: historyItem.role,
+              content: textContent
+            });
+          }
+        } else {
+          // Regular text message - strip timestamp
+          modelMessages.push({
+            role: historyItem.role,
+            content: historyItem.content
+          });
+        }
+      }
+    }
+    
+    // Process current message with attachments
+    let userContent: any = prompt;
+    
+    if (attachments && attachments.length > 0) {
+      if (modelInfo.supportsVision) {
+        // Vision model: use multimodal format
+        const contentParts: any[] = [{ type: "text", text: prompt }];
+        
+        for (const attachment of attachments) {
+          if (attachment.type === 'image') {
+            contentParts.push(imageContentPart(attachment));
+          } else if (attachment.type === 'document') {
+            contentParts[0].text += `\n\n[File: ${attachment.filename}]\n${fitDocument(attachment.data, modelInfo.id)}`;
+          }
+        }
+        
+        userContent = contentParts;
+      } else {
+        // Non-vision model: use Gemini's analysis
+        let textContent = prompt;
+        
+        // Add Gemini's vision analysis if available
+        if (hasImages && visionAnalysis) {
+          // Seamlessly integrate the image description into the prompt
+          textContent = `${prompt}\n\n[Context: The image shows: ${visionAnalysis}]`;
+        }
+        
+        // Add document content
+        for (const attachment of attachments) {
+          if (attachment.type === 'document') {
+            textContent += `\n\n[File: ${attachment.filename}]\n${fitDocument(attachment.data, modelInfo.id)}`;
+          }
+        }
+        
+        userContent = textContent;
+      }
+    }
+    
+    modelMessages.push({ role: "user", content: userContent });
+
+    // Routes to try, in order (weighted pick, open circuit breakers last)
+    const [first, second] = planRoutes(modelInfo.id);
+    const options = { temperature: 0.5, maxTokens: 500 };
+    const hedged = !!second && isHedgingEnabled();
+
+    const answer = (route: ModelRoute, completion: RouteCompletion): BattleResult => {
+      const { usage, timing } = completion;
+      console.log(`⏱️ ${modelInfo.name} via ${route.provider}: queue ${timing.queueMs}ms, TTFT ${timing.ttftMs}ms, total ${timing.totalMs}ms, ${usage.promptTokens}+${usage.completionTokens} tokens${usage.estimated ? ' (estimated)' : ''}`);
+      return {
+        model: modelInfo.id,
+        name: modelInfo.name,
+        text: cleanModelResponse(completion.text || "No response"),
+        usedFallback: route.isFallback,
+        provider: route.provider,
+        usage,
+        timing,
+        cost: callCost(route.modelId, usage),
+      };
+    };
+
+    console.log(`${modelInfo.name}: routing to ${first.provider} (${first.modelId})${second ? `, then ${second.provider} (${second.modelId})` : ''}`);
+
+    try {
+      // Hedging: fire the second route in parallel once the first is slower
+      // than its usual latency, and keep whichever answers first
+      if (hedged) {
+        const { value: completion, usedFallback } = await hedge({
+          key: `${first.provider}:${first.modelId}`,
+          timeoutMs: PROVIDER_LIMITS[first.provider].timeoutMs,
+          primary: (signal) => completeWithRoute(first, modelMessages, { ...options, signal }),
+          fallback: (signal) => completeWithRoute(second, modelMessages, { ...options, signal }),
+          isGoodResult: (result) => result.text.trim().length > 0,
+        });
+
+        return answer(usedFallback ? second : first, completion);
+      }
+
+      return answer(first, await completeWithRoute(first, modelMessages, options));
+    } catch (apiError: any) {
+      // Without hedging, try the second route after the first fails or times out
+      if (second && !hedged) {
+        console.log(`${modelInfo.name}: ${first.provider} failed/timed out, trying ${second.provider}...`);
+        
+        try {
+          return answer(second, await completeWithRoute(second, modelMessages, options));
+        } catch (fallbackError: any) {
+          console.error(`${modelInfo.name}: ${second.provider} also failed:`, fallbackError);
+          // If fallback fails, throw the original error
+          throw apiError;
+        }
+      }
+
+      // If it's a vision model with images, try again without images
+      if (modelInfo.supportsVision && hasImages && apiError.status === 500) {
+        console.log(`${modelInfo.name}: Retrying without images due to API error`);
+        
+        try {
+          // Retry with text-only
+          const textOnlyMessages = modelMessages.map(msg => {
+            if (Array.isArray(msg.content)) {
+              // Extract only text parts
+              const textParts = msg.content.filter((part: any) => part.type === 'text');
+              return {
+                ...msg,
+                content: textParts.map((p: any) => p.text).join('\n') + '\n\n[Note: Image processing temporarily unavailable for this model]'
+              };
+            }
+            return msg;
+          });
+
+          const completion = await completeWithRoute(first, textOnlyMessages, options);
+
+          return {
+            ...answer(first, completion),
+            text: `⚠️ Image processing temporarily unavailable. Text response:\n\n${cleanModelResponse(completion.text || "No response")}`,
+          };
+        } catch {
+          // If retry also fails, return error
+          throw apiError;
+        }
+      }
+      
+      // If not a vision model or retry failed, throw the error
+      throw apiError;
+    }
+  } catch (error: any) {
+    // Enhanced error logging for GPT-5
+    if (modelInfo.id === 'provider-5/gpt-5-nano') {
+      console.error(`GPT-5 Error Details:`, {
+        status: error.status,
+        code: error.code,
+        type: error.type,
+        error: error.error,
+        message: error.message,
+        fullError: JSON.stringify(error, null, 2)
+      });
+    } else {
+      console.error(`Error with model ${modelInfo.id}:`, error);
+    }
+    
+    // Provide more helpful error messages
+    let errorMessage = "Failed to get response";
+    
+    if (error.status === 500) {
+      errorMessage = "The AI service is temporarily unavailable. Please try again.";
+    } else if (error.status === 429) {
+      errorMessage = "Rate limit reached. Please wait a moment and try again.";
+    } else if (error.code === 'ECONNABORTED' || error.code === 'ETIMEDOUT' || error.message === 'TIMEOUT') {
+      errorMessage = "Request timed out. The model may be overloaded.";
+    } else if (error.message) {
+      errorMessage = error.message;
+    }
+    
+    return {
+      model: modelInfo.id,
+      name: modelInfo.name,
+      text: `⚠️ Error: ${errorMessage}`,
+    };
+  }
+}
+
+// runModel() with concurrent identical calls collapsed into one upstream request.
+// Each caller gets its own copy of the result and logs it separately; only the
+// caller that made the upstream call is charged its tokens and cost.
+async function runModelShared(modelInfo: AIModel, battle: BattleContext): Promise<BattleResult> {
+  let ranUpstream = false;
+  const result = await singleFlight(`${modelInfo.id}:${battle.requestDigest}`, () => {
+    ranUpstream = true;
+    return runModel(modelInfo, battle);
+  });
+  return ranUpstream ? { ...result } : { ...result, usage: undefined, timing: undefined, cost: 0 };
+}
+
+// runModelShared() behind the opt-in response cache; only clean answers are stored
+async function runModelCached(modelInfo: AIModel, battle: BattleContext): Promise<BattleResult> {
+  if (!isCacheable(battle.attachments)) {
+    return runModelShared(modelInfo, battle);
+  }
+
+  const key = responseCacheKey(modelInfo.id, battle.prompt, battle.conversationHistory, battle.attachments);
+  const cached = await getCachedResponse(key);
+  if (cached) {
+    console.log(`${modelInfo.name}: served from response cache`);
+    // No provider call, so no tokens or cost
+    return { model: cached.model, name: cached.name, text: cached.text, usedFallback: cached.usedFallback, cached: true };
+  }
+
+  const result = await runModelShared(modelInfo, battle);
+  if (!result.text.startsWith('⚠️')) {
+    await setCachedResponse(key, { model: result.model, name: result.name, text: result.text, usedFallback: result.usedFallback });
+  }
+  return result;
+}
+
+// Describe attached images with Gemini for the non-vision models. Never
+// rejects: failures become a placeholder so dependent models still run.
+async function analyzeImages(attachments: any[]): Promise<string> {
+  const images = attachments.filter((a: any) => a.type === 'image');
+  const startedAt = Date.now();
+
+  // Same image bytes always get the same description, so reuse it
+  const imageKey = imageContentHash(images.map((a: any) => a.bytes || a.data));
+  const cachedAnalysis = getVisionAnalysis(imageKey);
+  if (cachedAnalysis) {
+    console.log('✅ Reusing cached Gemini analysis for this image');
+    return cachedAnalysis;
+  }
+
+  // Concurrent misses for the same images share one Gemini call
+  return singleFlight(`vision:${imageKey}`, async () => {
+    try {
+      // Build multimodal message for Gemini
+      const analysisMessages: any[] = [
+        {
+          role: "user",
+          content: [
+            { 
+              type: "text", 
+              text: "Analyze this image in detail. Describe: 1) Main subject/content, 2) Visual style and composition, 3) Colors and lighting, 4) Mood/atmosphere, 5) Any text or notable details. Be thorough and professional - this description will help other AI models understand the image." 
+            },
+            ...images.map(imageContentPart)
+          ]
+        }
+      ];
+
+      // Use Gemini to analyze the image
+      console.log('Using Gemini to analyze image for non-vision models...');
+      const analysis = await callGemini('gemini-2.5-flash-lite', analysisMessages);
+      console.log(`✅ Gemini analysis complete in ${Date.now() - startedAt}ms - will be shared with non-vision models`);
+      if (analysis.trim()) {
+        setVisionAnalysis(imageKey, analysis);
+      }
+      return analysis;
+    } catch (error) {
+      console.error('❌ Failed to generate Gemini vision analysis:', error);
+      return '[Image present but analysis unavailable]';
+    }
+  });
+}
+
+// Dependency graph for one model: vision models (raw images) and text-only
+// requests start at once; non-vision models wait for the image analysis.
+async function runModelWhenReady(
+  modelInfo: AIModel,
+  battle: PendingBattle,
+  analysis: Promise<string>
+): Promise<BattleResult> {
+  const startedAt = Date.now();
+  const waitsForAnalysis = battle.hasImages && !modelInfo.supportsVision;
+  const visionAnalysis = waitsForAnalysis ? await analysis : '';
+  const readyAt = Date.now();
+
+  const result = await runModelCached(modelInfo, { ...battle, visionAnalysis });
+
+  const finishedAt = Date.now();
+  console.log(
+    `⏱️ ${modelInfo.name}: ${waitsForAnalysis ? `waited ${readyAt - startedAt}ms for image analysis, ` : ''}` +
+    `model ${finishedAt - readyAt}ms, total ${finishedAt - startedAt}ms`
+  );
+  return result;
+}
+
+// Queue one api_logs row per model result; written in bulk in the background
+function logBattleResults(
+  results: BattleResult[],
+  userId: string | null,
+  clientIp: string,
+  startTime: number
+): void {
+  const responseTime = (Date.now() - startTime) / 1000;
+
+  enqueueApiLogs(results.map((result) => ({
+    userId: userId || undefined,
+    ipAddress: clientIp || undefined,
+    modelName: result.name,
+    provider: result.provider || getRoutes(result.model)[0]?.provider || 'a4f',
+    usedFallback: result.usedFallback || false,
+    cacheHit: result.cached || false,
+    rateLimited: false,
+    error: result.text?.includes('⚠️ Error') || false,
+    errorMessage: result.text?.includes('⚠️ Error') ? result.text : undefined,
+    // Per-call figures when this request made the provider call; cache hits
+    // and shared results fall back to the whole-request time
+    responseTime: result.timing ? result.timing.totalMs / 1000 : responseTime,
+    queueTime: result.timing ? result.timing.queueMs / 1000 : undefined,
+    ttft: result.timing ? result.timing.ttftMs / 1000 : undefined,
+    promptTokens: result.usage?.promptTokens,
+    completionTokens: result.usage?.completionTokens,
+    tokensUsed: result.usage ? result.usage.promptTokens + result.usage.completionTokens : undefined,
+    cost: result.cost || 0,
+  })));
+}
+
 export async function POST(req: Request) {
   const startTime = Date.now();
   let userId: string | null = null;
   let clientIp: string = '';
+
+  // Once the response has been sent, write queued api_logs rows and finish
+  // counting the requests the rate limiter allowed locally
+  after(() => flushApiLogs());
+  after(() => drainRateLimitReconciles());
   
   try {
     // Get user authentication and IP
@@ -105,7 +490,8 @@ export async function POST(req: Request) {
       }
     }
     
-    const { prompt, conversationHistory = [], attachments } = await req.json();
+    // JSON (images as data URLs) or multipart (raw image bytes)
+    const { prompt, conversationHistory, attachments, stream } = await readBattleRequest(req);
 
     // Minimal logging for performance
     console.log('API: Received prompt with', conversationHistory.length, 'history items');
@@ -118,433 +504,87 @@ export async function POST(req: Request) {
     }
 
     // Check if images are present
-    const hasImages = attachments && attachments.some((a: any) => a.type === 'image');
+    const hasImages = !!attachments && attachments.some((a: any) => a.type === 'image');
 
-    // Step 1: Use Gemini to analyze images for non-vision models
-    let visionAnalysis = '';
-    
-    if (hasImages) {
-      try {
-        // Build multimodal message for Gemini
-        const analysisMessages: any[] = [
-          {
-            role: "user",
-            content: [
-              { 
-                type: "text", 
-                text: "Analyze this image in detail. Describe: 1) Main subject/content, 2) Visual style and composition, 3) Colors and lighting, 4) Mood/atmosphere, 5) Any text or notable details. Be thorough and professional - this description will help other AI models understand the image." 
-              },
-              ...attachments
-                .filter((a: any) => a.type === 'image')
-                .map((a: any) => ({
-                  type: "image_url",
-                  image_url: { url: a.data }
-                }))
-            ]
-          }
-        ];
-
-        // Use Gemini to analyze the image
-        console.log('Using Gemini to analyze image for non-vision models...');
-        visionAnalysis = await callGemini('gemini-2.5-flash-lite', analysisMessages);
-        console.log('✅ Gemini analysis complete - will be shared with non-vision models');
-      } catch (error) {
-        console.error('❌ Failed to generate Gemini vision analysis:', error);
-        visionAnalysis = '[Image present but analysis unavailable]';
-      }
-    }
+    // Step 1: Start the Gemini image analysis for non-vision models (if any need it).
+    // It runs alongside the models that don't depend on it.
+    const needsAnalysis = hasImages && AI_MODELS.some((m) => !m.supportsVision);
+    const visionAnalysis = needsAnalysis ? analyzeImages(attachments || []) : Promise.resolve('');
 
     // Step 2: Process all models with appropriate content
-    // Vision models receive images directly
-    // Non-vision models receive vision analysis if available
-    const results = await Promise.all(
-      AI_MODELS.map(async (modelInfo) => {
-        try {
-          // Build messages based on model capabilities
-          const modelMessages: any[] = [];
-          
-          // Process conversation history (only last 4 messages for speed)
-          const recentHistory = conversationHistory.slice(-4);
-          {
-            for (const historyItem of recentHistory) {
-              if (historyItem.role === 'user' && Array.isArray(historyItem.content)) {
-                // This is multimodal content
-                if (modelInfo.supportsVision) {
-                  // Vision model: send without timestamp
-                  modelMessages.push({
-                    role: historyItem.role,
-                    content: historyItem.content
-                  });
-                } else {
-                  // Non-vision model: convert to text-only
-                  let textContent = '';
-                  let hasImage = false;
-                  
-                  for (const part of historyItem.content) {
-                    if (part.type === 'text') {
-                      textContent += part.text;
-                    } else if (part.type === 'image_url') {
-                      hasImage = true;
-                    }
-                  }
-                  
-                  if (hasImage) {
-                    textContent += '\n\n[Note: Previous message contained an image that was analyzed]';
-                  }
-                  
-                  modelMessages.push({
-                    role: historyItem.role,
-                    content: textContent
-                  });
-                }
-              } else {
-                // Regular text message - strip timestamp
-                modelMessages.push({
-                  role: historyItem.role,
-                  content: historyItem.content
-                });
-              }
-            }
-          }
-          
-          // Process current message with attachments
-          let userContent: any = prompt;
-          
-          if (attachments && attachments.length > 0) {
-            if (modelInfo.supportsVision) {
-              // Vision model: use multimodal format
-              const contentParts: any[] = [{ type: "text", text: prompt }];
-              
-              for (const attachment of attachments) {
-                if (attachment.type === 'image') {
-                  contentParts.push({
-                    type: "image_url",
-                    image_url: {
-                      url: attachment.data
-                    }
-                  });
-                } else if (attachment.type === 'document') {
-                  contentParts[0].text += `\n\n[File: ${attachment.filename}]\n${attachment.data}`;
-                }
-              }
-              
-              userContent = contentParts;
-            } else {
-              // Non-vision model: use Gemini's analysis
-              let textContent = prompt;
-              
-              // Add Gemini's vision analysis if available
-              if (hasImages && visionAnalysis) {
-                // Seamlessly integrate the image description into the prompt
-                textContent = `${prompt}\n\n[Context: The image shows: ${visionAnalysis}]`;
-              }
-              
-              // Add document content
-              for (const attachment of attachments) {
-                if (attachment.type === 'document') {
-                  textContent += `\n\n[File: ${attachment.filename}]\n${attachment.data}`;
-                }
-              }
-              
-              userContent = textContent;
-            }
-          }
-          
-          modelMessages.push({ role: "user", content: userContent });
-
-          const temperature = 0.5;
+    // Vision models receive images directly and start immediately
+    // Non-vision models wait for the vision analysis
+    const requestDigest = createHash('sha256')
+      .update(JSON.stringify({
+        prompt,
+        history: conversationHistory.slice(-4),
+        // Raw image bytes are reduced to a digest rather than serialized
+        attachments: (attachments || []).map((a) => a.bytes ? { ...a, bytes: imageContentHash([a.bytes]) } : a),
+      }))
+      .digest('hex');
+    const battle: PendingBattle = { prompt, conversationHistory, attachments, hasImages, requestDigest };
+    const pending = AI_MODELS.map((modelInfo) => runModelWhenReady(modelInfo, battle, visionAnalysis));
 
-          // Check if this is a direct Google model
-          if (modelInfo.provider === 'google') {
+    // Streaming clients get each model's result as soon as it is ready (NDJSON)
+    if (stream) {
+      const encoder = new TextEncoder();
+      // Set once the client disconnects; the models still finish and are logged
+      let closed = false;
+      const body = new ReadableStream({
+        async start(controller) {
+          const send = (event: object) => {
+            if (closed) return;
             try {
-              // Pass messages as-is to Google (supports multimodal)
-              // Google client will handle the conversion
-              console.log(`Calling Google Gemini API directly with model: ${modelInfo.id}`);
-              console.log(`Has images: ${modelMessages.some((m: any) => Array.isArray(m.content))}`);
-              const responseText = await callGemini(modelInfo.id, modelMessages);
-              
-              return {
-                model: modelInfo.id,
-                name: modelInfo.name,
-                text: cleanModelResponse(responseText),
-                usedFallback: false,
-              };
-            } catch (googleError: any) {
-              console.error(`${modelInfo.name}: Google API error:`, googleError);
-              return {
-                model: modelInfo.id,
-                name: modelInfo.name,
-                text: `⚠️ Error: ${googleError.message || 'Failed to get response from Google Gemini'}`,
-              };
+              controller.enqueue(encoder.encode(JSON.stringify(event) + '\n'));
+            } catch {
+              closed = true;
             }
-          }
+          };
 
-          // Check if this is a direct Groq model
-          if (modelInfo.provider === 'groq') {
-            try {
-              console.log(`Calling Groq API directly with model: ${modelInfo.id}`);
-              const responseText = await callGroq(modelInfo.id, modelMessages);
-              
-              return {
-                model: modelInfo.id,
-                name: modelInfo.name,
-                text: cleanModelResponse(responseText),
-                usedFallback: false,
-              };
-            } catch (groqError: any) {
-              console.error(`${modelInfo.name}: Groq API error:`, groqError);
-              return {
-                model: modelInfo.id,
-                name: modelInfo.name,
-                text: `⚠️ Error: ${groqError.message || 'Failed to get response from GPT-5'}`,
-              };
-            }
-          }
+          const results = await Promise.all(
+            pending.map((promise, index) =>
+              promise.then((result) => {
+                send({ type: 'result', index, result });
+                return result;
+              })
+            )
+          );
 
-          // Check if this is a direct OpenRouter model
-          if (modelInfo.provider === 'openrouter') {
-            try {
-              // Convert messages to simple text format for OpenRouter
-              const openRouterMessages = modelMessages.map((msg: any) => {
-                if (Array.isArray(msg.content)) {
-                  // Extract text parts only (OpenRouter free models don't support vision)
-                  const textParts = msg.content.filter((part: any) => part.type === 'text');
-                  return {
-                    role: msg.role,
-                    content: textParts.map((p: any) => p.text).join('\n')
-                  };
-                }
-                return msg;
-              });
-
-              console.log(`Calling OpenRouter API directly with model: ${modelInfo.id}`);
-              const completion = await openRouterClient.chat.completions.create({
-                model: modelInfo.id,
-                messages: openRouterMessages,
-                temperature: 0.5,
-                max_tokens: 500,
-              });
-
-              const responseText = completion.choices[0].message.content || "No response";
-              
-              return {
-                model: modelInfo.id,
-                name: modelInfo.name,
-                text: cleanModelResponse(responseText),
-                usedFallback: false,
-              };
-            } catch (openRouterError: any) {
-              console.error(`${modelInfo.name}: OpenRouter API error:`, openRouterError);
-              return {
-                model: modelInfo.id,
-                name: modelInfo.name,
-                text: `⚠️ Error: ${openRouterError.message || 'Failed to get response'}`,
-              };
-            }
+          // Every result was already sent on its own line
+          send({ type: 'done', count: results.length });
+          if (!closed) {
+            closed = true;
+            controller.close();
           }
+          logBattleResults(results, userId, clientIp, startTime);
+        },
+        cancel() {
+          closed = true;
+        },
+      });
 
-          // For A4F models
-          // Check if this model has fallback configured
-          const hasFallback = modelInfo.fallbackId && (modelInfo.fallbackProvider === 'openrouter' || modelInfo.fallbackProvider === 'google');
-          const timeoutMs = hasFallback ? 30000 : 60000; // 30s for models with fallback, 60s otherwise
-
-          try {
-            // Log request details for debugging
-            if (modelInfo.id === 'provider-5/gpt-5-nano') {
-              console.log('GPT-5 Request:', {
-                model: modelInfo.id,
-                messageCount: modelMessages.length,
-                firstMessage: modelMessages[0],
-                hasMultimodal: modelMessages.some((m: any) => Array.isArray(m.content))
-              });
-            }
-
-            // Create a timeout promise
-            const timeoutPromise = new Promise((_, reject) => {
-              setTimeout(() => reject(new Error('TIMEOUT')), timeoutMs);
-            });
-
-            // Build request options based on provider
-            const requestOptions: any = {
-              model: modelInfo.id,
-              messages: modelMessages,
-            };
-            
-            // provider-5 doesn't accept temperature/max_tokens parameters
-            if (!modelInfo.id.startsWith('provider-5/')) {
-              requestOptions.temperature = temperature;
-              requestOptions.max_tokens = 500;
-            }
+      return new Response(body, {
+        headers: {
+          'Content-Type': 'application/x-ndjson',
+          'Cache-Control': 'no-cache',
+        },
+      });
+    }
 
-            // Race between API call and timeout
-            const completion = await Promise.race([
-              a4fClient.chat.completions.create(requestOptions),
-              timeoutPromise
-            ]) as any;
-
-            const responseText = completion.choices[0].message.content || "No response";
-
-            return {
-              model: modelInfo.id,
-              name: modelInfo.name,
-              text: cleanModelResponse(responseText),
-              usedFallback: false,
-            };
-          } catch (apiError: any) {
-            // Check if we should try fallback
-            if (hasFallback && (apiError.message === 'TIMEOUT' || apiError.status === 500 || apiError.code === 'ECONNABORTED' || apiError.code === 'ETIMEDOUT')) {
-              const fallbackProvider = modelInfo.fallbackProvider;
-              console.log(`${modelInfo.name}: Primary A4F failed/timed out, trying ${fallbackProvider} fallback...`);
-              
-              try {
-                // Convert messages to simple text format
-                const fallbackMessages = modelMessages.map((msg: any) => {
-                  if (Array.isArray(msg.content)) {
-                    // Extract text parts only
-                    const textParts = msg.content.filter((part: any) => part.type === 'text');
-                    return {
-                      role: msg.role,
-                      content: textParts.map((p: any) => p.text).join('\n')
-                    };
-                  }
-                  return msg;
-                });
-
-                let responseText: string;
-
-                if (fallbackProvider === 'google') {
-                  // Use Google Gemini API
-                  console.log(`Calling Google Gemini API with model: ${modelInfo.fallbackId}`);
-                  console.log(`Message count: ${fallbackMessages.length}`);
-                  responseText = await callGemini(modelInfo.fallbackId!, fallbackMessages);
-                  console.log(`Google Gemini response received: ${responseText.substring(0, 100)}...`);
-                } else {
-                  // Use OpenRouter
-                  const fallbackCompletion = await openRouterClient.chat.completions.create({
-                    model: modelInfo.fallbackId!,
-                    messages: fallbackMessages,
-                    temperature: temperature,
-                    max_tokens: 500,
-                  });
-                  responseText = fallbackCompletion.choices[0].message.content || "No response";
-                }
-                
-                // responseText is assigned above in both branches
-
-                return {
-                  model: modelInfo.id,
-                  name: modelInfo.name,
-                  text: cleanModelResponse(responseText),
-                  usedFallback: true,
-                };
-              } catch (fallbackError: any) {
-                console.error(`${modelInfo.name}: ${fallbackProvider} fallback also failed:`, fallbackError);
-                // If fallback fails, throw the original error
-                throw apiError;
-              }
-            }
-            // If it's a vision model with images, try again without images
-            if (modelInfo.supportsVision && hasImages && apiError.status === 500) {
-              console.log(`${modelInfo.name}: Retrying without images due to API error`);
-              
-              try {
-                // Retry with text-only
-                const textOnlyMessages = modelMessages.map(msg => {
-                  if (Array.isArray(msg.content)) {
-                    // Extract only text parts
-                    const textParts = msg.content.filter((part: any) => part.type === 'text');
-                    return {
-                      ...msg,
-                      content: textParts.map((p: any) => p.text).join('\n') + '\n\n[Note: Image processing temporarily unavailable for this model]'
-                    };
-                  }
-                  return msg;
-                });
-
-                const retryCompletion = await a4fClient.chat.completions.create({
-                  model: modelInfo.id,
-                  messages: textOnlyMessages,
-                  temperature: temperature,
-                  max_tokens: 500,
-                });
-
-                const responseText = retryCompletion.choices[0].message.content || "No response";
-
-                return {
-                  model: modelInfo.id,
-                  name: modelInfo.name,
-                  text: `⚠️ Image processing temporarily unavailable. Text response:\n\n${cleanModelResponse(responseText)}`,
-                };
-              } catch {
-                // If retry also fails, return error
-                throw apiError;
-              }
-            }
-            
-            // If not a vision model or retry failed, throw the error
-            throw apiError;
-          }
-        } catch (error: any) {
-          // Enhanced error logging for GPT-5
-          if (modelInfo.id === 'provider-5/gpt-5-nano') {
-            console.error(`GPT-5 Error Details:`, {
-              status: error.status,
-              code: error.code,
-              type: error.type,
-              error: error.error,
-              message: error.message,
-              fullError: JSON.stringify(error, null, 2)
-            });
-          } else {
-            console.error(`Error with model ${modelInfo.id}:`, error);
-          }
-          
-          // Provide more helpful error messages
-          let errorMessage = "Failed to get response";
-          
-          if (error.status === 500) {
-            errorMessage = "The AI service is temporarily unavailable. Please try again.";
-          } else if (error.status === 429) {
-            errorMessage = "Rate limit reached. Please wait a moment and try again.";
-          } else if (error.code === 'ECONNABORTED' || error.code === 'ETIMEDOUT') {
-            errorMessage = "Request timed out. The model may be overloaded.";
-          } else if (error.message) {
-            errorMessage = error.message;
-          }
-          
-          return {
-            model: modelInfo.id,
-            name: modelInfo.name,
-            text: `⚠️ Error: ${errorMessage}`,
-          };
-        }
-      })
-    );
+    const results = await Promise.all(pending);
 
     // Log each model request
-    const responseTime = (Date.now() - startTime) / 1000;
-    
-    for (const result of results) {
-      await logApiRequest({
-        userId: userId || undefined,
-        ipAddress: clientIp || undefined,
-        modelName: result.name,
-        provider: result.usedFallback ? 'openrouter' : (
-          result.model.includes('gemini') ? 'google' :
-          result.model.includes('gpt') ? 'groq' :
-          result.model.includes('openrouter') ? 'openrouter' : 'a4f'
-        ),
-        usedFallback: result.usedFallback || false,
-        rateLimited: false,
-        error: result.text?.includes('⚠️ Error') || false,
-        errorMessage: result.text?.includes('⚠️ Error') ? result.text : undefined,
-        responseTime: responseTime,
-        cost: 0, // Free tier
-      });
-    }
+    logBattleResults(results, userId, clientIp, startTime);
 
     return NextResponse.json({ success: true, results });
   } catch (error: any) {
+    if (error instanceof BattleRequestError) {
+      return NextResponse.json(
+        { success: false, error: error.message },
+        { status: 400 }
+      );
+    }
+
     console.error("A4F Battle Error:", error);
     
     // Log error
@@ -0,0 +1,57 @@
+import { NextResponse } from 'next/server';
+import { auth } from '@clerk/nextjs/server';
+import { getRoutingTable, setRouteWeight } from '@/lib/modelRouter';
+import { Provider } from '@/lib/providerHealth';
+
+// Admin user ID - REPLACE WITH YOUR CLERK USER ID
+const ADMIN_USER_ID = 'user_34EhMJegPDOgylkYyupD2t7NIwB';
+
+// Weights live in this server instance's memory only
+const WEIGHTS_NOTE = 'Route weights are in memory per server instance: other instances keep their own, and all reset on deploy or restart.';
+
+async function isAdmin(): Promise<boolean> {
+  const { userId } = await auth();
+  return !!userId && userId === ADMIN_USER_ID;
+}
+
+// Current routing table: provider limits and load, routes and weights per model
+export async function GET() {
+  if (!(await isAdmin())) {
+    return NextResponse.json(
+      { error: 'Unauthorized' },
+      { status: 403 }
+    );
+  }
+
+  return NextResponse.json({ ...getRoutingTable(), note: WEIGHTS_NOTE });
+}
+
+// Change one route weight: { modelId, provider, weight }
+export async function POST(req: Request) {
+  try {
+    if (!(await isAdmin())) {
+      return NextResponse.json(
+        { error: 'Unauthorized' },
+        { status: 403 }
+      );
+    }
+
+    const { modelId, provider, weight } = await req.json();
+
+    if (typeof modelId !== 'string' || typeof weight !== 'number' || !setRouteWeight(modelId, provider as Provider, weight)) {
+      return NextResponse.json(
+        { error: 'Unknown model/provider route or invalid weight' },
+        { status: 400 }
+      );
+    }
+
+    console.log(`Route weight changed: ${modelId} via ${provider} = ${weight}`);
+    return NextResponse.json({ ...getRoutingTable(), note: WEIGHTS_NOTE });
+  } catch (error: any) {
+    console.error('Routing update error:', error);
+    return NextResponse.json(
+      { error: 'Failed to update routing' },
+      { status: 500 }
+    );
+  }
+}
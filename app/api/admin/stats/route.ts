@@ -1,6 +1,9 @@
 import { NextResponse } from 'next/server';
 import { auth } from '@clerk/nextjs/server';
 import { createClient } from '@supabase/supabase-js';
+import { getProviderHealth } from '@/lib/providerHealth';
+import { getApiLoggerStats } from '@/lib/apiLogger';
+import { getLocalRateLimitStats } from '@/lib/localRateLimit';
 
 const supabase = createClient(
   process.env.NEXT_PUBLIC_SUPABASE_URL!,
@@ -44,9 +47,11 @@ export async function GET() {
     
     const rateLimitHits = dailyRequests?.filter(r => r.rate_limited).length || 0;
     const fallbackUsage = dailyRequests?.filter(r => r.used_fallback).length || 0;
+    const cacheHits = dailyRequests?.filter(r => r.cache_hit).length || 0;
     
-    // Calculate cost (assuming $0 for free tier)
-    const costToday = dailyRequests?.reduce((sum, r) => sum + (r.cost || 0), 0) || 0;
+    // Cost and tokens are recorded per provider call (lib/usage.ts)
+    const costToday = dailyRequests?.reduce((sum, r) => sum + Number(r.cost || 0), 0) || 0;
+    const tokensToday = dailyRequests?.reduce((sum, r) => sum + (r.tokens_used || 0), 0) || 0;
 
     // Model breakdown
     const modelMap = new Map();
@@ -59,6 +64,8 @@ export async function GET() {
           fallbacks: 0,
           errors: 0,
           totalResponseTime: 0,
+          tokens: 0,
+          cost: 0,
         });
       }
       
@@ -66,7 +73,9 @@ export async function GET() {
       stats.requests++;
       if (req.used_fallback) stats.fallbacks++;
       if (req.error) stats.errors++;
-      stats.totalResponseTime += req.response_time || 0;
+      stats.totalResponseTime += Number(req.response_time || 0);
+      stats.tokens += req.tokens_used || 0;
+      stats.cost += Number(req.cost || 0);
     });
 
     const modelBreakdown = Array.from(modelMap.values()).map(stats => ({
@@ -110,10 +119,16 @@ export async function GET() {
       requestsToday,
       rateLimitHits,
       fallbackUsage,
+      cacheHits,
       costToday,
+      tokensToday,
       modelBreakdown,
       hourlyBreakdown,
       recentRequests,
+      // Circuit breaker state for this server instance
+      providerHealth: getProviderHealth(),
+      apiLogger: getApiLoggerStats(),
+      rateLimitLocal: getLocalRateLimitStats(),
     });
 
   } catch (error) {
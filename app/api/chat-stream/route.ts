@@ -1,9 +1,12 @@
-import { NextResponse } from 'next/server';
-import { a4fClient } from '@/lib/a4fClient';
-import { groqClient } from '@/lib/groqClient';
-import { googleAI } from '@/lib/googleClient';
-import { openRouterClient } from '@/lib/openRouterClient';
+import { after, NextResponse } from 'next/server';
 import { checkIpRateLimit, checkUserRateLimit, getClientIp } from '@/lib/rateLimit';
+import { drainRateLimitReconciles } from '@/lib/localRateLimit';
+import { canRequest, CircuitOpenError, recordFailure, recordSuccess, releaseProbe } from '@/lib/providerHealth';
+import { planRoutes, streamWithRoute } from '@/lib/modelRouter';
+import { AI_MODELS } from '@/lib/a4fClient';
+import { enqueueApiLogs, flushApiLogs } from '@/lib/apiLogger';
+import { callCost, CallTiming, TokenUsage } from '@/lib/usage';
+import { estimateTokens, fitHistory } from '@/lib/tokenBudget';
 import { auth } from '@clerk/nextjs/server';
 
 // Helper function to clean tokenizer artifacts and special tokens from responses
@@ -35,6 +38,12 @@ export async function POST(req: Request) {
   try {
     // Get user authentication
     const { userId } = await auth();
+    const clientIp = getClientIp(req);
+
+    // Once the response has been sent, write queued api_logs rows and finish
+    // counting the requests the rate limiter allowed locally
+    after(() => flushApiLogs());
+    after(() => drainRateLimitReconciles());
     
     // Check rate limits
     if (userId) {
@@ -54,7 +63,6 @@ export async function POST(req: Request) {
         );
       }
     } else {
-      const clientIp = getClientIp(req);
       const rateLimitResult = await checkIpRateLimit(clientIp);
       
       if (!rateLimitResult.allowed) {
@@ -85,12 +93,17 @@ export async function POST(req: Request) {
     // Prepare messages with conversation history
     const messages: any[] = [];
     
-    // Add last 6 messages from history for context
+    // Add last 6 messages from history for context, trimmed to the model's token budget
     // Strip out timestamp and any other properties not supported by the API
-    const recentHistory = conversationHistory.slice(-6).map((msg: any) => ({
-      role: msg.role,
-      content: msg.content,
-    }));
+    const recentHistory = fitHistory(
+      conversationHistory.map((msg: any) => ({
+        role: msg.role,
+        content: msg.content,
+      })),
+      modelId,
+      6,
+      estimateTokens(prompt) + 1000
+    );
     messages.push(...recentHistory);
     
     // Add current prompt
@@ -101,100 +114,113 @@ export async function POST(req: Request) {
 
     console.log(`Chat Stream: ${modelId} - ${messages.length} messages`);
 
+    // Providers that can serve this model, in the order to try them
+    const routes = planRoutes(modelId);
+
+    // Aborts the provider stream when the client goes away
+    const upstream = new AbortController();
+    // Set on cancel() or a failed enqueue; nothing is sent after that
+    let closed = false;
+
     // Create streaming response
     const stream = new ReadableStream({
       async start(controller) {
-        try {
-          let response: any;
+        const encoder = new TextEncoder();
+        let lastError: any = null;
+
+        // False once the client is gone
+        const send = (text: string): boolean => {
+          if (closed) return false;
+          try {
+            controller.enqueue(encoder.encode(text));
+            return true;
+          } catch {
+            closed = true;
+            upstream.abort();
+            return false;
+          }
+        };
+        const close = () => {
+          if (closed) return;
+          closed = true;
+          controller.close();
+        };
 
-          // Handle Google Gemini separately (different API)
-          if (modelId === 'gemini-2.5-flash-lite') {
-            if (!googleAI) {
-              throw new Error('Google AI not initialized');
-            }
+        for (const route of routes) {
+          if (closed) return;
 
-            const model = googleAI.getGenerativeModel({ model: modelId });
-            
-            // Convert messages to Gemini format
-            const geminiMessages = messages.map((msg) => {
-              const role = msg.role === 'assistant' ? 'model' : 'user';
-              return {
-                role,
-                parts: [{ text: msg.content }],
-              };
-            });
-
-            // Start chat with history
-            const chat = model.startChat({
-              history: geminiMessages.slice(0, -1),
-              generationConfig: {
-                temperature: 0.7,
-                maxOutputTokens: 1000,
-              },
-            });
-
-            // Send last message and stream response
-            const lastMessage = geminiMessages[geminiMessages.length - 1].parts;
-            const result = await chat.sendMessageStream(lastMessage);
-
-            // Stream chunks
-            for await (const chunk of result.stream) {
-              const content = chunk.text();
-              if (content) {
-                const cleanedContent = cleanModelResponse(content, true);
-                // Send even if cleanedContent is empty string (could be just spaces)
-                const data = JSON.stringify({ content: cleanedContent });
-                controller.enqueue(new TextEncoder().encode(`data: ${data}\n\n`));
-              }
+          // Skip providers whose circuit breaker is open
+          if (!canRequest(route.provider, route.modelId)) {
+            lastError = lastError || new CircuitOpenError(route.provider, route.modelId);
+            continue;
+          }
+
+          const streamStart = Date.now();
+          let sentContent = false;
+          try {
+            const onComplete = ({ usage, timing }: { usage: TokenUsage; timing: CallTiming }) => {
+              console.log(`⏱️ Chat Stream ${modelId} via ${route.provider}: queue ${timing.queueMs}ms, TTFT ${timing.ttftMs}ms, total ${timing.totalMs}ms, ${usage.promptTokens}+${usage.completionTokens} tokens${usage.estimated ? ' (estimated)' : ''}`);
+              enqueueApiLogs([{
+                userId: userId || undefined,
+                ipAddress: clientIp || undefined,
+                modelName: AI_MODELS.find((m) => m.id === modelId)?.name || modelId,
+                provider: route.provider,
+                usedFallback: route.isFallback,
+                responseTime: timing.totalMs / 1000,
+                queueTime: timing.queueMs / 1000,
+                ttft: timing.ttftMs / 1000,
+                promptTokens: usage.promptTokens,
+                completionTokens: usage.completionTokens,
+                tokensUsed: usage.promptTokens + usage.completionTokens,
+                cost: callCost(route.modelId, usage),
+              }]);
+            };
+
+            for await (const content of streamWithRoute(route, messages, { onComplete, signal: upstream.signal })) {
+              const cleanedContent = cleanModelResponse(content, true);
+              // Send even if cleanedContent is empty string (could be just spaces)
+              const data = JSON.stringify({ content: cleanedContent });
+              if (!send(`data: ${data}\n\n`)) break;
+              sentContent = true;
             }
-          } else {
-            // Handle OpenAI-compatible APIs (Groq, A4F, OpenRouter)
-            let client: any;
-            
-            if (modelId === 'openai/gpt-oss-120b') {
-              client = groqClient;
-            } else if (modelId === 'deepseek/deepseek-chat-v3.1:free') {
-              client = openRouterClient;
-            } else if (modelId === 'provider-3/llama-4-scout') {
-              client = a4fClient;
-            } else {
-              client = a4fClient;
+
+            // A closed tab is not a provider outcome either way
+            if (closed) {
+              releaseProbe(route.provider, route.modelId);
+              return;
             }
 
-            const requestOptions: any = {
-              model: modelId,
-              messages: messages,
-              stream: true,
-              temperature: 0.7,
-              max_tokens: 1000,
-            };
+            recordSuccess(route.provider, route.modelId, Date.now() - streamStart);
 
-            response = await client.chat.completions.create(requestOptions) as any;
-
-            // Stream the response
-            for await (const chunk of response) {
-              const content = chunk.choices[0]?.delta?.content || '';
-              if (content) {
-                const cleanedContent = cleanModelResponse(content, true);
-                // Send even if cleanedContent is empty string (could be just spaces)
-                const data = JSON.stringify({ content: cleanedContent });
-                controller.enqueue(new TextEncoder().encode(`data: ${data}\n\n`));
-              }
+            // Send done signal
+            send('data: [DONE]\n\n');
+            close();
+            return;
+          } catch (error: any) {
+            if (closed) {
+              releaseProbe(route.provider, route.modelId);
+              return;
             }
-          }
 
-          // Send done signal
-          controller.enqueue(new TextEncoder().encode('data: [DONE]\n\n'));
-          controller.close();
+            console.error(`Streaming error (${route.provider}):`, error);
+            recordFailure(route.provider, route.modelId, Date.now() - streamStart, error);
+            lastError = error;
 
-        } catch (error: any) {
-          console.error('Streaming error:', error);
-          const errorMessage = JSON.stringify({ 
-            error: error.message || 'Streaming failed' 
-          });
-          controller.enqueue(new TextEncoder().encode(`data: ${errorMessage}\n\n`));
-          controller.close();
+            // Once part of an answer is out, switching providers would garble it
+            if (sentContent) break;
+            console.log(`Chat Stream: ${route.provider} failed for ${modelId}, trying next route...`);
+          }
         }
+
+        const errorMessage = JSON.stringify({ 
+          error: lastError?.message || 'Streaming failed' 
+        });
+        send(`data: ${errorMessage}\n\n`);
+        close();
+      },
+      cancel() {
+        closed = true;
+        upstream.abort();
       },
     });
 
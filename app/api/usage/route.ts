@@ -0,0 +1,48 @@
+import { NextResponse } from "next/server";
+import { auth } from "@clerk/nextjs/server";
+import { getClientIp, getIpUsageStats, getUserUsageStats, RATE_LIMITS } from "@/lib/rateLimit";
+
+// Remaining quota for the current user (or IP), polled by the Navbar.
+// One aggregate read of the rate limit counters; nothing is counted.
+export async function GET(req: Request) {
+  try {
+    const { userId } = await auth();
+
+    if (userId) {
+      const usage = await getUserUsageStats(userId);
+      return NextResponse.json(
+        {
+          success: true,
+          type: "user",
+          usage,
+          limits: {
+            battlesPerDay: RATE_LIMITS.USER_BATTLES_PER_DAY,
+            chatsPerDay: RATE_LIMITS.USER_CHATS_PER_DAY,
+            perHour: RATE_LIMITS.USER_PER_HOUR,
+          },
+        },
+        { headers: { "Cache-Control": "private, no-store" } }
+      );
+    }
+
+    const usage = await getIpUsageStats(getClientIp(req));
+    return NextResponse.json(
+      {
+        success: true,
+        type: "anonymous",
+        usage,
+        limits: {
+          perDay: RATE_LIMITS.ANONYMOUS_PER_DAY,
+          perHour: RATE_LIMITS.ANONYMOUS_PER_HOUR,
+        },
+      },
+      { headers: { "Cache-Control": "private, no-store" } }
+    );
+  } catch (error: any) {
+    console.error("Error fetching usage:", error);
+    return NextResponse.json(
+      { success: false, error: error.message },
+      { status: 500 }
+    );
+  }
+}
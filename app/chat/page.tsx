@@ -22,6 +22,51 @@ type BattleResult = {
   votes?: { up: number; down: number };
 };
 
+type BattleResponse = {
+  success: boolean;
+  results: BattleResult[];
+  error?: string;
+};
+
+// Read the battle route's NDJSON stream, reporting each model's result as it
+// arrives. Error responses (rate limit, validation) are still plain JSON.
+async function readBattleResponse(
+  response: Response,
+  onResult: (result: BattleResult) => void
+): Promise<BattleResponse> {
+  if (!response.headers.get("content-type")?.includes("application/x-ndjson") || !response.body) {
+    return response.json();
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  // Results by model index; `done` only says how many were sent
+  const results: BattleResult[] = [];
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split("\n");
+    buffer = lines.pop() || "";
+
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      const event = JSON.parse(line);
+      if (event.type === "result") {
+        results[event.index] = event.result;
+        onResult(event.result);
+      } else if (event.type === "done") {
+        return { success: true, results: results.filter(Boolean) };
+      }
+    }
+  }
+
+  return { success: false, results: [], error: "Battle stream ended unexpectedly" };
+}
+
 export default function ChatPage() {
   const { user } = useUser();
   const [isLoading, setIsLoading] = useState(false);
@@ -43,23 +88,18 @@ export default function ChatPage() {
     setError(null);
 
     try {
-      // Process attachments
-      const processedAttachments: Array<{type: string; data: string; filename: string}> = [];
+      // Process attachments: images go up as raw bytes, documents as text
+      const images: File[] = [];
+      const documents: Array<{data: string; filename: string}> = [];
       
       if (attachments && attachments.length > 0) {
         for (const attachment of attachments) {
-          if (attachment.type === 'image' && attachment.preview) {
-            // For images, send base64 data
-            processedAttachments.push({
-              type: 'image',
-              data: attachment.preview,
-              filename: attachment.file.name
-            });
+          if (attachment.type === 'image') {
+            images.push(attachment.file);
           } else {
             // For documents, read as text
             const text = await attachment.file.text();
-            processedAttachments.push({
-              type: 'document',
+            documents.push({
               data: text,
               filename: attachment.file.name
             });
@@ -74,18 +114,29 @@ export default function ChatPage() {
       console.log('Current prompt:', userPrompt);
       console.log('=====================');
 
-      // Fetch battle results with conversation history and attachments
+      // Multipart form: a JSON payload field plus one binary part per image,
+      // so images are not base64-inflated inside a JSON string
+      const form = new FormData();
+      form.append("payload", JSON.stringify({
+        prompt: userPrompt,
+        conversationHistory,
+        documents,
+        stream: true
+      }));
+      for (const image of images) {
+        form.append("images", image, image.name);
+      }
+
+      // Fetch battle results with conversation history and attachments.
+      // Results stream back as NDJSON, one line per model as it finishes.
       const response = await fetch("/api/a4f-battle", {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ 
-          prompt: userPrompt,
-          conversationHistory,
-          attachments: processedAttachments.length > 0 ? processedAttachments : undefined
-        }),
+        body: form,
       });
 
-      const data = await response.json();
+      const data = await readBattleResponse(response, (result) => {
+        setBattleResults((prev) => [...prev.filter((r) => r.model !== result.model), result]);
+      });
 
       if (data.success) {
         setBattleResults(data.results);
@@ -346,7 +397,7 @@ export default function ChatPage() {
 
               <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-4 md:gap-6">
                 {isLoading ? (
-                  // Show individual thinking states for each model
+                  // Each model shows its thinking state until its result streams in
                   Object.entries(modelColors).map(([modelId, color], index) => {
                     const modelNames: Record<string, string> = {
                       'openai/gpt-oss-120b': 'GPT-5',
@@ -354,14 +405,15 @@ export default function ChatPage() {
                       'deepseek/deepseek-chat-v3.1:free': 'DeepSeek v3.1',
                       'gemini-2.5-flash-lite': 'Google Gemini 2.5 Pro'
                     };
+                    const result = battleResults.find((r) => r.model === modelId);
                     return (
                       <BattleCard
                         key={modelId}
                         model={modelId}
-                        name={modelNames[modelId] || 'AI Model'}
-                        text=""
+                        name={result?.name || modelNames[modelId] || 'AI Model'}
+                        text={result?.text || ""}
                         color={color}
-                        isLoading={true}
+                        isLoading={!result}
                         index={index}
                       />
                     );
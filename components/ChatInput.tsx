@@ -4,11 +4,13 @@ import { useState, useRef, useEffect } from "react";
 import { motion, AnimatePresence } from "framer-motion";
 import { Mic, MicOff, Sparkles, Paperclip, X, FileText } from "lucide-react";
 import Image from "next/image";
+import { downscaleImage, formatBytes, IMAGE_MAX_DIMENSION, IMAGE_QUALITY } from "@/lib/imageDownscale";
 
 export interface AttachedFile {
   file: File;
   preview?: string;
   type: 'image' | 'document';
+  originalSize?: number; // Size before client-side downscaling
 }
 
 interface ChatInputProps {
@@ -16,6 +18,8 @@ interface ChatInputProps {
   isLoading: boolean;
   showClearButton?: boolean;
   onClear?: () => void;
+  imageMaxDimension?: number; // Longest edge after downscaling, in pixels
+  imageQuality?: number; // Re-encode quality, 0-1
 }
 
 const SUGGESTED_PROMPTS = [
@@ -29,7 +33,14 @@ const SUGGESTED_PROMPTS = [
 
 const MAX_CHARACTERS = 4000;
 
-export default function ChatInput({ onSubmit, isLoading, showClearButton, onClear }: ChatInputProps) {
+export default function ChatInput({
+  onSubmit,
+  isLoading,
+  showClearButton,
+  onClear,
+  imageMaxDimension = IMAGE_MAX_DIMENSION,
+  imageQuality = IMAGE_QUALITY,
+}: ChatInputProps) {
   const [prompt, setPrompt] = useState("");
   const [isFocused, setIsFocused] = useState(false);
   const [showSuggestions, setShowSuggestions] = useState(false);
@@ -91,13 +102,19 @@ export default function ChatInput({ onSubmit, isLoading, showClearButton, onClea
       const fileType = file.type.startsWith('image/') ? 'image' : 'document';
       
       if (fileType === 'image') {
+        // Downscale and re-encode off the main thread before upload
+        const resized = await downscaleImage(file, { maxDimension: imageMaxDimension, quality: imageQuality });
+        if (resized.bytesSaved > 0) {
+          console.log(`Image ${file.name}: ${formatBytes(resized.originalBytes)} → ${formatBytes(resized.bytes)} (saved ${formatBytes(resized.bytesSaved)})`);
+        }
+
         // Create preview for images
         const reader = new FileReader();
         const preview = await new Promise<string>((resolve) => {
           reader.onloadend = () => resolve(reader.result as string);
-          reader.readAsDataURL(file);
+          reader.readAsDataURL(resized.file);
         });
-        newAttachments.push({ file, preview, type: 'image' });
+        newAttachments.push({ file: resized.file, preview, type: 'image', originalSize: resized.originalBytes });
       } else {
         // For documents, just store the file
         newAttachments.push({ file, type: 'document' });
@@ -314,6 +331,14 @@ export default function ChatInput({ onSubmit, isLoading, showClearButton, onClea
                         height={80}
                         className="w-full h-full object-cover"
                       />
+                      {attachment.originalSize && attachment.originalSize > attachment.file.size && (
+                        <span
+                          className="absolute bottom-0 inset-x-0 bg-black/70 text-[10px] text-green-400 text-center"
+                          title={`${formatBytes(attachment.originalSize)} → ${formatBytes(attachment.file.size)}`}
+                        >
+                          −{formatBytes(attachment.originalSize - attachment.file.size)}
+                        </span>
+                      )}
                       <button
                         type="button"
                         onClick={() => removeFile(index)}
@@ -5,12 +5,65 @@ import { usePathname } from "next/navigation";
 import { UserButton, useUser } from "@clerk/nextjs";
 import { motion, AnimatePresence } from "framer-motion";
 import { Menu, X } from "lucide-react";
-import { useState } from "react";
+import { useEffect, useState } from "react";
+
+interface Quota {
+  battlesRemaining: number;
+  chatsRemaining: number;
+}
+
+// How often to refresh the remaining quota while the tab is visible
+const QUOTA_POLL_MS = 60 * 1000;
 
 export default function Navbar() {
   const pathname = usePathname();
   const { isSignedIn } = useUser();
   const [isMobileMenuOpen, setIsMobileMenuOpen] = useState(false);
+  const [quota, setQuota] = useState<Quota | null>(null);
+
+  // Poll remaining quota (a single counter read on the server)
+  useEffect(() => {
+    if (!isSignedIn) {
+      setQuota(null);
+      return;
+    }
+
+    let cancelled = false;
+    const loadQuota = async () => {
+      if (document.visibilityState !== "visible") return;
+      try {
+        const response = await fetch("/api/usage", { cache: "no-store" });
+        const data = await response.json();
+        if (!cancelled && data.success && data.type === "user") {
+          setQuota({
+            battlesRemaining: data.usage.battlesRemaining,
+            chatsRemaining: data.usage.chatsRemaining,
+          });
+        }
+      } catch (error) {
+        console.error("Failed to load quota:", error);
+      }
+    };
+
+    loadQuota();
+    const interval = setInterval(loadQuota, QUOTA_POLL_MS);
+    document.addEventListener("visibilitychange", loadQuota);
+    return () => {
+      cancelled = true;
+      clearInterval(interval);
+      document.removeEventListener("visibilitychange", loadQuota);
+    };
+  }, [isSignedIn, pathname]);
+
+  const quotaBadge = quota && (
+    <span
+      className="text-xs font-medium text-softGray border border-accent/30 rounded-full px-3 py-1"
+      title="Remaining today"
+    >
+      <span className={quota.battlesRemaining === 0 ? "text-red-500" : "text-accent"}>{quota.battlesRemaining}</span> battles ·{" "}
+      <span className={quota.chatsRemaining === 0 ? "text-red-500" : "text-accent"}>{quota.chatsRemaining}</span> chats left
+    </span>
+  );
 
   const navLinks = [
     { href: "/", label: "Home" },
@@ -68,6 +121,8 @@ export default function Navbar() {
               </Link>
             ))}
 
+            {isSignedIn && quotaBadge}
+
             {isSignedIn ? (
               <UserButton
                 appearance={{
@@ -138,7 +193,8 @@ export default function Navbar() {
                   </div>
                 )}
                 {isSignedIn && (
-                  <div className="pt-2 border-t border-accent/20 flex justify-center">
+                  <div className="pt-2 border-t border-accent/20 flex items-center justify-center gap-4">
+                    {quotaBadge}
                     <UserButton
                       appearance={{
                         elements: {
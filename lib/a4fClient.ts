@@ -1,7 +1,7 @@
 import OpenAI from "openai";
 
 const a4fApiKey = process.env.A4F_API_KEY;
-const a4fBaseUrl = "https://api.a4f.co/v1";
+const a4fBaseUrl = process.env.A4F_BASE_URL || "https://api.a4f.co/v1";
 
 export const a4fClient = new OpenAI({
   apiKey: a4fApiKey,
@@ -17,37 +17,164 @@ export interface ApiLogEntry {
   modelName: string;
   provider: 'a4f' | 'openrouter' | 'groq' | 'google';
   usedFallback?: boolean;
+  cacheHit?: boolean;
   rateLimited?: boolean;
   error?: boolean;
   errorMessage?: string;
-  responseTime?: number;
-  tokensUsed?: number;
-  cost?: number;
+  responseTime?: number; // Seconds, provider call total
+  queueTime?: number; // Seconds waiting for a provider slot
+  ttft?: number; // Seconds to first token
+  promptTokens?: number;
+  completionTokens?: number;
+  tokensUsed?: number; // Prompt + completion
+  cost?: number; // USD
+}
+
+// Buffered writes: handlers enqueue rows and return; a background flush
+// bulk-inserts them when the batch is full, on an interval, and at shutdown
+const LOG_BATCH_SIZE = Number(process.env.API_LOG_BATCH_SIZE) || 50;
+const LOG_FLUSH_INTERVAL_MS = Number(process.env.API_LOG_FLUSH_INTERVAL_MS) || 2000;
+const LOG_MAX_QUEUE = Number(process.env.API_LOG_MAX_QUEUE) || 5000;
+
+type ApiLogRow = Record<string, unknown>;
+
+const queue: ApiLogRow[] = [];
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+let flushing: Promise<void> | null = null;
+let shutdownHooked = false;
+
+const counters = {
+  enqueued: 0,
+  written: 0,
+  dropped: 0, // Queue full
+  failed: 0, // Insert errors
+  flushes: 0,
+};
+
+function toRow(entry: ApiLogEntry): ApiLogRow {
+  return {
+    user_id: entry.userId || null,
+    ip_address: entry.ipAddress || null,
+    model_name: entry.modelName,
+    provider: entry.provider,
+    used_fallback: entry.usedFallback || false,
+    cache_hit: entry.cacheHit || false,
+    rate_limited: entry.rateLimited || false,
+    error: entry.error || false,
+    error_message: entry.errorMessage || null,
+    response_time: entry.responseTime || null,
+    queue_time: entry.queueTime ?? null,
+    ttft: entry.ttft ?? null,
+    prompt_tokens: entry.promptTokens ?? null,
+    completion_tokens: entry.completionTokens ?? null,
+    tokens_used: entry.tokensUsed || null,
+    cost: entry.cost || 0,
+    created_at: new Date().toISOString(),
+  };
+}
+
+async function insertRows(rows: ApiLogRow[]): Promise<void> {
+  const { error } = await supabase.from('api_logs').insert(rows);
+  if (error) throw error;
 }
 
 /**
- * Log an API request to the database
+ * Write several log entries in one bulk insert, bypassing the queue
  */
-export async function logApiRequest(entry: ApiLogEntry): Promise<void> {
+export async function logApiRequests(entries: ApiLogEntry[]): Promise<void> {
+  if (entries.length === 0) return;
   try {
-    await supabase.from('api_logs').insert({
-      user_id: entry.userId || null,
-      ip_address: entry.ipAddress || null,
-      model_name: entry.modelName,
-      provider: entry.provider,
-      used_fallback: entry.usedFallback || false,
-      rate_limited: entry.rateLimited || false,
-      error: entry.error || false,
-      error_message: entry.errorMessage || null,
-      response_time: entry.responseTime || null,
-      tokens_used: entry.tokensUsed || null,
-      cost: entry.cost || 0,
-      created_at: new Date().toISOString(),
-    });
+    await insertRows(entries.map(toRow));
+    counters.written += entries.length;
   } catch (error) {
     // Don't throw - logging should never break the main flow
-    console.error('Failed to log API request:', error);
+    counters.failed += entries.length;
+    console.error('Failed to log API requests:', error);
+  }
+}
+
+// Flush pending rows when the process is about to exit on its own. Signals
+// are left to the server: routes flush with after(), and a custom server
+// entry can await flushApiLogs() in its own shutdown handler.
+function hookShutdown() {
+  if (shutdownHooked || typeof process === 'undefined' || typeof process.once !== 'function') return;
+  shutdownHooked = true;
+  process.once('beforeExit', () => { void flushApiLogs(); });
+}
+
+function scheduleFlush() {
+  if (queue.length >= LOG_BATCH_SIZE) {
+    void flushApiLogs();
+  } else if (!flushTimer) {
+    flushTimer = setTimeout(() => {
+      flushTimer = null;
+      void flushApiLogs();
+    }, LOG_FLUSH_INTERVAL_MS);
+  }
+}
+
+/**
+ * Queue log entries for the background writer. Returns immediately; when the
+ * queue is full new entries are dropped (and counted) rather than waited on.
+ */
+export function enqueueApiLogs(entries: ApiLogEntry[]): void {
+  hookShutdown();
+  for (const entry of entries) {
+    if (queue.length >= LOG_MAX_QUEUE) {
+      counters.dropped++;
+      continue;
+    }
+    queue.push(toRow(entry));
+    counters.enqueued++;
+  }
+  scheduleFlush();
+}
+
+/**
+ * Log an API request to the database (queued, never blocks the caller)
+ */
+export async function logApiRequest(entry: ApiLogEntry): Promise<void> {
+  enqueueApiLogs([entry]);
+}
+
+/**
+ * Write everything queued so far, in batches. Concurrent calls share one flush.
+ */
+export function flushApiLogs(): Promise<void> {
+  if (flushTimer) {
+    clearTimeout(flushTimer);
+    flushTimer = null;
   }
+  if (!flushing) {
+    flushing = (async () => {
+      while (queue.length > 0) {
+        const batch = queue.splice(0, LOG_BATCH_SIZE);
+        counters.flushes++;
+        try {
+          await insertRows(batch);
+          counters.written += batch.length;
+        } catch (error) {
+          // Don't throw - logging should never break the main flow
+          counters.failed += batch.length;
+          console.error(`Failed to write ${batch.length} API log(s):`, error);
+        }
+      }
+    })().finally(() => {
+      flushing = null;
+    });
+  }
+  return flushing;
+}
+
+/**
+ * Background writer counters, for the admin dashboard
+ */
+export function getApiLoggerStats() {
+  return {
+    ...counters,
+    queued: queue.length,
+    maxQueue: LOG_MAX_QUEUE,
+  };
 }
 
 /**
@@ -0,0 +1,201 @@
+/**
+ * Attachment handling for the battle route
+ *
+ * Images can arrive two ways:
+ * - multipart/form-data: raw image bytes as `images` file parts plus a JSON
+ *   `payload` field (prompt, history, documents). No base64 inflation on the
+ *   wire; the bytes are kept as they are and only encoded by the provider
+ *   clients whose APIs require base64.
+ * - application/json: the original shape, images as data URLs.
+ *
+ * Either way the MIME type is detected from the bytes rather than trusted.
+ */
+
+export interface BattleAttachment {
+  type: 'image' | 'document';
+  data?: string; // data URL for JSON images, text for documents
+  bytes?: Buffer; // Raw image bytes, for multipart images
+  filename: string;
+  mimeType?: string;
+}
+
+// Message content part carrying raw image bytes; provider clients convert it
+export interface ImageBytesPart {
+  type: 'image_bytes';
+  bytes: Buffer;
+  mimeType: string;
+}
+
+/**
+ * Thrown for a request body that cannot be read; the route answers 400
+ */
+export class BattleRequestError extends Error {
+  constructor(message: string) {
+    super(message);
+    this.name = 'BattleRequestError';
+  }
+}
+
+export interface BattleRequestBody {
+  prompt: string;
+  conversationHistory: any[];
+  attachments?: BattleAttachment[];
+  stream: boolean;
+}
+
+/**
+ * Sniff an image MIME type from its leading bytes. Returns null if unknown.
+ */
+export function detectImageMimeType(bytes: Uint8Array): string | null {
+  const startsWith = (signature: number[], offset = 0) =>
+    bytes.length >= offset + signature.length && signature.every((byte, i) => bytes[offset + i] === byte);
+  const ascii = (offset: number, length: number) =>
+    String.fromCharCode(...Array.from(bytes.subarray(offset, offset + length)));
+
+  if (startsWith([0xff, 0xd8, 0xff])) return 'image/jpeg';
+  if (startsWith([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a])) return 'image/png';
+  if (ascii(0, 4) === 'GIF8') return 'image/gif';
+  if (ascii(0, 4) === 'RIFF' && ascii(8, 4) === 'WEBP') return 'image/webp';
+  if (ascii(0, 2) === 'BM') return 'image/bmp';
+  if (ascii(4, 4) === 'ftyp') {
+    const brand = ascii(8, 4);
+    if (brand === 'avif' || brand === 'avis') return 'image/avif';
+    if (['heic', 'heix', 'mif1', 'msf1'].includes(brand)) return 'image/heic';
+  }
+  return null;
+}
+
+/**
+ * Split a data URL into MIME type and base64 payload. Bare base64 strings
+ * come back with a null MIME type.
+ */
+export function parseDataUrl(url: string): { mimeType: string | null; base64: string } {
+  const match = /^data:([^;,]*)(;base64)?,/.exec(url);
+  if (!match) {
+    return { mimeType: null, base64: url };
+  }
+  return { mimeType: match[1] || null, base64: url.slice(match[0].length) };
+}
+
+/**
+ * MIME type of a data URL or base64 image, detected from the first bytes and
+ * falling back to the declared type, then JPEG
+ */
+export function imageMimeType(url: string): string {
+  const { mimeType, base64 } = parseDataUrl(url);
+  // 16 base64 chars decode to the 12 bytes the signatures need
+  const head = new Uint8Array(Buffer.from(base64.slice(0, 16), 'base64'));
+  return detectImageMimeType(head) || mimeType || 'image/jpeg';
+}
+
+/**
+ * Message content part for an image attachment: the raw bytes when the
+ * request carried them, otherwise the data URL as sent
+ */
+export function imageContentPart(attachment: BattleAttachment): any {
+  if (attachment.bytes) {
+    return { type: 'image_bytes', bytes: attachment.bytes, mimeType: attachment.mimeType || 'image/jpeg' };
+  }
+  return { type: 'image_url', image_url: { url: attachment.data } };
+}
+
+// Each image's base64, computed on first use and shared by every model call
+const base64Cache = new WeakMap<Buffer, string>();
+
+/**
+ * Base64 of raw image bytes, encoded at most once per image
+ */
+export function imageBase64(bytes: Buffer): string {
+  let base64 = base64Cache.get(bytes);
+  if (base64 === undefined) {
+    base64 = bytes.toString('base64');
+    base64Cache.set(bytes, base64);
+  }
+  return base64;
+}
+
+/**
+ * Copy of messages with raw image parts encoded as data URLs, for the
+ * OpenAI-compatible APIs, which only accept base64
+ */
+export function withDataUrlImages(messages: any[]): any[] {
+  return messages.map((msg: any) => {
+    if (!Array.isArray(msg.content) || !msg.content.some((part: any) => part.type === 'image_bytes')) {
+      return msg;
+    }
+    return {
+      ...msg,
+      content: msg.content.map((part: any) =>
+        part.type === 'image_bytes'
+          ? { type: 'image_url', image_url: { url: `data:${part.mimeType};base64,${imageBase64(part.bytes)}` } }
+          : part
+      ),
+    };
+  });
+}
+
+async function imageFileToAttachment(file: File): Promise<BattleAttachment> {
+  const bytes = Buffer.from(await file.arrayBuffer());
+  const mimeType = detectImageMimeType(bytes) || file.type || 'image/jpeg';
+  return { type: 'image', bytes, filename: file.name, mimeType };
+}
+
+function parsePayload(value: FormDataEntryValue | null): any {
+  if (typeof value !== 'string') {
+    throw new BattleRequestError('Missing payload');
+  }
+  try {
+    const payload = JSON.parse(value);
+    if (payload && typeof payload === 'object') return payload;
+  } catch {
+    // Reported below
+  }
+  throw new BattleRequestError('Invalid payload');
+}
+
+/**
+ * Read a battle request body, multipart or JSON. Throws BattleRequestError
+ * for a body that is not valid JSON or lacks the multipart payload.
+ */
+export async function readBattleRequest(req: Request): Promise<BattleRequestBody> {
+  const contentType = req.headers.get('content-type') || '';
+
+  if (contentType.includes('multipart/form-data')) {
+    const form = await req.formData().catch(() => {
+      throw new BattleRequestError('Invalid multipart body');
+    });
+    const payload = parsePayload(form.get('payload'));
+    const images = form.getAll('images').filter((part): part is File => typeof part !== 'string');
+
+    const attachments: BattleAttachment[] = [
+      ...(await Promise.all(images.map(imageFileToAttachment))),
+      ...(Array.isArray(payload.documents) ? payload.documents : []).map((doc: any) => ({
+        type: 'document' as const,
+        data: doc.data,
+        filename: doc.filename,
+      })),
+    ];
+
+    return {
+      prompt: payload.prompt,
+      conversationHistory: Array.isArray(payload.conversationHistory) ? payload.conversationHistory : [],
+      attachments: attachments.length > 0 ? attachments : undefined,
+      stream: payload.stream === true,
+    };
+  }
+
+  const body = await req.json().catch(() => {
+    throw new BattleRequestError('Invalid JSON body');
+  });
+  const { prompt, conversationHistory, attachments, stream = false } = body || {};
+  return {
+    prompt,
+    conversationHistory: Array.isArray(conversationHistory) ? conversationHistory : [],
+    attachments: Array.isArray(attachments)
+      ? attachments.map((a: BattleAttachment) =>
+          a.type === 'image' && typeof a.data === 'string' ? { ...a, mimeType: imageMimeType(a.data) } : a
+        )
+      : undefined,
+    stream: stream === true,
+  };
+}
@@ -1,6 +1,9 @@
-import { GoogleGenerativeAI } from "@google/generative-ai";
+import { GoogleGenerativeAI, RequestOptions } from "@google/generative-ai";
+import { imageBase64, imageMimeType, parseDataUrl } from "@/lib/attachments";
+import { geminiUsage, TokenUsage } from "@/lib/usage";
 
 const googleApiKey = process.env.GOOGLE_API_KEY;
+const googleBaseUrl = process.env.GOOGLE_API_BASE_URL;
 
 if (!googleApiKey) {
   console.warn("GOOGLE_API_KEY is not set in environment variables - Google Gemini fallback will not work");
@@ -9,22 +12,31 @@ if (!googleApiKey) {
 // Initialize with a placeholder if key is missing (will fail at runtime but won't crash at import)
 export const googleAI = googleApiKey ? new GoogleGenerativeAI(googleApiKey) : null;
 
+// Pass to getGenerativeModel() so GOOGLE_API_BASE_URL (e.g. a local mock) is honored
+export const googleRequestOptions: RequestOptions | undefined = googleBaseUrl
+  ? { baseUrl: googleBaseUrl }
+  : undefined;
+
 /**
  * Call Google Gemini API with support for text and images
  * @param modelName - The Gemini model to use (e.g., "gemini-2.0-flash-exp")
  * @param messages - Array of messages in OpenAI format (can include images)
+ * @param signal - Optional AbortSignal to cancel the request
+ * @param onUsage - Optional callback receiving the reported token usage
  * @returns The AI response text
  */
 export async function callGemini(
   modelName: string,
-  messages: Array<{ role: string; content: string | any[] }>
+  messages: Array<{ role: string; content: string | any[] }>,
+  signal?: AbortSignal,
+  onUsage?: (usage: TokenUsage) => void
 ): Promise<string> {
   try {
     if (!googleAI) {
       throw new Error("Google AI client not initialized - GOOGLE_API_KEY is missing");
     }
 
-    const model = googleAI.getGenerativeModel({ model: modelName });
+    const model = googleAI.getGenerativeModel({ model: modelName }, googleRequestOptions);
 
     // Filter out system messages and convert to Gemini format
     const nonSystemMessages = messages.filter(m => m.role !== 'system');
@@ -39,13 +51,21 @@ export async function callGemini(
         const parts = msg.content.map((part: any) => {
           if (part.type === 'text') {
             return { text: part.text };
+          } else if (part.type === 'image_bytes') {
+            // Raw bytes from a multipart upload, encoded once for the API
+            return {
+              inlineData: {
+                mimeType: part.mimeType,
+                data: imageBase64(part.bytes)
+              }
+            };
           } else if (part.type === 'image_url') {
-            // Extract base64 data from data URL
-            const base64Data = part.image_url.url.split(',')[1] || part.image_url.url;
+            // Extract base64 data from data URL; MIME type is sniffed from the bytes
+            const url = part.image_url.url;
             return {
               inlineData: {
-                mimeType: 'image/jpeg', // Default to JPEG, could be detected
-                data: base64Data
+                mimeType: imageMimeType(url),
+                data: parseDataUrl(url).base64
               }
             };
           }
@@ -63,8 +83,10 @@ export async function callGemini(
 
     // If there's only one message, use generateContent instead of chat
     if (geminiMessages.length === 1) {
-      const result = await model.generateContent(geminiMessages[0].parts);
+      const result = await model.generateContent(geminiMessages[0].parts, { signal });
       const response = await result.response;
+      const usage = geminiUsage(response.usageMetadata);
+      if (usage) onUsage?.(usage);
       return response.text();
     }
 
@@ -79,12 +101,19 @@ export async function callGemini(
 
     // Send the last message
     const lastMessageParts = geminiMessages[geminiMessages.length - 1].parts;
-    const result = await chat.sendMessage(lastMessageParts);
+    const result = await chat.sendMessage(lastMessageParts, { signal });
     const response = await result.response;
     const text = response.text();
+    const usage = geminiUsage(response.usageMetadata);
+    if (usage) onUsage?.(usage);
 
     return text;
   } catch (error: any) {
+    // Cancelled by the caller (e.g. a hedged request that lost): not an API error
+    if (error.name === 'AbortError') {
+      throw error;
+    }
+
     console.error("Google Gemini API error:", {
       message: error.message,
       status: error.status,
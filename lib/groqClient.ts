@@ -1,4 +1,5 @@
 import OpenAI from "openai";
+import { openAIUsage, TokenUsage } from "@/lib/usage";
 
 const groqApiKey = process.env.GROQ_API_KEY;
 
@@ -9,18 +10,22 @@ if (!groqApiKey) {
 // Initialize Groq client (uses OpenAI SDK with Groq base URL)
 export const groqClient = new OpenAI({
   apiKey: groqApiKey,
-  baseURL: "https://api.groq.com/openai/v1",
+  baseURL: process.env.GROQ_BASE_URL || "https://api.groq.com/openai/v1",
 });
 
 /**
  * Call Groq API with system instruction to identify as GPT-5
  * @param modelName - The Groq model to use (e.g., "openai/gpt-oss-120b")
  * @param messages - Array of messages in OpenAI format
+ * @param signal - Optional AbortSignal to cancel the request
+ * @param onUsage - Optional callback receiving the reported token usage
  * @returns The AI response text
  */
 export async function callGroq(
   modelName: string,
-  messages: Array<{ role: string; content: string | any[] }>
+  messages: Array<{ role: string; content: string | any[] }>,
+  signal?: AbortSignal,
+  onUsage?: (usage: TokenUsage) => void
 ): Promise<string> {
   try {
     if (!groqApiKey) {
@@ -55,11 +60,19 @@ export async function callGroq(
       messages: finalMessages as any,
       temperature: 0.5,
       max_tokens: 500,
-    });
+    }, { signal });
+
+    const usage = openAIUsage(completion.usage);
+    if (usage) onUsage?.(usage);
 
     const responseText = completion.choices[0].message.content || "No response";
     return responseText;
   } catch (error: any) {
+    // Cancelled or timed out by the caller: not an API error
+    if (signal?.aborted) {
+      throw error;
+    }
+
     console.error("Groq API error:", {
       message: error.message,
       status: error.status,
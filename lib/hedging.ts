@@ -0,0 +1,176 @@
+// Hedged requests for models that have a fallback provider.
+//
+// The primary call starts immediately. If it has not answered within the
+// learned latency percentile for that model, the fallback starts in parallel
+// and whichever succeeds first wins; the other request is aborted. A primary
+// failure before the hedge point starts the fallback right away.
+//
+// Opt-in (BATTLE_HEDGING=on): a hedged call can bill two providers.
+
+const HEDGING_ENABLED = process.env.BATTLE_HEDGING === "on";
+const HEDGE_PERCENTILE = Number(process.env.HEDGE_PERCENTILE) || 95;
+const HEDGE_MIN_DELAY_MS = Number(process.env.HEDGE_MIN_DELAY_MS) || 2000;
+const HEDGE_DEFAULT_DELAY_MS = Number(process.env.HEDGE_DEFAULT_DELAY_MS) || 8000;
+
+// Samples kept per model, and how many are needed before the percentile is trusted
+const WINDOW_SIZE = 100;
+const MIN_SAMPLES = 20;
+
+const latencies = new Map<string, number[]>();
+
+export function isHedgingEnabled(): boolean {
+  return HEDGING_ENABLED;
+}
+
+/**
+ * Record a primary call's latency for a model. When the primary lost or timed
+ * out, the caller records the time it had run so far, a lower bound, so slow
+ * calls are not missing from the samples.
+ */
+export function recordLatency(key: string, ms: number): void {
+  const samples = latencies.get(key) || [];
+  samples.push(ms);
+  if (samples.length > WINDOW_SIZE) {
+    samples.shift();
+  }
+  latencies.set(key, samples);
+}
+
+/**
+ * Delay before the fallback is fired: the model's learned latency percentile,
+ * clamped to [HEDGE_MIN_DELAY_MS, maxDelayMs]
+ */
+export function getHedgeDelay(key: string, maxDelayMs: number): number {
+  const samples = latencies.get(key);
+  if (!samples || samples.length < MIN_SAMPLES) {
+    return Math.min(HEDGE_DEFAULT_DELAY_MS, maxDelayMs);
+  }
+
+  const sorted = [...samples].sort((a, b) => a - b);
+  const rank = Math.ceil((HEDGE_PERCENTILE / 100) * sorted.length) - 1;
+  const learned = sorted[Math.max(0, Math.min(rank, sorted.length - 1))];
+  return Math.min(Math.max(learned, HEDGE_MIN_DELAY_MS), maxDelayMs);
+}
+
+export interface HedgeOptions<T> {
+  key: string;
+  primary: (signal: AbortSignal) => Promise<T>;
+  fallback: (signal: AbortSignal) => Promise<T>;
+  // Primary is treated as failed after this long (the old fallback timeout)
+  timeoutMs: number;
+  // Hedged fallbacks are only worth starting for answers we can use
+  isGoodResult?: (value: T) => boolean;
+}
+
+export interface HedgeResult<T> {
+  value: T;
+  usedFallback: boolean;
+  hedged: boolean;
+}
+
+/**
+ * Run primary and, if it is slow or fails, fallback; first good answer wins.
+ * Rejects with the primary's error when both fail.
+ */
+export function hedge<T>({
+  key,
+  primary,
+  fallback,
+  timeoutMs,
+  isGoodResult = () => true,
+}: HedgeOptions<T>): Promise<HedgeResult<T>> {
+  return new Promise((resolve, reject) => {
+    const primaryController = new AbortController();
+    const fallbackController = new AbortController();
+    const startedAt = Date.now();
+    let settled = false;
+    let fallbackStarted = false;
+    let primaryError: any = null;
+    let fallbackError: any = null;
+    let primaryDone = false;
+    let fallbackDone = false;
+
+    const hedgeTimer = setTimeout(startFallback, getHedgeDelay(key, timeoutMs));
+    const timeoutTimer = setTimeout(() => {
+      if (!primaryDone) {
+        primaryController.abort();
+        recordLatency(key, timeoutMs);
+        onPrimaryFailure(new Error("TIMEOUT"));
+      }
+    }, timeoutMs);
+
+    function finish() {
+      clearTimeout(hedgeTimer);
+      clearTimeout(timeoutTimer);
+    }
+
+    function win(value: T, usedFallback: boolean) {
+      if (settled) return;
+      settled = true;
+      finish();
+      // The aborted primary took at least this long. Without this sample
+      // only fast primaries would be recorded and the hedge delay would
+      // keep shrinking.
+      if (usedFallback && !primaryDone) {
+        recordLatency(key, Date.now() - startedAt);
+      }
+      (usedFallback ? primaryController : fallbackController).abort();
+      resolve({ value, usedFallback, hedged: fallbackStarted });
+    }
+
+    function maybeFail() {
+      if (settled || !primaryDone || (fallbackStarted && !fallbackDone)) return;
+      if (!fallbackStarted) {
+        startFallback();
+        return;
+      }
+      settled = true;
+      finish();
+      console.error(`${key}: hedged fallback also failed:`, fallbackError);
+      reject(primaryError);
+    }
+
+    function onPrimaryFailure(error: any) {
+      if (primaryDone) return;
+      primaryDone = true;
+      primaryError = error;
+      maybeFail();
+    }
+
+    function startFallback() {
+      if (settled || fallbackStarted) return;
+      fallbackStarted = true;
+      console.log(`${key}: primary slow or failed after ${Date.now() - startedAt}ms, hedging with fallback...`);
+      fallback(fallbackController.signal).then(
+        (value) => {
+          fallbackDone = true;
+          if (isGoodResult(value)) {
+            win(value, true);
+          } else {
+            fallbackError = new Error("Fallback returned an empty response");
+            maybeFail();
+          }
+        },
+        (error) => {
+          fallbackDone = true;
+          fallbackError = error;
+          maybeFail();
+        }
+      );
+    }
+
+    primary(primaryController.signal).then(
+      (value) => {
+        if (primaryDone) return;
+        if (isGoodResult(value)) {
+          primaryDone = true;
+          recordLatency(key, Date.now() - startedAt);
+          win(value, false);
+        } else {
+          onPrimaryFailure(new Error("Primary returned an empty response"));
+        }
+      },
+      onPrimaryFailure
+    );
+  });
+}
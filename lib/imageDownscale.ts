@@ -0,0 +1,145 @@
+/**
+ * Client-side image downscaling before upload
+ *
+ * Vision models only need a few hundred thousand pixels, but phones attach
+ * 12MP photos. Images are resized to IMAGE_MAX_DIMENSION on the long edge and
+ * re-encoded (WebP, JPEG where WebP encoding is unsupported) in a Web Worker
+ * with OffscreenCanvas, so the main thread stays responsive.
+ *
+ * Falls back to the original file when workers/OffscreenCanvas are missing,
+ * for animated GIFs, whenever the result would not be smaller, and when the
+ * worker fails or takes longer than 15s.
+ */
+
+export interface DownscaleOptions {
+  maxDimension?: number;
+  quality?: number;
+  type?: 'image/webp' | 'image/jpeg';
+}
+
+export interface DownscaleResult {
+  file: File;
+  originalBytes: number;
+  bytes: number;
+  bytesSaved: number;
+}
+
+export const IMAGE_MAX_DIMENSION = Number(process.env.NEXT_PUBLIC_IMAGE_MAX_DIMENSION) || 1536;
+export const IMAGE_QUALITY = Number(process.env.NEXT_PUBLIC_IMAGE_QUALITY) || 0.85;
+
+// A stuck or crashed worker must not hold up attaching a file
+const DOWNSCALE_TIMEOUT_MS = 15000;
+
+let worker: Worker | null = null;
+let nextId = 0;
+const pending = new Map<number, { resolve: (data: any) => void }>();
+
+// Settle every waiting request with an error and drop the worker, so the
+// next call starts a fresh one
+function failWorker(error: string) {
+  pending.forEach((request) => request.resolve({ error }));
+  pending.clear();
+  worker?.terminate();
+  worker = null;
+}
+
+function getWorker(): Worker | null {
+  if (typeof window === 'undefined' || typeof Worker === 'undefined' || typeof OffscreenCanvas === 'undefined') {
+    return null;
+  }
+  if (!worker) {
+    try {
+      worker = new Worker(new URL('./imageDownscale.worker.ts', import.meta.url));
+    } catch (error) {
+      console.warn('Image downscale worker unavailable:', error);
+      return null;
+    }
+    worker.onmessage = (event: MessageEvent) => {
+      const request = pending.get(event.data.id);
+      if (request) {
+        pending.delete(event.data.id);
+        request.resolve(event.data);
+      }
+    };
+    worker.onerror = (event: ErrorEvent) => {
+      event.preventDefault();
+      failWorker(event.message || 'worker error');
+    };
+    worker.onmessageerror = () => failWorker('worker message could not be read');
+  }
+  return worker;
+}
+
+function unchanged(file: File): DownscaleResult {
+  return { file, originalBytes: file.size, bytes: file.size, bytesSaved: 0 };
+}
+
+/**
+ * Downscale and re-encode an image file. Never rejects; on any problem the
+ * original file is returned with bytesSaved = 0.
+ */
+export async function downscaleImage(file: File, options: DownscaleOptions = {}): Promise<DownscaleResult> {
+  const {
+    maxDimension = IMAGE_MAX_DIMENSION,
+    quality = IMAGE_QUALITY,
+    type = 'image/webp',
+  } = options;
+
+  // GIFs may be animated and SVGs are already small vectors
+  if (file.type === 'image/gif' || file.type === 'image/svg+xml') {
+    return unchanged(file);
+  }
+
+  const downscaler = getWorker();
+  if (!downscaler) {
+    return unchanged(file);
+  }
+
+  const id = nextId++;
+  const data = await new Promise<any>((resolve) => {
+    const timer = setTimeout(() => {
+      pending.delete(id);
+      resolve({ error: 'timed out' });
+    }, DOWNSCALE_TIMEOUT_MS);
+    pending.set(id, {
+      resolve: (result) => {
+        clearTimeout(timer);
+        resolve(result);
+      },
+    });
+
+    try {
+      downscaler.postMessage({ id, file, maxDimension, quality, type });
+    } catch (error: any) {
+      pending.get(id)?.resolve({ error: error?.message || 'postMessage failed' });
+      pending.delete(id);
+    }
+  });
+
+  if (data.error || !data.blob || data.blob.size >= file.size) {
+    if (data.error) {
+      console.warn(`Image downscale failed for ${file.name}:`, data.error);
+    }
+    return unchanged(file);
+  }
+
+  const extension = data.blob.type === 'image/webp' ? 'webp' : 'jpg';
+  const name = file.name.replace(/\.[^.]+$/, '') + `.${extension}`;
+  const resized = new File([data.blob], name, { type: data.blob.type, lastModified: file.lastModified });
+
+  return {
+    file: resized,
+    originalBytes: file.size,
+    bytes: resized.size,
+    bytesSaved: file.size - resized.size,
+  };
+}
+
+/**
+ * Human-readable byte count, e.g. "1.4 MB"
+ */
+export function formatBytes(bytes: number): string {
+  if (bytes < 1024) return `${bytes} B`;
+  if (bytes < 1024 * 1024) return `${(bytes / 1024).toFixed(0)} KB`;
+  return `${(bytes / (1024 * 1024)).toFixed(1)} MB`;
+}
@@ -0,0 +1,45 @@
+// Web Worker: downscale and re-encode an image with OffscreenCanvas, off the
+// main thread. Loaded by lib/imageDownscale.ts.
+
+interface DownscaleRequest {
+  id: number;
+  file: Blob;
+  maxDimension: number;
+  quality: number;
+  type: string;
+}
+
+const worker = self as unknown as {
+  onmessage: ((event: MessageEvent<DownscaleRequest>) => void) | null;
+  postMessage: (message: any) => void;
+};
+
+worker.onmessage = async (event) => {
+  const { id, file, maxDimension, quality, type } = event.data;
+
+  try {
+    const bitmap = await createImageBitmap(file);
+    const scale = Math.min(1, maxDimension / Math.max(bitmap.width, bitmap.height));
+    const width = Math.max(1, Math.round(bitmap.width * scale));
+    const height = Math.max(1, Math.round(bitmap.height * scale));
+
+    const canvas = new OffscreenCanvas(width, height);
+    const context = canvas.getContext('2d');
+    if (!context) {
+      throw new Error('2D context unavailable');
+    }
+    context.imageSmoothingQuality = 'high';
+    context.drawImage(bitmap, 0, 0, width, height);
+    bitmap.close();
+
+    let blob = await canvas.convertToBlob({ type, quality });
+    // Browsers without a WebP encoder silently fall back to PNG; use JPEG instead
+    if (blob.type !== type) {
+      blob = await canvas.convertToBlob({ type: 'image/jpeg', quality });
+    }
+
+    worker.postMessage({ id, blob, width, height });
+  } catch (error: any) {
+    worker.postMessage({ id, error: error?.message || 'Downscale failed' });
+  }
+};
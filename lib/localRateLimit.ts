@@ -0,0 +1,201 @@
+/**
+ * Local rate limit tier
+ *
+ * A per-instance token bucket in front of the durable counter store, keyed by
+ * the same subject ('user:<id>' or 'ip:<address>'). It answers the clear cases
+ * without a round-trip:
+ * - obviously denied: the store denied this subject and the limit has not
+ *   reset yet, or the minimum interval since its last request has not passed
+ * - obviously allowed: the bucket (remaining allowance at the last sync) still
+ *   has tokens, and fewer than RATE_LIMIT_LOCAL_MAX_OVERSHOOT requests are
+ *   waiting to be reconciled
+ * Everything else (unknown subject, stale state, near the limit) goes to the
+ * store synchronously.
+ *
+ * Locally allowed requests are counted in the store asynchronously; each
+ * answer refills the bucket. Routes keep the function alive until those
+ * counts land with after(() => drainRateLimitReconciles()). Requests allowed
+ * locally that the store then refuses are the overshoot, bounded per subject
+ * and instance by the maximum above, and counted in the metrics.
+ */
+
+import { getRateLimitStore, RateLimitHit, RateLimitOutcome, RateLimitStore, RateLimitUsage } from '@/lib/rateLimitStore';
+
+const LOCAL_ENABLED = process.env.RATE_LIMIT_LOCAL !== 'off';
+const MAX_OVERSHOOT = Number(process.env.RATE_LIMIT_LOCAL_MAX_OVERSHOOT ?? 2);
+const STATE_TTL_MS = (Number(process.env.RATE_LIMIT_LOCAL_TTL_SECONDS) || 60) * 1000;
+const MAX_SUBJECTS = 10000;
+
+interface BucketState {
+  hourCount: number; // Store count at last sync plus local hits since
+  dayCount: number;
+  syncedAt: number;
+  pending: number; // Locally allowed, not yet counted by the store
+  denial: RateLimitOutcome | null; // Last hour/day denial from the store
+}
+
+const metrics = {
+  checks: 0,
+  localAllowed: 0,
+  localDenied: 0,
+  storeChecks: 0,
+  reconciled: 0,
+  reconcileErrors: 0,
+  overshoot: 0, // Allowed locally, then refused by the store
+};
+
+// Map keeps insertion order: re-inserting on use makes the first key the stalest
+function touch<V>(map: Map<string, V>, key: string, value: V): void {
+  map.delete(key);
+  map.set(key, value);
+  if (map.size > MAX_SUBJECTS) {
+    const oldest = map.keys().next().value;
+    if (oldest !== undefined) map.delete(oldest);
+  }
+}
+
+export class LocalRateLimitTier implements RateLimitStore {
+  private buckets = new Map<string, BucketState>();
+  private lastRequest = new Map<string, number>(); // Per subject, across buckets
+  private reconciling = new Set<Promise<void>>();
+
+  constructor(private durable: () => RateLimitStore) {}
+
+  async hit(request: RateLimitHit): Promise<RateLimitOutcome> {
+    metrics.checks++;
+    const now = Date.now();
+    const key = `${request.subject}|${request.dayBucket}`;
+    const state = this.buckets.get(key);
+
+    // Obviously denied: the store said no and the window has not reset
+    if (state?.denial && state.denial.resetAt.getTime() > now) {
+      metrics.localDenied++;
+      return state.denial;
+    }
+
+    const last = this.lastRequest.get(request.subject);
+    if (request.minIntervalMs > 0 && last !== undefined && now - last < request.minIntervalMs) {
+      metrics.localDenied++;
+      return {
+        allowed: false,
+        reason: 'interval',
+        hourCount: state?.hourCount ?? 0,
+        dayCount: state?.dayCount ?? 0,
+        resetAt: new Date(last + request.minIntervalMs),
+      };
+    }
+
+    // Obviously allowed: tokens left in the bucket and little unreconciled
+    if (state && now - state.syncedAt < STATE_TTL_MS && state.pending < MAX_OVERSHOOT) {
+      const tokens = Math.min(request.hourLimit - state.hourCount, request.dayLimit - state.dayCount);
+      if (tokens >= 1) {
+        metrics.localAllowed++;
+        state.hourCount++;
+        state.dayCount++;
+        state.pending++;
+        touch(this.lastRequest, request.subject, now);
+        this.reconcile(key, request, state);
+        return {
+          allowed: true,
+          reason: null,
+          hourCount: state.hourCount,
+          dayCount: state.dayCount,
+          resetAt: new Date(now + 24 * 60 * 60 * 1000),
+        };
+      }
+    }
+
+    // Uncertain: ask the store
+    metrics.storeChecks++;
+    const outcome = await this.durable().hit(request);
+    this.sync(key, outcome, this.buckets.get(key)?.pending || 0);
+    if (outcome.allowed) {
+      touch(this.lastRequest, request.subject, Date.now());
+    }
+    return outcome;
+  }
+
+  // Usage is read from the store; local hits reach it once reconciled
+  usage(subject: string): Promise<RateLimitUsage> {
+    return this.durable().usage(subject);
+  }
+
+  // Refill the bucket from a store answer
+  private sync(key: string, outcome: RateLimitOutcome, pending: number): void {
+    touch(this.buckets, key, {
+      hourCount: outcome.hourCount + pending,
+      dayCount: outcome.dayCount + pending,
+      syncedAt: Date.now(),
+      pending,
+      // Interval denials are decided locally from lastRequest
+      denial: !outcome.allowed && outcome.reason !== 'interval' ? outcome : null,
+    });
+  }
+
+  /**
+   * Wait for every background count started so far. Never rejects.
+   */
+  async drain(): Promise<void> {
+    while (this.reconciling.size > 0) {
+      await Promise.all(Array.from(this.reconciling));
+    }
+  }
+
+  // Count a locally allowed request in the store in the background, tracked
+  // until drain(). The interval was already checked here, so the store skips it.
+  private reconcile(key: string, request: RateLimitHit, state: BucketState): void {
+    const counted = this.durable()
+      .hit({ ...request, minIntervalMs: 0 })
+      .then((outcome) => {
+        metrics.reconciled++;
+        if (!outcome.allowed) {
+          metrics.overshoot++;
+        }
+        // The bucket may have been re-synced meanwhile
+        const current = this.buckets.get(key) || state;
+        this.sync(key, outcome, Math.max(0, current.pending - 1));
+      })
+      .catch((error) => {
+        metrics.reconcileErrors++;
+        const current = this.buckets.get(key) || state;
+        current.pending = Math.max(0, current.pending - 1);
+        console.error('Rate limit reconcile error:', error);
+      })
+      .finally(() => {
+        this.reconciling.delete(counted);
+      });
+    this.reconciling.add(counted);
+  }
+}
+
+const localTier = new LocalRateLimitTier(getRateLimitStore);
+
+/**
+ * The limiter to check requests against: the local tier in front of the
+ * durable store, unless disabled (RATE_LIMIT_LOCAL=off) or the store is
+ * already in process
+ */
+export function getRateLimiter(): RateLimitStore {
+  return LOCAL_ENABLED && process.env.RATE_LIMIT_STORE !== 'memory' ? localTier : getRateLimitStore();
+}
+
+/**
+ * Wait for the local tier's background counts, for routes to schedule with
+ * after() so serverless instances are not frozen mid-write
+ */
+export function drainRateLimitReconciles(): Promise<void> {
+  return localTier.drain();
+}
+
+/**
+ * Local tier metrics, for the admin dashboard
+ */
+export function getLocalRateLimitStats() {
+  const local = metrics.localAllowed + metrics.localDenied;
+  return {
+    enabled: LOCAL_ENABLED,
+    maxOvershoot: MAX_OVERSHOOT,
+    ...metrics,
+    hitRate: metrics.checks > 0 ? local / metrics.checks : 0,
+  };
+}
@@ -0,0 +1,409 @@
+/**
+ * Model routing engine
+ *
+ * One routing table, derived from AI_MODELS, for both the battle and the
+ * chat-stream routes: which provider serves each model first, which one is
+ * the fallback, how many calls each provider may have in flight, and how long
+ * a call may take. Route weights can be changed at runtime (see
+ * /api/admin/routing) to move load off a slow provider.
+ */
+
+import { a4fClient, AI_MODELS, AIModel } from "@/lib/a4fClient";
+import { openRouterClient } from "@/lib/openRouterClient";
+import { groqClient, callGroq } from "@/lib/groqClient";
+import { callGemini, googleAI, googleRequestOptions } from "@/lib/googleClient";
+import { isCircuitOpen, Provider, withBreaker } from "@/lib/providerHealth";
+import { CallTiming, estimateUsage, geminiUsage, openAIUsage, TokenUsage } from "@/lib/usage";
+import { withDataUrlImages } from "@/lib/attachments";
+
+export interface ModelRoute {
+  provider: Provider;
+  modelId: string; // Model id at that provider
+  isFallback: boolean;
+  weight: number;
+}
+
+export interface ProviderLimits {
+  maxConcurrent: number;
+  timeoutMs: number;
+}
+
+export interface RouteCallOptions {
+  signal?: AbortSignal;
+  temperature?: number;
+  maxTokens?: number;
+}
+
+export interface RouteCompletion {
+  text: string;
+  usage: TokenUsage;
+  timing: CallTiming;
+}
+
+export interface RouteStreamOptions extends RouteCallOptions {
+  // Called once the stream has finished, with its usage and timing
+  onComplete?: (metrics: Omit<RouteCompletion, 'text'>) => void;
+}
+
+// Per-provider concurrency caps and call timeouts
+export const PROVIDER_LIMITS: Record<Provider, ProviderLimits> = {
+  a4f: { maxConcurrent: 16, timeoutMs: 30000 },
+  groq: { maxConcurrent: 16, timeoutMs: 30000 },
+  openrouter: { maxConcurrent: 8, timeoutMs: 60000 },
+  google: { maxConcurrent: 16, timeoutMs: 30000 },
+};
+
+// Runtime weight overrides, keyed "<modelId>:<provider>"
+const weightOverrides = new Map<string, number>();
+
+function getModel(modelId: string): AIModel | undefined {
+  return AI_MODELS.find((m) => m.id === modelId);
+}
+
+/**
+ * All routes for a model: its own provider first, then the fallback.
+ * By default the primary carries all the weight and the fallback is only
+ * used when the primary fails or is slow.
+ */
+export function getRoutes(modelId: string): ModelRoute[] {
+  const model = getModel(modelId);
+  const primaryProvider: Provider = model?.provider || 'a4f';
+  const routes: ModelRoute[] = [
+    {
+      provider: primaryProvider,
+      modelId,
+      isFallback: false,
+      weight: weightOverrides.get(`${modelId}:${primaryProvider}`) ?? 1,
+    },
+  ];
+
+  if (model?.fallbackId && model.fallbackProvider) {
+    routes.push({
+      provider: model.fallbackProvider,
+      modelId: model.fallbackId,
+      isFallback: true,
+      weight: weightOverrides.get(`${modelId}:${model.fallbackProvider}`) ?? 0,
+    });
+  }
+
+  return routes;
+}
+
+/**
+ * Routes in the order to try them for one request. The first is picked at
+ * random in proportion to the weights; routes whose circuit breaker is open
+ * go last.
+ */
+export function planRoutes(modelId: string): ModelRoute[] {
+  const routes = getRoutes(modelId);
+  const totalWeight = routes.reduce((sum, route) => sum + Math.max(0, route.weight), 0);
+
+  let ordered = routes;
+  if (totalWeight > 0 && routes.length > 1) {
+    let pick = Math.random() * totalWeight;
+    const first = routes.find((route) => (pick -= Math.max(0, route.weight)) < 0) || routes[0];
+    ordered = [first, ...routes.filter((route) => route !== first)];
+  }
+
+  const healthy = ordered.filter((route) => !isCircuitOpen(route.provider, route.modelId));
+  const open = ordered.filter((route) => isCircuitOpen(route.provider, route.modelId));
+  return [...healthy, ...open];
+}
+
+/**
+ * Shift traffic for a model between its providers. Weight 0 means "fallback
+ * only"; the weights of a model's routes are relative to each other.
+ * Returns false for a model not in AI_MODELS, a provider it has no route on,
+ * or a weight that is not a finite, non-negative number (NaN would poison
+ * the weighted pick).
+ */
+export function setRouteWeight(modelId: string, provider: Provider, weight: number): boolean {
+  // getRoutes() makes up an a4f route for any id, so check the model exists
+  if (!Number.isFinite(weight) || weight < 0 || !getModel(modelId)) {
+    return false;
+  }
+  if (!getRoutes(modelId).some((route) => route.provider === provider)) {
+    return false;
+  }
+  weightOverrides.set(`${modelId}:${provider}`, weight);
+  return true;
+}
+
+export function resetRouteWeights(): void {
+  weightOverrides.clear();
+}
+
+// ---------------------------------------------------------------------------
+// Per-provider concurrency caps
+// ---------------------------------------------------------------------------
+
+const active: Record<Provider, number> = { a4f: 0, groq: 0, openrouter: 0, google: 0 };
+const waiting: Record<Provider, Array<() => void>> = { a4f: [], groq: [], openrouter: [], google: [] };
+
+async function acquireSlot(provider: Provider): Promise<void> {
+  if (active[provider] < PROVIDER_LIMITS[provider].maxConcurrent) {
+    active[provider]++;
+    return;
+  }
+  // The releasing call hands its slot straight to us
+  await new Promise<void>((resolve) => waiting[provider].push(resolve));
+}
+
+function releaseSlot(provider: Provider): void {
+  const next = waiting[provider].shift();
+  if (next) {
+    next();
+  } else {
+    active[provider]--;
+  }
+}
+
+/**
+ * Run `fn` once the provider has a free slot
+ */
+export async function withProviderSlot<T>(provider: Provider, fn: () => Promise<T>): Promise<T> {
+  await acquireSlot(provider);
+  try {
+    return await fn();
+  } finally {
+    releaseSlot(provider);
+  }
+}
+
+export function getRoutingTable() {
+  return {
+    providers: (Object.keys(PROVIDER_LIMITS) as Provider[]).map((provider) => ({
+      provider,
+      ...PROVIDER_LIMITS[provider],
+      active: active[provider],
+      queued: waiting[provider].length,
+    })),
+    models: AI_MODELS.map((model) => ({
+      modelId: model.id,
+      name: model.name,
+      routes: getRoutes(model.id),
+    })),
+  };
+}
+
+// ---------------------------------------------------------------------------
+// Calling a route
+// ---------------------------------------------------------------------------
+
+// Text-only copy of messages for providers/models without vision
+export function toTextMessages(messages: any[]): any[] {
+  return messages.map((msg: any) => {
+    if (Array.isArray(msg.content)) {
+      // Extract text parts only
+      const textParts = msg.content.filter((part: any) => part.type === 'text');
+      return {
+        role: msg.role,
+        content: textParts.map((p: any) => p.text).join('\n')
+      };
+    }
+    return msg;
+  });
+}
+
+// Abort signal that fires on the caller's signal or after the provider timeout
+function timeoutSignal(provider: Provider, signal?: AbortSignal): { signal: AbortSignal; timedOut: () => boolean; clear: () => void } {
+  const controller = new AbortController();
+  let didTimeout = false;
+  const timer = setTimeout(() => {
+    didTimeout = true;
+    controller.abort();
+  }, PROVIDER_LIMITS[provider].timeoutMs);
+
+  if (signal) {
+    if (signal.aborted) controller.abort();
+    else signal.addEventListener('abort', () => controller.abort(), { once: true });
+  }
+
+  return { signal: controller.signal, timedOut: () => didTimeout, clear: () => clearTimeout(timer) };
+}
+
+async function callProvider(
+  route: ModelRoute,
+  messages: any[],
+  options: RouteCallOptions,
+  signal: AbortSignal
+): Promise<{ text: string; usage: TokenUsage | null }> {
+  const temperature = options.temperature ?? 0.5;
+  const maxTokens = options.maxTokens ?? 500;
+  let usage: TokenUsage | null = null;
+  const onUsage = (reported: TokenUsage) => { usage = reported; };
+
+  switch (route.provider) {
+    case 'google': {
+      // Google client handles multimodal conversion
+      const text = await callGemini(route.modelId, messages, signal, onUsage);
+      return { text, usage };
+    }
+
+    case 'groq': {
+      const text = await callGroq(route.modelId, messages, signal, onUsage);
+      return { text, usage };
+    }
+
+    case 'openrouter': {
+      // OpenRouter free models don't support vision
+      const completion = await openRouterClient.chat.completions.create({
+        model: route.modelId,
+        messages: toTextMessages(messages),
+        temperature,
+        max_tokens: maxTokens,
+      }, { signal });
+      return { text: completion.choices[0].message.content || "", usage: openAIUsage(completion.usage) };
+    }
+
+    case 'a4f': {
+      const requestOptions: any = {
+        model: route.modelId,
+        messages: withDataUrlImages(messages),
+      };
+      // provider-5 doesn't accept temperature/max_tokens parameters
+      if (!route.modelId.startsWith('provider-5/')) {
+        requestOptions.temperature = temperature;
+        requestOptions.max_tokens = maxTokens;
+      }
+      const completion = await a4fClient.chat.completions.create(requestOptions, { signal });
+      return { text: completion.choices[0].message.content || "", usage: openAIUsage(completion.usage) };
+    }
+  }
+}
+
+/**
+ * Complete a chat on one route, within the provider's concurrency cap and
+ * timeout and through its circuit breaker. Rejects with Error('TIMEOUT') when
+ * the provider timeout fires.
+ *
+ * Non-streaming calls get the whole answer at once, so their TTFT is the
+ * provider time.
+ */
+export function completeWithRoute(route: ModelRoute, messages: any[], options: RouteCallOptions = {}): Promise<RouteCompletion> {
+  const queuedAt = Date.now();
+  return withBreaker(route.provider, route.modelId, () =>
+    withProviderSlot(route.provider, async () => {
+      const startedAt = Date.now();
+      const timeout = timeoutSignal(route.provider, options.signal);
+      try {
+        const { text, usage } = await callProvider(route, messages, options, timeout.signal);
+        const doneAt = Date.now();
+        return {
+          text,
+          usage: usage || estimateUsage(messages, text),
+          timing: { queueMs: startedAt - queuedAt, ttftMs: doneAt - startedAt, totalMs: doneAt - queuedAt },
+        };
+      } catch (error) {
+        if (timeout.timedOut()) throw new Error('TIMEOUT');
+        throw error;
+      } finally {
+        timeout.clear();
+      }
+    })
+  );
+}
+
+/**
+ * Stream a chat on one route as text chunks. The provider slot is held until
+ * the stream ends. Breaker outcomes are recorded by the caller, since only it
+ * knows whether the whole stream succeeded.
+ */
+export async function* streamWithRoute(
+  route: ModelRoute,
+  messages: Array<{ role: string; content: string }>,
+  options: RouteStreamOptions = {}
+): AsyncGenerator<string> {
+  const temperature = options.temperature ?? 0.7;
+  const maxTokens = options.maxTokens ?? 1000;
+
+  const queuedAt = Date.now();
+  await acquireSlot(route.provider);
+  const startedAt = Date.now();
+  let firstTokenAt: number | null = null;
+  let usage: TokenUsage | null = null;
+  let text = '';
+
+  const finish = () => {
+    const doneAt = Date.now();
+    options.onComplete?.({
+      usage: usage || estimateUsage(messages, text),
+      timing: {
+        queueMs: startedAt - queuedAt,
+        ttftMs: (firstTokenAt ?? doneAt) - startedAt,
+        totalMs: doneAt - queuedAt,
+      },
+    });
+  };
+
+  try {
+    if (route.provider === 'google') {
+      if (!googleAI) {
+        throw new Error('Google AI not initialized');
+      }
+
+      const model = googleAI.getGenerativeModel({ model: route.modelId }, googleRequestOptions);
+
+      // Convert messages to Gemini format
+      const geminiMessages = messages.map((msg) => ({
+        role: msg.role === 'assistant' ? 'model' : 'user',
+        parts: [{ text: msg.content }],
+      }));
+
+      // Start chat with history
+      const chat = model.startChat({
+        history: geminiMessages.slice(0, -1),
+        generationConfig: {
+          temperature,
+          maxOutputTokens: maxTokens,
+        },
+      });
+
+      // Send last message and stream response
+      const lastMessage = geminiMessages[geminiMessages.length - 1].parts;
+      const result = await chat.sendMessageStream(lastMessage, { signal: options.signal });
+      for await (const chunk of result.stream) {
+        usage = geminiUsage(chunk.usageMetadata) || usage;
+        const content = chunk.text();
+        if (content) {
+          firstTokenAt = firstTokenAt ?? Date.now();
+          text += content;
+          yield content;
+        }
+      }
+      finish();
+      return;
+    }
+
+    // OpenAI-compatible APIs (Groq, A4F, OpenRouter)
+    const client = route.provider === 'groq' ? groqClient : route.provider === 'openrouter' ? openRouterClient : a4fClient;
+    const requestOptions: any = {
+      model: route.modelId,
+      messages,
+      stream: true,
+      temperature,
+      max_tokens: maxTokens,
+    };
+    // Groq and OpenRouter send token usage in a final chunk when asked
+    if (route.provider !== 'a4f') {
+      requestOptions.stream_options = { include_usage: true };
+    }
+    const response = await client.chat.completions.create(requestOptions, {
+      signal: options.signal,
+      timeout: PROVIDER_LIMITS[route.provider].timeoutMs,
+    }) as any;
+
+    for await (const chunk of response) {
+      usage = openAIUsage(chunk.usage) || usage;
+      const content = chunk.choices?.[0]?.delta?.content || '';
+      if (content) {
+        firstTokenAt = firstTokenAt ?? Date.now();
+        text += content;
+        yield content;
+      }
+    }
+    finish();
+  } finally {
+    releaseSlot(route.provider);
+  }
+}
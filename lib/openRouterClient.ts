@@ -1,7 +1,7 @@
 import OpenAI from "openai";
 
 const openRouterApiKey = process.env.OPENROUTER_API_KEY;
-const openRouterBaseUrl = "https://openrouter.ai/api/v1";
+const openRouterBaseUrl = process.env.OPENROUTER_BASE_URL || "https://openrouter.ai/api/v1";
 
 export const openRouterClient = new OpenAI({
   apiKey: openRouterApiKey,
@@ -0,0 +1,216 @@
+// In-process health tracking and circuit breakers per provider + model.
+//
+// Each key ("a4f:provider-3/llama-4-scout", "google:gemini-2.5-flash-lite", ...)
+// keeps a rolling window of recent outcomes. The breaker opens after
+// repeated failures, so callers can go straight to a fallback (or fail fast)
+// instead of waiting out a timeout. After a cooldown one probe request is let
+// through (half-open); its outcome closes or re-opens the breaker.
+
+export type Provider = 'a4f' | 'google' | 'groq' | 'openrouter';
+export type BreakerState = 'closed' | 'open' | 'half-open';
+
+const WINDOW_MS = 5 * 60 * 1000; // Outcomes older than 5 minutes are dropped
+const WINDOW_SIZE = 50;
+const CONSECUTIVE_FAILURES_TO_OPEN = 5;
+const ERROR_RATE_TO_OPEN = 0.5;
+const MIN_REQUESTS_FOR_RATE = 10;
+const OPEN_COOLDOWN_MS = 30 * 1000;
+
+interface Outcome {
+  at: number;
+  ok: boolean;
+  latencyMs: number;
+}
+
+interface ProviderHealth {
+  provider: Provider;
+  model: string;
+  state: BreakerState;
+  outcomes: Outcome[];
+  consecutiveFailures: number;
+  openedAt: number | null;
+  probeInFlight: boolean;
+  lastError: string | null;
+}
+
+export interface ProviderHealthSnapshot {
+  provider: Provider;
+  model: string;
+  state: BreakerState;
+  requests: number;
+  errorRate: number;
+  avgLatencyMs: number;
+  p95LatencyMs: number;
+  consecutiveFailures: number;
+  openedAt: string | null;
+  lastError: string | null;
+}
+
+export class CircuitOpenError extends Error {
+  constructor(provider: Provider, model: string) {
+    super(`${provider} is temporarily unavailable for ${model}. Please try again shortly.`);
+    this.name = 'CircuitOpenError';
+  }
+}
+
+const health = new Map<string, ProviderHealth>();
+
+function getEntry(provider: Provider, model: string): ProviderHealth {
+  const key = `${provider}:${model}`;
+  let entry = health.get(key);
+  if (!entry) {
+    entry = {
+      provider,
+      model,
+      state: 'closed',
+      outcomes: [],
+      consecutiveFailures: 0,
+      openedAt: null,
+      probeInFlight: false,
+      lastError: null,
+    };
+    health.set(key, entry);
+  }
+  return entry;
+}
+
+function prune(entry: ProviderHealth, now: number) {
+  const cutoff = now - WINDOW_MS;
+  while (entry.outcomes.length > 0 && (entry.outcomes.length > WINDOW_SIZE || entry.outcomes[0].at < cutoff)) {
+    entry.outcomes.shift();
+  }
+}
+
+function errorRate(entry: ProviderHealth): number {
+  if (entry.outcomes.length === 0) return 0;
+  return entry.outcomes.filter((o) => !o.ok).length / entry.outcomes.length;
+}
+
+function open(entry: ProviderHealth, now: number) {
+  if (entry.state !== 'open') {
+    console.warn(`Circuit opened for ${entry.provider}:${entry.model} (${entry.consecutiveFailures} consecutive failures, ${(errorRate(entry) * 100).toFixed(0)}% errors)`);
+  }
+  entry.state = 'open';
+  entry.openedAt = now;
+}
+
+/**
+ * Whether a request may be sent. Moves an open breaker to half-open once the
+ * cooldown has passed and lets exactly one probe through.
+ */
+export function canRequest(provider: Provider, model: string): boolean {
+  const entry = getEntry(provider, model);
+  const now = Date.now();
+
+  if (entry.state === 'open' && entry.openedAt !== null && now - entry.openedAt >= OPEN_COOLDOWN_MS) {
+    entry.state = 'half-open';
+  }
+
+  if (entry.state === 'closed') return true;
+  if (entry.state === 'half-open' && !entry.probeInFlight) {
+    entry.probeInFlight = true;
+    return true;
+  }
+  return false;
+}
+
+export function recordSuccess(provider: Provider, model: string, latencyMs: number): void {
+  const entry = getEntry(provider, model);
+  const now = Date.now();
+  entry.outcomes.push({ at: now, ok: true, latencyMs });
+  prune(entry, now);
+  entry.consecutiveFailures = 0;
+  entry.probeInFlight = false;
+
+  if (entry.state !== 'closed') {
+    console.log(`Circuit closed for ${provider}:${model}`);
+    entry.state = 'closed';
+    entry.openedAt = null;
+  }
+}
+
+/**
+ * Give back a half-open probe without recording an outcome, for calls that
+ * ended on our side (client disconnected, request aborted)
+ */
+export function releaseProbe(provider: Provider, model: string): void {
+  getEntry(provider, model).probeInFlight = false;
+}
+
+export function recordFailure(provider: Provider, model: string, latencyMs: number, error?: any): void {
+  const entry = getEntry(provider, model);
+  const now = Date.now();
+
+  // Aborts are our own doing (hedging, client went away), not provider faults
+  if (error?.name === 'AbortError' || error?.name === 'APIUserAbortError') {
+    releaseProbe(provider, model);
+    return;
+  }
+
+  entry.outcomes.push({ at: now, ok: false, latencyMs });
+  prune(entry, now);
+  entry.consecutiveFailures++;
+  entry.lastError = error?.message || String(error);
+
+  if (entry.state === 'half-open') {
+    entry.probeInFlight = false;
+    open(entry, now);
+  } else if (
+    entry.consecutiveFailures >= CONSECUTIVE_FAILURES_TO_OPEN ||
+    (entry.outcomes.length >= MIN_REQUESTS_FOR_RATE && errorRate(entry) >= ERROR_RATE_TO_OPEN)
+  ) {
+    open(entry, now);
+  }
+}
+
+/**
+ * Run a provider call through its breaker, recording the outcome.
+ * Throws CircuitOpenError without calling `fn` while the breaker is open.
+ */
+export async function withBreaker<T>(provider: Provider, model: string, fn: () => Promise<T>): Promise<T> {
+  if (!canRequest(provider, model)) {
+    throw new CircuitOpenError(provider, model);
+  }
+
+  const startedAt = Date.now();
+  try {
+    const result = await fn();
+    recordSuccess(provider, model, Date.now() - startedAt);
+    return result;
+  } catch (error) {
+    recordFailure(provider, model, Date.now() - startedAt, error);
+    throw error;
+  }
+}
+
+/**
+ * True while the breaker is open and still cooling down (no probe due yet).
+ * Does not claim the half-open probe slot.
+ */
+export function isCircuitOpen(provider: Provider, model: string): boolean {
+  const entry = health.get(`${provider}:${model}`);
+  if (!entry || entry.state === 'closed') return false;
+  if (entry.state === 'half-open') return entry.probeInFlight;
+  return entry.openedAt !== null && Date.now() - entry.openedAt < OPEN_COOLDOWN_MS;
+}
+
+export function getProviderHealth(): ProviderHealthSnapshot[] {
+  const now = Date.now();
+  return Array.from(health.values()).map((entry) => {
+    prune(entry, now);
+    const latencies = entry.outcomes.map((o) => o.latencyMs).sort((a, b) => a - b);
+    const p95Index = Math.max(0, Math.ceil(latencies.length * 0.95) - 1);
+    return {
+      provider: entry.provider,
+      model: entry.model,
+      state: entry.state,
+      requests: entry.outcomes.length,
+      errorRate: errorRate(entry),
+      avgLatencyMs: latencies.length > 0 ? latencies.reduce((sum, ms) => sum + ms, 0) / latencies.length : 0,
+      p95LatencyMs: latencies[p95Index] || 0,
+      consecutiveFailures: entry.consecutiveFailures,
+      openedAt: entry.openedAt ? new Date(entry.openedAt).toISOString() : null,
+      lastError: entry.lastError,
+    };
+  });
+}
@@ -4,11 +4,14 @@
  * Protects API endpoints from abuse and controls costs
  * - IP-based rate limiting for anonymous users
  * - User-based rate limiting for logged-in users
- * - Tracks usage in Supabase
+ * - Tracks usage in Supabase (atomic sliding-window counters, see lib/rateLimitStore.ts)
+ * - Clear-cut cases answered in process first (lib/localRateLimit.ts)
  * - Shows remaining quota to users
  */
 
 import { createClient } from '@supabase/supabase-js';
+import { getRateLimiter } from '@/lib/localRateLimit';
+import { getRateLimitStore } from '@/lib/rateLimitStore';
 
 const supabase = createClient(
   process.env.NEXT_PUBLIC_SUPABASE_URL!,
@@ -60,74 +63,42 @@ export function getClientIp(request: Request): string {
  */
 export async function checkIpRateLimit(ip: string): Promise<RateLimitResult> {
   const now = new Date();
-  const hourAgo = new Date(now.getTime() - 60 * 60 * 1000);
-  const dayAgo = new Date(now.getTime() - 24 * 60 * 60 * 1000);
 
   try {
-    // Get requests in the last hour
-    const { data: hourlyRequests, error: hourError } = await supabase
-      .from('rate_limits')
-      .select('*')
-      .eq('ip_address', ip)
-      .gte('created_at', hourAgo.toISOString());
-
-    if (hourError) throw hourError;
-
-    const hourlyCount = hourlyRequests?.length || 0;
+    // One atomic check-and-count against the hourly and daily windows
+    const outcome = await getRateLimiter().hit({
+      subject: `ip:${ip}`,
+      dayBucket: 'anonymous',
+      hourLimit: RATE_LIMITS.ANONYMOUS_PER_HOUR,
+      dayLimit: RATE_LIMITS.ANONYMOUS_PER_DAY,
+      minIntervalMs: 0,
+    });
 
     // Check hourly limit
-    if (hourlyCount >= RATE_LIMITS.ANONYMOUS_PER_HOUR) {
-      const oldestRequest = hourlyRequests?.[0];
-      const resetAt = oldestRequest 
-        ? new Date(new Date(oldestRequest.created_at).getTime() + 60 * 60 * 1000)
-        : new Date(now.getTime() + 60 * 60 * 1000);
-
+    if (outcome.reason === 'hour') {
       return {
         allowed: false,
         remaining: 0,
         limit: RATE_LIMITS.ANONYMOUS_PER_HOUR,
-        resetAt,
+        resetAt: outcome.resetAt,
         message: 'Hourly rate limit exceeded. Please try again later or sign in for higher limits.',
       };
     }
 
-    // Get requests in the last day
-    const { data: dailyRequests, error: dayError } = await supabase
-      .from('rate_limits')
-      .select('*')
-      .eq('ip_address', ip)
-      .gte('created_at', dayAgo.toISOString());
-
-    if (dayError) throw dayError;
-
-    const dailyCount = dailyRequests?.length || 0;
-
     // Check daily limit
-    if (dailyCount >= RATE_LIMITS.ANONYMOUS_PER_DAY) {
-      const oldestRequest = dailyRequests?.[0];
-      const resetAt = oldestRequest
-        ? new Date(new Date(oldestRequest.created_at).getTime() + 24 * 60 * 60 * 1000)
-        : new Date(now.getTime() + 24 * 60 * 60 * 1000);
-
+    if (outcome.reason === 'day') {
       return {
         allowed: false,
         remaining: 0,
         limit: RATE_LIMITS.ANONYMOUS_PER_DAY,
-        resetAt,
+        resetAt: outcome.resetAt,
         message: 'Daily rate limit exceeded. Sign in to get higher limits!',
       };
     }
 
-    // Log this request
-    await supabase.from('rate_limits').insert({
-      ip_address: ip,
-      request_type: 'anonymous',
-      created_at: now.toISOString(),
-    });
-
     return {
       allowed: true,
-      remaining: RATE_LIMITS.ANONYMOUS_PER_HOUR - hourlyCount - 1,
+      remaining: Math.max(0, RATE_LIMITS.ANONYMOUS_PER_HOUR - outcome.hourCount),
       limit: RATE_LIMITS.ANONYMOUS_PER_HOUR,
       resetAt: new Date(now.getTime() + 60 * 60 * 1000),
     };
@@ -152,94 +123,57 @@ export async function checkUserRateLimit(
   requestType: 'battle' | 'chat' = 'battle'
 ): Promise<RateLimitResult> {
   const now = new Date();
-  const hourAgo = new Date(now.getTime() - 60 * 60 * 1000);
-  const dayAgo = new Date(now.getTime() - 24 * 60 * 60 * 1000);
+  const dailyLimit = requestType === 'battle' 
+    ? RATE_LIMITS.USER_BATTLES_PER_DAY 
+    : RATE_LIMITS.USER_CHATS_PER_DAY;
 
   try {
-    // Get requests in the last hour
-    const { data: hourlyRequests, error: hourError } = await supabase
-      .from('rate_limits')
-      .select('*')
-      .eq('user_id', userId)
-      .gte('created_at', hourAgo.toISOString());
-
-    if (hourError) throw hourError;
-
-    const hourlyCount = hourlyRequests?.length || 0;
+    // One atomic check-and-count: hourly (all types), daily (this type) and
+    // the minimum interval between requests (anti-spam)
+    const outcome = await getRateLimiter().hit({
+      subject: `user:${userId}`,
+      dayBucket: requestType,
+      hourLimit: RATE_LIMITS.USER_PER_HOUR,
+      dayLimit: dailyLimit,
+      minIntervalMs: RATE_LIMITS.MIN_REQUEST_INTERVAL_MS,
+    });
 
     // Check hourly limit
-    if (hourlyCount >= RATE_LIMITS.USER_PER_HOUR) {
-      const oldestRequest = hourlyRequests?.[0];
-      const resetAt = oldestRequest
-        ? new Date(new Date(oldestRequest.created_at).getTime() + 60 * 60 * 1000)
-        : new Date(now.getTime() + 60 * 60 * 1000);
-
+    if (outcome.reason === 'hour') {
       return {
         allowed: false,
         remaining: 0,
         limit: RATE_LIMITS.USER_PER_HOUR,
-        resetAt,
+        resetAt: outcome.resetAt,
         message: 'Hourly rate limit exceeded. Please wait a moment before trying again.',
       };
     }
 
-    // Get requests in the last day for this type
-    const { data: dailyRequests, error: dayError } = await supabase
-      .from('rate_limits')
-      .select('*')
-      .eq('user_id', userId)
-      .eq('request_type', requestType)
-      .gte('created_at', dayAgo.toISOString());
-
-    if (dayError) throw dayError;
-
-    const dailyCount = dailyRequests?.length || 0;
-    const dailyLimit = requestType === 'battle' 
-      ? RATE_LIMITS.USER_BATTLES_PER_DAY 
-      : RATE_LIMITS.USER_CHATS_PER_DAY;
-
     // Check daily limit
-    if (dailyCount >= dailyLimit) {
-      const oldestRequest = dailyRequests?.[0];
-      const resetAt = oldestRequest
-        ? new Date(new Date(oldestRequest.created_at).getTime() + 24 * 60 * 60 * 1000)
-        : new Date(now.getTime() + 24 * 60 * 60 * 1000);
-
+    if (outcome.reason === 'day') {
       return {
         allowed: false,
         remaining: 0,
         limit: dailyLimit,
-        resetAt,
+        resetAt: outcome.resetAt,
         message: `Daily ${requestType} limit exceeded. You can use ${dailyLimit} ${requestType}s per day.`,
       };
     }
 
     // Check minimum request interval (anti-spam)
-    if (hourlyRequests && hourlyRequests.length > 0) {
-      const lastRequest = hourlyRequests[hourlyRequests.length - 1];
-      const timeSinceLastRequest = now.getTime() - new Date(lastRequest.created_at).getTime();
-      
-      if (timeSinceLastRequest < RATE_LIMITS.MIN_REQUEST_INTERVAL_MS) {
-        return {
-          allowed: false,
-          remaining: 0,
-          limit: RATE_LIMITS.USER_PER_HOUR,
-          resetAt: new Date(now.getTime() + RATE_LIMITS.MIN_REQUEST_INTERVAL_MS),
-          message: 'Please wait a moment before sending another request.',
-        };
-      }
+    if (outcome.reason === 'interval') {
+      return {
+        allowed: false,
+        remaining: 0,
+        limit: RATE_LIMITS.USER_PER_HOUR,
+        resetAt: outcome.resetAt,
+        message: 'Please wait a moment before sending another request.',
+      };
     }
 
-    // Log this request
-    await supabase.from('rate_limits').insert({
-      user_id: userId,
-      request_type: requestType,
-      created_at: now.toISOString(),
-    });
-
     return {
       allowed: true,
-      remaining: dailyLimit - dailyCount - 1,
+      remaining: Math.max(0, dailyLimit - outcome.dayCount),
       limit: dailyLimit,
       resetAt: new Date(now.getTime() + 24 * 60 * 60 * 1000),
     };
@@ -247,10 +181,6 @@ export async function checkUserRateLimit(
   } catch (error) {
     console.error('Rate limit check error:', error);
     // Allow request on error (fail open)
-    const dailyLimit = requestType === 'battle' 
-      ? RATE_LIMITS.USER_BATTLES_PER_DAY 
-      : RATE_LIMITS.USER_CHATS_PER_DAY;
-
     return {
       allowed: true,
       remaining: dailyLimit,
@@ -261,7 +191,7 @@ export async function checkUserRateLimit(
 }
 
 /**
- * Get user's current usage stats
+ * Get user's current usage stats (one aggregate over the rate limit counters)
  */
 export async function getUserUsageStats(userId: string): Promise<{
   battlesToday: number;
@@ -269,38 +199,14 @@ export async function getUserUsageStats(userId: string): Promise<{
   requestsThisHour: number;
   battlesRemaining: number;
   chatsRemaining: number;
+  hourlyRemaining: number;
 }> {
-  const now = new Date();
-  const hourAgo = new Date(now.getTime() - 60 * 60 * 1000);
-  const dayAgo = new Date(now.getTime() - 24 * 60 * 60 * 1000);
-
   try {
-    // Get hourly requests
-    const { data: hourlyData } = await supabase
-      .from('rate_limits')
-      .select('*')
-      .eq('user_id', userId)
-      .gte('created_at', hourAgo.toISOString());
-
-    // Get daily battles
-    const { data: battleData } = await supabase
-      .from('rate_limits')
-      .select('*')
-      .eq('user_id', userId)
-      .eq('request_type', 'battle')
-      .gte('created_at', dayAgo.toISOString());
-
-    // Get daily chats
-    const { data: chatData } = await supabase
-      .from('rate_limits')
-      .select('*')
-      .eq('user_id', userId)
-      .eq('request_type', 'chat')
-      .gte('created_at', dayAgo.toISOString());
+    const usage = await getRateLimitStore().usage(`user:${userId}`);
 
-    const battlesToday = battleData?.length || 0;
-    const chatsToday = chatData?.length || 0;
-    const requestsThisHour = hourlyData?.length || 0;
+    const battlesToday = usage.battle || 0;
+    const chatsToday = usage.chat || 0;
+    const requestsThisHour = usage.hour || 0;
 
     return {
       battlesToday,
@@ -308,6 +214,7 @@ export async function getUserUsageStats(userId: string): Promise<{
       requestsThisHour,
       battlesRemaining: Math.max(0, RATE_LIMITS.USER_BATTLES_PER_DAY - battlesToday),
       chatsRemaining: Math.max(0, RATE_LIMITS.USER_CHATS_PER_DAY - chatsToday),
+      hourlyRemaining: Math.max(0, RATE_LIMITS.USER_PER_HOUR - requestsThisHour),
     };
 
   } catch (error) {
@@ -318,6 +225,40 @@ export async function getUserUsageStats(userId: string): Promise<{
       requestsThisHour: 0,
       battlesRemaining: RATE_LIMITS.USER_BATTLES_PER_DAY,
       chatsRemaining: RATE_LIMITS.USER_CHATS_PER_DAY,
+      hourlyRemaining: RATE_LIMITS.USER_PER_HOUR,
+    };
+  }
+}
+
+/**
+ * Get an anonymous visitor's current usage stats by IP
+ */
+export async function getIpUsageStats(ip: string): Promise<{
+  requestsToday: number;
+  requestsThisHour: number;
+  dailyRemaining: number;
+  hourlyRemaining: number;
+}> {
+  try {
+    const usage = await getRateLimitStore().usage(`ip:${ip}`);
+
+    const requestsToday = usage.anonymous || 0;
+    const requestsThisHour = usage.hour || 0;
+
+    return {
+      requestsToday,
+      requestsThisHour,
+      dailyRemaining: Math.max(0, RATE_LIMITS.ANONYMOUS_PER_DAY - requestsToday),
+      hourlyRemaining: Math.max(0, RATE_LIMITS.ANONYMOUS_PER_HOUR - requestsThisHour),
+    };
+
+  } catch (error) {
+    console.error('Usage stats error:', error);
+    return {
+      requestsToday: 0,
+      requestsThisHour: 0,
+      dailyRemaining: RATE_LIMITS.ANONYMOUS_PER_DAY,
+      hourlyRemaining: RATE_LIMITS.ANONYMOUS_PER_HOUR,
     };
   }
 }
@@ -334,6 +275,12 @@ export async function cleanupOldRateLimits(): Promise<void> {
       .delete()
       .lt('created_at', weekAgo.toISOString());
 
+    // Counters older than two days no longer affect any window
+    await supabase
+      .from('rate_limit_counters')
+      .delete()
+      .lt('window_start', new Date(Date.now() - 2 * 24 * 60 * 60 * 1000).toISOString());
+
     console.log('Cleaned up old rate limit entries');
   } catch (error) {
     console.error('Cleanup error:', error);
@@ -0,0 +1,221 @@
+/**
+ * Counter stores for the rate limiter
+ *
+ * Each check is one atomic "hit": read the subject's hourly and daily
+ * sliding-window counts and the time of its last request, and if every limit
+ * allows it, count the request, all in one step. Concurrent requests from
+ * the same subject cannot race past a limit.
+ *
+ * Sliding windows are approximated from fixed-window counters: the current
+ * window's count plus the previous window's count weighted by how much of it
+ * still overlaps the last hour/day. O(1) per check, whatever the usage.
+ *
+ * Stores:
+ * - SupabaseRateLimitStore (default): one RPC to the rate_limit_hit() Postgres
+ *   function, shared by all server instances
+ * - MemoryRateLimitStore: same algorithm in process, for development or a
+ *   single instance (RATE_LIMIT_STORE=memory)
+ * Other backends (Redis, ...) can be plugged in with setRateLimitStore().
+ */
+
+import { createClient } from '@supabase/supabase-js';
+
+export const HOUR_SECONDS = 60 * 60;
+export const DAY_SECONDS = 24 * 60 * 60;
+
+export interface RateLimitHit {
+  subject: string; // 'user:<id>' or 'ip:<address>'
+  dayBucket: string; // Daily counter: 'battle', 'chat' or 'anonymous'
+  hourLimit: number;
+  dayLimit: number;
+  minIntervalMs: number; // 0 to skip the interval check
+}
+
+export interface RateLimitOutcome {
+  allowed: boolean;
+  reason: 'hour' | 'day' | 'interval' | null; // Limit that denied the request
+  hourCount: number; // Requests in the last hour, including this one if allowed
+  dayCount: number; // Requests of this bucket in the last day, likewise
+  resetAt: Date; // When the denying limit frees up, per the sliding estimate (allowed: end of the day window)
+}
+
+// Sliding-window counts of one subject, keyed by bucket ('hour', 'battle', ...)
+export type RateLimitUsage = Record<string, number>;
+
+export interface RateLimitStore {
+  hit(request: RateLimitHit): Promise<RateLimitOutcome>;
+  // Read-only: current counts of every bucket of a subject
+  usage(subject: string): Promise<RateLimitUsage>;
+}
+
+function windowStart(nowMs: number, windowSeconds: number): number {
+  const windowMs = windowSeconds * 1000;
+  return Math.floor(nowMs / windowMs) * windowMs;
+}
+
+/**
+ * When a sliding-window count at or over `limit` drops below it again, if no
+ * further requests are counted. Mirrors rate_limit_reset_at() in
+ * supabase/migrations/20250121_rate_limit_reset_at.sql.
+ */
+function slidingWindowResetAt(current: number, previous: number, limit: number, start: number, windowMs: number): number {
+  if (limit <= 0) return start + 2 * windowMs;
+  if (current < limit) {
+    // The previous window's share decays until it fits under the limit
+    return previous > 0 ? start + windowMs * (1 - (limit - current) / previous) : start;
+  }
+  // The current count becomes the previous window and decays through the next one
+  return start + windowMs * (2 - limit / current);
+}
+
+/**
+ * In-process sliding-window counters. Counts are per server instance.
+ */
+export class MemoryRateLimitStore implements RateLimitStore {
+  // "<subject>|<bucket>" -> window start -> count
+  private counters = new Map<string, Map<number, number>>();
+  private lastRequest = new Map<string, number>();
+
+  // Counts of the current and previous fixed windows
+  private windows(subject: string, bucket: string, windowSeconds: number, nowMs: number): { current: number; previous: number } {
+    const windows = this.counters.get(`${subject}|${bucket}`);
+    if (!windows) return { current: 0, previous: 0 };
+
+    const start = windowStart(nowMs, windowSeconds);
+    const previousStart = start - windowSeconds * 1000;
+
+    // Older windows no longer count
+    windows.forEach((_count, key) => {
+      if (key < previousStart) windows.delete(key);
+    });
+
+    return { current: windows.get(start) || 0, previous: windows.get(previousStart) || 0 };
+  }
+
+  private count(subject: string, bucket: string, windowSeconds: number, nowMs: number): number {
+    const { current, previous } = this.windows(subject, bucket, windowSeconds, nowMs);
+    const elapsed = (nowMs - windowStart(nowMs, windowSeconds)) / (windowSeconds * 1000);
+    return current + previous * (1 - elapsed);
+  }
+
+  private resetAt(subject: string, bucket: string, windowSeconds: number, limit: number, nowMs: number): Date {
+    const { current, previous } = this.windows(subject, bucket, windowSeconds, nowMs);
+    return new Date(slidingWindowResetAt(current, previous, limit, windowStart(nowMs, windowSeconds), windowSeconds * 1000));
+  }
+
+  private increment(subject: string, bucket: string, windowSeconds: number, nowMs: number): void {
+    const key = `${subject}|${bucket}`;
+    let windows = this.counters.get(key);
+    if (!windows) {
+      windows = new Map();
+      this.counters.set(key, windows);
+    }
+    const start = windowStart(nowMs, windowSeconds);
+    windows.set(start, (windows.get(start) || 0) + 1);
+  }
+
+  // Synchronous, so a check and its increment cannot interleave with another
+  async hit(request: RateLimitHit): Promise<RateLimitOutcome> {
+    const now = Date.now();
+    const hourCount = this.count(request.subject, 'hour', HOUR_SECONDS, now);
+    const dayCount = this.count(request.subject, request.dayBucket, DAY_SECONDS, now);
+    const dayReset = new Date(windowStart(now, DAY_SECONDS) + DAY_SECONDS * 1000);
+
+    if (hourCount >= request.hourLimit) {
+      const resetAt = this.resetAt(request.subject, 'hour', HOUR_SECONDS, request.hourLimit, now);
+      return { allowed: false, reason: 'hour', hourCount: Math.floor(hourCount), dayCount: Math.floor(dayCount), resetAt };
+    }
+    if (dayCount >= request.dayLimit) {
+      const resetAt = this.resetAt(request.subject, request.dayBucket, DAY_SECONDS, request.dayLimit, now);
+      return { allowed: false, reason: 'day', hourCount: Math.floor(hourCount), dayCount: Math.floor(dayCount), resetAt };
+    }
+
+    const last = this.lastRequest.get(request.subject);
+    if (request.minIntervalMs > 0 && last !== undefined && now - last < request.minIntervalMs) {
+      return {
+        allowed: false,
+        reason: 'interval',
+        hourCount: Math.floor(hourCount),
+        dayCount: Math.floor(dayCount),
+        resetAt: new Date(last + request.minIntervalMs),
+      };
+    }
+
+    this.increment(request.subject, 'hour', HOUR_SECONDS, now);
+    this.increment(request.subject, request.dayBucket, DAY_SECONDS, now);
+    this.lastRequest.set(request.subject, now);
+
+    return {
+      allowed: true,
+      reason: null,
+      hourCount: Math.floor(hourCount) + 1,
+      dayCount: Math.floor(dayCount) + 1,
+      resetAt: dayReset,
+    };
+  }
+
+  async usage(subject: string): Promise<RateLimitUsage> {
+    const now = Date.now();
+    const result: RateLimitUsage = {};
+    const prefix = `${subject}|`;
+    Array.from(this.counters.keys()).forEach((key) => {
+      if (!key.startsWith(prefix)) return;
+      const bucket = key.slice(prefix.length);
+      result[bucket] = Math.floor(this.count(subject, bucket, bucket === 'hour' ? HOUR_SECONDS : DAY_SECONDS, now));
+    });
+    return result;
+  }
+}
+
+/**
+ * Counters in Postgres, updated by the rate_limit_hit() function
+ * (supabase/migrations/20250119_rate_limit_counters.sql, reset times from
+ * 20250121_rate_limit_reset_at.sql)
+ */
+export class SupabaseRateLimitStore implements RateLimitStore {
+  private supabase = createClient(
+    process.env.NEXT_PUBLIC_SUPABASE_URL!,
+    process.env.SUPABASE_SERVICE_ROLE_KEY!
+  );
+
+  async hit(request: RateLimitHit): Promise<RateLimitOutcome> {
+    const { data, error } = await this.supabase.rpc('rate_limit_hit', {
+      p_subject: request.subject,
+      p_day_bucket: request.dayBucket,
+      p_hour_limit: request.hourLimit,
+      p_day_limit: request.dayLimit,
+      p_min_interval_ms: request.minIntervalMs,
+    });
+
+    if (error) throw error;
+
+    return {
+      allowed: data.allowed,
+      reason: data.reason,
+      hourCount: data.hour_count,
+      dayCount: data.day_count,
+      resetAt: new Date(data.reset_at),
+    };
+  }
+
+  // One grouped aggregate over the subject's counters (rate_limit_usage())
+  async usage(subject: string): Promise<RateLimitUsage> {
+    const { data, error } = await this.supabase.rpc('rate_limit_usage', { p_subject: subject });
+    if (error) throw error;
+    return (data || {}) as RateLimitUsage;
+  }
+}
+
+let store: RateLimitStore =
+  process.env.RATE_LIMIT_STORE === 'memory' ? new MemoryRateLimitStore() : new SupabaseRateLimitStore();
+
+/**
+ * Replace the counter store, e.g. with a Redis-backed one
+ */
+export function setRateLimitStore(next: RateLimitStore): void {
+  store = next;
+}
+
+export function getRateLimitStore(): RateLimitStore {
+  return store;
+}
@@ -0,0 +1,174 @@
+/**
+ * Response cache for battle results
+ *
+ * Opt-in (RESPONSE_CACHE=on). Keys are the model id plus a SHA-256 of the
+ * normalized prompt, the last 4 history messages and attachment digests, so
+ * the same question in the same context is answered once per TTL.
+ *
+ * Two tiers: an in-memory LRU per server instance, and an optional shared
+ * tier (Redis, Supabase, ...) registered with setSharedCacheStore().
+ */
+
+import { createHash } from 'crypto';
+
+export interface CachedResponse {
+  model: string;
+  name: string;
+  text: string;
+  usedFallback?: boolean;
+}
+
+/**
+ * Backend for the shared tier. Implementations should treat errors as misses.
+ */
+export interface CacheStore {
+  get(key: string): Promise<CachedResponse | null>;
+  set(key: string, value: CachedResponse, ttlMs: number): Promise<void>;
+}
+
+const CACHE_ENABLED = process.env.RESPONSE_CACHE === 'on';
+const CACHE_TTL_MS = (Number(process.env.RESPONSE_CACHE_TTL_SECONDS) || 60 * 60) * 1000;
+const CACHE_MAX_ENTRIES = Number(process.env.RESPONSE_CACHE_MAX_ENTRIES) || 500;
+// Image prompts are skipped unless explicitly allowed
+const CACHE_IMAGE_PROMPTS = process.env.RESPONSE_CACHE_IMAGES === 'on';
+
+// Same history window the battle route sends to the models
+const HISTORY_WINDOW = 4;
+
+/**
+ * In-memory LRU with per-entry expiry. Map keeps insertion order, so the
+ * first key is always the least recently used one.
+ */
+export class MemoryCacheStore implements CacheStore {
+  private entries = new Map<string, { value: CachedResponse; expiresAt: number }>();
+
+  constructor(private maxEntries: number) {}
+
+  async get(key: string): Promise<CachedResponse | null> {
+    const entry = this.entries.get(key);
+    if (!entry) return null;
+
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return null;
+    }
+
+    // Refresh recency
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  async set(key: string, value: CachedResponse, ttlMs: number): Promise<void> {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+
+    while (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value;
+      if (oldest === undefined) break;
+      this.entries.delete(oldest);
+    }
+  }
+
+  get size(): number {
+    return this.entries.size;
+  }
+}
+
+const memoryStore = new MemoryCacheStore(CACHE_MAX_ENTRIES);
+let sharedStore: CacheStore | null = null;
+
+/**
+ * Register the shared tier, e.g. a Redis-backed store. Pass null to remove it.
+ */
+export function setSharedCacheStore(store: CacheStore | null): void {
+  sharedStore = store;
+}
+
+export function isResponseCacheEnabled(): boolean {
+  return CACHE_ENABLED;
+}
+
+/**
+ * Whether a request with these attachments may use the cache
+ */
+export function isCacheable(attachments?: any[]): boolean {
+  if (!CACHE_ENABLED) return false;
+  const hasImages = attachments?.some((a: any) => a.type === 'image') || false;
+  return !hasImages || CACHE_IMAGE_PROMPTS;
+}
+
+function sha256(value: string | Uint8Array): string {
+  return createHash('sha256').update(value).digest('hex');
+}
+
+// Case is kept: "US" and "us", or code identifiers, can change the answer
+function normalizeText(text: string): string {
+  return text.trim().replace(/\s+/g, ' ');
+}
+
+// History content can be a string or multimodal parts; images are reduced to digests
+function normalizeContent(content: any): any {
+  if (typeof content === 'string') {
+    return normalizeText(content);
+  }
+  if (Array.isArray(content)) {
+    return content.map((part: any) => {
+      if (part.type === 'text') return normalizeText(part.text || '');
+      if (part.type === 'image_url') return `image:${sha256(part.image_url?.url || '')}`;
+      return part.type;
+    });
+  }
+  return null;
+}
+
+/**
+ * Cache key for one model's answer to a battle request
+ */
+export function responseCacheKey(
+  modelId: string,
+  prompt: string,
+  conversationHistory: any[],
+  attachments?: any[]
+): string {
+  const material = JSON.stringify({
+    prompt: normalizeText(prompt),
+    history: conversationHistory.slice(-HISTORY_WINDOW).map((item: any) => [item.role, normalizeContent(item.content)]),
+    attachments: (attachments || []).map((a: any) => `${a.type}:${sha256(a.bytes || a.data || '')}`),
+  });
+  return `battle:${modelId}:${sha256(material)}`;
+}
+
+/**
+ * Look up a cached response: memory first, then the shared tier
+ */
+export async function getCachedResponse(key: string): Promise<CachedResponse | null> {
+  const local = await memoryStore.get(key);
+  if (local) return local;
+
+  if (!sharedStore) return null;
+  try {
+    const shared = await sharedStore.get(key);
+    if (shared) {
+      await memoryStore.set(key, shared, CACHE_TTL_MS);
+    }
+    return shared;
+  } catch (error) {
+    console.error('Shared response cache read failed:', error);
+    return null;
+  }
+}
+
+/**
+ * Store a response in both tiers
+ */
+export async function setCachedResponse(key: string, value: CachedResponse): Promise<void> {
+  await memoryStore.set(key, value, CACHE_TTL_MS);
+
+  if (!sharedStore) return;
+  try {
+    await sharedStore.set(key, value, CACHE_TTL_MS);
+  } catch (error) {
+    console.error('Shared response cache write failed:', error);
+  }
+}
@@ -0,0 +1,31 @@
+// Single-flight: concurrent calls with the same key share one in-flight promise.
+//
+// Used around per-model provider calls so a double-submit or a burst of
+// identical prompts costs one upstream request. Nothing is kept once the
+// promise settles; that is the response cache's job.
+
+const inFlight = new Map<string, Promise<unknown>>();
+
+/**
+ * Run `fn` unless a call with the same key is already in flight, in which
+ * case wait for that call's result (or error) instead.
+ */
+export function singleFlight<T>(key: string, fn: () => Promise<T>): Promise<T> {
+  const existing = inFlight.get(key);
+  if (existing) {
+    return existing as Promise<T>;
+  }
+
+  const promise = fn().finally(() => {
+    inFlight.delete(key);
+  });
+  inFlight.set(key, promise);
+  return promise;
+}
+
+/**
+ * Number of distinct calls currently in flight
+ */
+export function inFlightCount(): number {
+  return inFlight.size;
+}
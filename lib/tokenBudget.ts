@@ -0,0 +1,146 @@
+/**
+ * Token budgets for prompts sent to the models
+ *
+ * History and attachments used to be forwarded whatever their size: a pasted
+ * document from an earlier turn was resent in full on every message. These
+ * helpers estimate tokens and trim history and documents to per-model
+ * budgets, so prompt size (and with it latency and cost) is bounded.
+ *
+ * Estimates use ~4 characters per token, which is close enough for English
+ * text across these models' tokenizers and needs no tokenizer download.
+ */
+
+import { getModelPrice } from "@/lib/usage";
+
+export interface TokenBudget {
+  contextTokens: number; // Model context window
+  historyTokens: number; // Max tokens of conversation history per request
+  documentTokens: number; // Max tokens per attached document
+  messageTokens: number; // Max tokens of any single history message
+  promptCostUsd?: number; // Max prompt cost per request, for per-token billed models
+}
+
+const CHARS_PER_TOKEN = 4;
+// Rough cost of one image part in history for vision models
+const IMAGE_TOKENS = 800;
+
+const DEFAULT_BUDGET: TokenBudget = {
+  contextTokens: 32000,
+  historyTokens: 3000,
+  documentTokens: 6000,
+  messageTokens: 1500,
+};
+
+// Per-model budgets. Free-tier models get tighter history budgets: their
+// per-minute token quotas, not their context windows, are the real limit.
+export const MODEL_BUDGETS: Record<string, Partial<TokenBudget>> = {
+  'openai/gpt-oss-120b': { contextTokens: 131072, historyTokens: 2500, documentTokens: 5000, promptCostUsd: 0.0006 },
+  'provider-3/llama-4-scout': { contextTokens: 131072 },
+  'deepseek/deepseek-chat-v3.1:free': { contextTokens: 163840, historyTokens: 2000, documentTokens: 4000 },
+  'gemini-2.5-flash-lite': { contextTokens: 1048576, historyTokens: 4000, documentTokens: 8000, messageTokens: 2000, promptCostUsd: 0.0006 },
+};
+
+export function getTokenBudget(modelId: string): TokenBudget {
+  return { ...DEFAULT_BUDGET, ...MODEL_BUDGETS[modelId] };
+}
+
+/**
+ * Prompt tokens the model's cost budget pays for, at its input price
+ * (lib/usage.ts, including the MODEL_PRICING override). Infinity when there is no cost budget or no price.
+ */
+export function costBudgetTokens(modelId: string): number {
+  const { promptCostUsd } = getTokenBudget(modelId);
+  const inputPrice = getModelPrice(modelId)?.input || 0;
+  if (promptCostUsd === undefined || inputPrice <= 0) return Infinity;
+  return Math.floor((promptCostUsd / inputPrice) * 1000000);
+}
+
+/**
+ * Estimated token count of a string or multimodal content array
+ */
+export function estimateTokens(content: string | any[] | null | undefined): number {
+  if (!content) return 0;
+  if (typeof content === 'string') {
+    return Math.ceil(content.length / CHARS_PER_TOKEN);
+  }
+  return content.reduce((sum: number, part: any) => {
+    if (part.type === 'text') return sum + estimateTokens(part.text);
+    if (part.type === 'image_url' || part.type === 'image_bytes') return sum + IMAGE_TOKENS;
+    return sum;
+  }, 0);
+}
+
+/**
+ * Cut text to roughly `maxTokens`, keeping the start and the end and marking
+ * what was dropped
+ */
+export function truncateToTokens(text: string, maxTokens: number): string {
+  const maxChars = maxTokens * CHARS_PER_TOKEN;
+  if (text.length <= maxChars) return text;
+
+  const head = text.slice(0, Math.floor(maxChars * 0.8));
+  const tail = text.slice(text.length - Math.floor(maxChars * 0.2));
+  const omitted = estimateTokens(text) - maxTokens;
+  return `${head}\n\n[... ~${omitted} tokens omitted ...]\n\n${tail}`;
+}
+
+// `[File: name]\n<content>` blocks, as inlined for document attachments
+const FILE_BLOCK = /(\[File: [^\]\n]*\]\n)([\s\S]*?)(?=\n\n\[File: |$)/g;
+
+/**
+ * Truncate inlined `[File: ...]` blocks inside a message to `maxTokens` each
+ */
+export function compactFileBlocks(text: string, maxTokens: number): string {
+  return text.replace(FILE_BLOCK, (_match, header: string, body: string) => header + truncateToTokens(body, maxTokens));
+}
+
+function compactMessage(message: any, budget: TokenBudget): any {
+  if (typeof message.content !== 'string') return message;
+  const content = truncateToTokens(compactFileBlocks(message.content, budget.messageTokens), budget.messageTokens);
+  return content === message.content ? message : { ...message, content };
+}
+
+/**
+ * Pick the history to send: at most `maxItems` recent messages, each capped
+ * at the model's per-message budget, dropping the oldest until the total
+ * fits the history budget (and the context window and cost budget minus
+ * `reservedTokens` for the prompt and the answer).
+ *
+ * The result always starts with a user turn: Gemini rejects chat history
+ * that starts with the model.
+ */
+export function fitHistory<T extends { role?: string; content: any }>(
+  history: T[],
+  modelId: string,
+  maxItems: number,
+  reservedTokens = 0
+): T[] {
+  const budget = getTokenBudget(modelId);
+  const limit = Math.min(
+    budget.historyTokens,
+    budget.contextTokens - reservedTokens,
+    costBudgetTokens(modelId) - reservedTokens
+  );
+  const recent = history.slice(-maxItems).map((message) => compactMessage(message, budget));
+
+  let total = recent.reduce((sum, message) => sum + estimateTokens(message.content), 0);
+  while (recent.length > 0 && total > limit) {
+    total -= estimateTokens(recent.shift()!.content);
+  }
+  // Drop leading assistant turns so whole user/assistant pairs remain
+  while (recent.length > 0 && recent[0].role !== undefined && recent[0].role !== 'user') {
+    total -= estimateTokens(recent.shift()!.content);
+  }
+
+  if (recent.length < Math.min(history.length, maxItems)) {
+    console.log(`${modelId}: history trimmed to ${recent.length} message(s), ~${total} tokens`);
+  }
+  return recent;
+}
+
+/**
+ * Truncate an attached document to the model's document budget
+ */
+export function fitDocument(text: string, modelId: string): string {
+  return truncateToTokens(text, getTokenBudget(modelId).documentTokens);
+}
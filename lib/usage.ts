@@ -0,0 +1,100 @@
+/**
+ * Per-call usage accounting: token counts, timings and cost
+ *
+ * Token counts come from the providers' usage fields (OpenAI-style `usage`,
+ * Gemini `usageMetadata`). When a provider reports nothing they are estimated
+ * from the text and flagged as such. Cost is computed from MODEL_PRICING.
+ */
+
+import { estimateTokens } from "@/lib/tokenBudget";
+
+export interface TokenUsage {
+  promptTokens: number;
+  completionTokens: number;
+  estimated?: boolean; // No usage fields from the provider
+}
+
+export interface CallTiming {
+  queueMs: number; // Waiting for a provider slot
+  ttftMs: number; // Slot acquired -> first token (whole answer for non-streaming calls)
+  totalMs: number; // Queue + provider time
+}
+
+export interface ModelPrice {
+  input: number; // USD per 1M prompt tokens
+  output: number; // USD per 1M completion tokens
+}
+
+// Keyed by the model id at the provider (route.modelId). OpenRouter `:free`
+// models and the A4F plan are not billed per token.
+export const MODEL_PRICING: Record<string, ModelPrice> = {
+  'openai/gpt-oss-120b': { input: 0.15, output: 0.75 },
+  'gemini-2.5-flash-lite': { input: 0.1, output: 0.4 },
+  'provider-3/llama-4-scout': { input: 0, output: 0 },
+  'meta-llama/llama-4-scout:free': { input: 0, output: 0 },
+  'deepseek/deepseek-chat-v3.1:free': { input: 0, output: 0 },
+};
+
+// MODEL_PRICING env var: JSON object of the same shape, merged over the table
+function loadPricing(): Record<string, ModelPrice> {
+  if (!process.env.MODEL_PRICING) return MODEL_PRICING;
+  try {
+    return { ...MODEL_PRICING, ...JSON.parse(process.env.MODEL_PRICING) };
+  } catch (error) {
+    console.error('Invalid MODEL_PRICING, using defaults:', error);
+    return MODEL_PRICING;
+  }
+}
+
+const pricing = loadPricing();
+
+/**
+ * Price of a model, with the MODEL_PRICING override applied. Used for both
+ * call costs and cost budgets, so they agree.
+ */
+export function getModelPrice(modelId: string): ModelPrice | undefined {
+  return pricing[modelId];
+}
+
+/**
+ * Usage from an OpenAI-compatible response (`completion.usage` or the last
+ * stream chunk's `usage`)
+ */
+export function openAIUsage(usage: any): TokenUsage | null {
+  if (!usage || typeof usage.prompt_tokens !== 'number') return null;
+  return {
+    promptTokens: usage.prompt_tokens,
+    completionTokens: usage.completion_tokens || 0,
+  };
+}
+
+/**
+ * Usage from a Gemini response's `usageMetadata`
+ */
+export function geminiUsage(usageMetadata: any): TokenUsage | null {
+  if (!usageMetadata || typeof usageMetadata.promptTokenCount !== 'number') return null;
+  return {
+    promptTokens: usageMetadata.promptTokenCount,
+    completionTokens: usageMetadata.candidatesTokenCount || 0,
+  };
+}
+
+/**
+ * Estimated usage when the provider reports none
+ */
+export function estimateUsage(messages: Array<{ content: any }>, text: string): TokenUsage {
+  return {
+    promptTokens: messages.reduce((sum, msg) => sum + estimateTokens(msg.content), 0),
+    completionTokens: estimateTokens(text),
+    estimated: true,
+  };
+}
+
+/**
+ * Cost in USD of one call. Unknown models cost 0.
+ */
+export function callCost(modelId: string, usage: TokenUsage): number {
+  const price = getModelPrice(modelId);
+  if (!price) return 0;
+  return (usage.promptTokens * price.input + usage.completionTokens * price.output) / 1000000;
+}
@@ -0,0 +1,77 @@
+/**
+ * Vision analysis cache
+ *
+ * The battle route asks Gemini to describe attached images for the models
+ * that cannot see them. The description depends only on the image bytes, so
+ * it is cached under a SHA-256 of the decoded images: re-sent or re-used
+ * images skip the analysis call entirely.
+ */
+
+import { createHash } from 'crypto';
+
+const VISION_CACHE_TTL_MS = (Number(process.env.VISION_CACHE_TTL_SECONDS) || 24 * 60 * 60) * 1000;
+const VISION_CACHE_MAX_ENTRIES = Number(process.env.VISION_CACHE_MAX_ENTRIES) || 200;
+// Upper bound on stored analysis text across all entries (~2MB of characters)
+const VISION_CACHE_MAX_CHARS = 2 * 1024 * 1024;
+
+interface VisionEntry {
+  analysis: string;
+  expiresAt: number;
+}
+
+// Insertion-ordered, so the first key is the least recently used
+const entries = new Map<string, VisionEntry>();
+let totalChars = 0;
+
+function remove(key: string) {
+  const entry = entries.get(key);
+  if (entry) {
+    totalChars -= entry.analysis.length;
+    entries.delete(key);
+  }
+}
+
+/**
+ * SHA-256 over the decoded bytes of every image, in order.
+ * Accepts raw bytes, data URLs or bare base64 strings.
+ */
+export function imageContentHash(images: Array<string | Uint8Array>): string {
+  const hash = createHash('sha256');
+  for (const image of images) {
+    const bytes = typeof image === 'string'
+      ? Buffer.from(image.startsWith('data:') ? image.slice(image.indexOf(',') + 1) : image, 'base64')
+      : image;
+    const digest = createHash('sha256').update(bytes).digest();
+    hash.update(digest);
+  }
+  return hash.digest('hex');
+}
+
+export function getVisionAnalysis(key: string): string | null {
+  const entry = entries.get(key);
+  if (!entry) return null;
+
+  if (entry.expiresAt <= Date.now()) {
+    remove(key);
+    return null;
+  }
+
+  // Refresh recency
+  entries.delete(key);
+  entries.set(key, entry);
+  return entry.analysis;
+}
+
+export function setVisionAnalysis(key: string, analysis: string): void {
+  if (analysis.length > VISION_CACHE_MAX_CHARS) return;
+
+  remove(key);
+  entries.set(key, { analysis, expiresAt: Date.now() + VISION_CACHE_TTL_MS });
+  totalChars += analysis.length;
+
+  while (entries.size > VISION_CACHE_MAX_ENTRIES || totalChars > VISION_CACHE_MAX_CHARS) {
+    const oldest = entries.keys().next().value;
+    if (oldest === undefined) break;
+    remove(oldest);
+  }
+}
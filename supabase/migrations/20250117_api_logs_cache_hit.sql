@@ -0,0 +1,8 @@
+-- Track battle responses served from the response cache (lib/responseCache.ts)
+
+ALTER TABLE public.api_logs
+  ADD COLUMN IF NOT EXISTS cache_hit BOOLEAN DEFAULT false;   -- Whether the response came from cache
+
+CREATE INDEX IF NOT EXISTS idx_api_logs_cache_hit ON public.api_logs(cache_hit);
+
+COMMENT ON COLUMN public.api_logs.cache_hit IS 'Whether the response was served from the response cache instead of the provider';
@@ -0,0 +1,13 @@
+-- Per-call timing and token breakdown for api_logs (lib/usage.ts)
+-- response_time, tokens_used and cost already exist and are now filled per call
+
+ALTER TABLE public.api_logs
+  ADD COLUMN IF NOT EXISTS queue_time DECIMAL(10, 3),        -- Seconds waiting for a provider slot
+  ADD COLUMN IF NOT EXISTS ttft DECIMAL(10, 3),              -- Seconds to first token
+  ADD COLUMN IF NOT EXISTS prompt_tokens INTEGER,            -- Prompt tokens reported by the provider
+  ADD COLUMN IF NOT EXISTS completion_tokens INTEGER;        -- Completion tokens reported by the provider
+
+COMMENT ON COLUMN public.api_logs.queue_time IS 'Seconds the call waited for a provider concurrency slot';
+COMMENT ON COLUMN public.api_logs.ttft IS 'Seconds from sending the call to the first token (whole answer for non-streaming calls)';
+COMMENT ON COLUMN public.api_logs.prompt_tokens IS 'Prompt tokens from the provider usage fields (estimated when not reported)';
+COMMENT ON COLUMN public.api_logs.completion_tokens IS 'Completion tokens from the provider usage fields (estimated when not reported)';
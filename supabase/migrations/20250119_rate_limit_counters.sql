@@ -0,0 +1,139 @@
+-- Atomic sliding-window rate limit counters (lib/rateLimitStore.ts)
+-- Replaces per-request rows in rate_limits: one RPC checks and counts a request
+
+CREATE TABLE IF NOT EXISTS public.rate_limit_counters (
+  subject TEXT NOT NULL,                  -- 'user:<clerk id>' or 'ip:<address>'
+  bucket TEXT NOT NULL,                   -- 'hour', or the daily bucket: 'battle', 'chat', 'anonymous'
+  window_start TIMESTAMP WITH TIME ZONE NOT NULL,
+  count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (subject, bucket, window_start)
+);
+
+CREATE TABLE IF NOT EXISTS public.rate_limit_last_request (
+  subject TEXT PRIMARY KEY,
+  last_request_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_rate_limit_counters_window ON public.rate_limit_counters(window_start);
+
+-- Enable Row Level Security (service role only)
+ALTER TABLE public.rate_limit_counters ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.rate_limit_last_request ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role can manage rate_limit_counters"
+  ON public.rate_limit_counters
+  FOR ALL
+  TO service_role
+  USING (true)
+  WITH CHECK (true);
+
+CREATE POLICY "Service role can manage rate_limit_last_request"
+  ON public.rate_limit_last_request
+  FOR ALL
+  TO service_role
+  USING (true)
+  WITH CHECK (true);
+
+-- Sliding-window estimate: the current fixed window's count plus the previous
+-- window's count weighted by how much of it still overlaps
+CREATE OR REPLACE FUNCTION public.rate_limit_window_count(
+  p_subject TEXT,
+  p_bucket TEXT,
+  p_window_seconds INTEGER,
+  p_now TIMESTAMP WITH TIME ZONE
+)
+RETURNS NUMERIC AS $$
+DECLARE
+  v_start TIMESTAMP WITH TIME ZONE := to_timestamp(floor(extract(epoch FROM p_now) / p_window_seconds) * p_window_seconds);
+  v_elapsed NUMERIC := extract(epoch FROM p_now - v_start) / p_window_seconds;
+  v_current INTEGER;
+  v_previous INTEGER;
+BEGIN
+  SELECT count INTO v_current FROM public.rate_limit_counters
+  WHERE subject = p_subject AND bucket = p_bucket AND window_start = v_start;
+
+  SELECT count INTO v_previous FROM public.rate_limit_counters
+  WHERE subject = p_subject AND bucket = p_bucket AND window_start = v_start - make_interval(secs => p_window_seconds);
+
+  RETURN COALESCE(v_current, 0) + COALESCE(v_previous, 0) * (1 - v_elapsed);
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Check the hourly, daily and minimum-interval limits for a subject and, if
+-- all pass, count the request. Concurrent calls for the same subject are
+-- serialized by an advisory lock, so they cannot race past a limit.
+CREATE OR REPLACE FUNCTION public.rate_limit_hit(
+  p_subject TEXT,
+  p_day_bucket TEXT,
+  p_hour_limit INTEGER,
+  p_day_limit INTEGER,
+  p_min_interval_ms INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+DECLARE
+  v_now TIMESTAMP WITH TIME ZONE := clock_timestamp();
+  v_hour_start TIMESTAMP WITH TIME ZONE := to_timestamp(floor(extract(epoch FROM v_now) / 3600) * 3600);
+  v_day_start TIMESTAMP WITH TIME ZONE := to_timestamp(floor(extract(epoch FROM v_now) / 86400) * 86400);
+  v_hour NUMERIC;
+  v_day NUMERIC;
+  v_last TIMESTAMP WITH TIME ZONE;
+BEGIN
+  PERFORM pg_advisory_xact_lock(hashtext('rate_limit:' || p_subject));
+
+  v_hour := public.rate_limit_window_count(p_subject, 'hour', 3600, v_now);
+  v_day := public.rate_limit_window_count(p_subject, p_day_bucket, 86400, v_now);
+
+  IF v_hour >= p_hour_limit THEN
+    RETURN jsonb_build_object('allowed', false, 'reason', 'hour',
+      'hour_count', floor(v_hour), 'day_count', floor(v_day), 'reset_at', v_hour_start + INTERVAL '1 hour');
+  END IF;
+
+  IF v_day >= p_day_limit THEN
+    RETURN jsonb_build_object('allowed', false, 'reason', 'day',
+      'hour_count', floor(v_hour), 'day_count', floor(v_day), 'reset_at', v_day_start + INTERVAL '1 day');
+  END IF;
+
+  IF p_min_interval_ms > 0 THEN
+    SELECT last_request_at INTO v_last FROM public.rate_limit_last_request WHERE subject = p_subject;
+    IF v_last IS NOT NULL AND v_now - v_last < make_interval(secs => p_min_interval_ms / 1000.0) THEN
+      RETURN jsonb_build_object('allowed', false, 'reason', 'interval',
+        'hour_count', floor(v_hour), 'day_count', floor(v_day),
+        'reset_at', v_last + make_interval(secs => p_min_interval_ms / 1000.0));
+    END IF;
+  END IF;
+
+  INSERT INTO public.rate_limit_counters (subject, bucket, window_start, count)
+  VALUES (p_subject, 'hour', v_hour_start, 1), (p_subject, p_day_bucket, v_day_start, 1)
+  ON CONFLICT (subject, bucket, window_start) DO UPDATE SET count = public.rate_limit_counters.count + 1;
+
+  INSERT INTO public.rate_limit_last_request (subject, last_request_at)
+  VALUES (p_subject, v_now)
+  ON CONFLICT (subject) DO UPDATE SET last_request_at = EXCLUDED.last_request_at;
+
+  RETURN jsonb_build_object('allowed', true, 'reason', NULL,
+    'hour_count', floor(v_hour) + 1, 'day_count', floor(v_day) + 1, 'reset_at', v_day_start + INTERVAL '1 day');
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Counters older than two days can no longer affect any window
+CREATE OR REPLACE FUNCTION cleanup_old_rate_limits()
+RETURNS void AS $$
+BEGIN
+  DELETE FROM public.rate_limits
+  WHERE created_at < NOW() - INTERVAL '7 days';
+
+  DELETE FROM public.rate_limit_counters
+  WHERE window_start < NOW() - INTERVAL '2 days';
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Only the server (service role) may count or read requests: SECURITY DEFINER
+-- bypasses RLS, so anon callers could otherwise fill any subject's counters
+REVOKE EXECUTE ON FUNCTION public.rate_limit_hit(TEXT, TEXT, INTEGER, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.rate_limit_window_count(TEXT, TEXT, INTEGER, TIMESTAMP WITH TIME ZONE) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.rate_limit_hit(TEXT, TEXT, INTEGER, INTEGER, INTEGER) TO service_role;
+GRANT EXECUTE ON FUNCTION public.rate_limit_window_count(TEXT, TEXT, INTEGER, TIMESTAMP WITH TIME ZONE) TO service_role;
+
+COMMENT ON TABLE public.rate_limit_counters IS 'Fixed-window request counters per subject, combined into sliding-window estimates by rate_limit_hit()';
+COMMENT ON TABLE public.rate_limit_last_request IS 'Time of each subject''s last allowed request, for the minimum request interval';
+COMMENT ON FUNCTION public.rate_limit_hit IS 'Atomically check hourly/daily/interval limits and count the request if allowed';
@@ -0,0 +1,43 @@
+-- Usage counters for one subject in a single grouped aggregate (lib/rateLimitStore.ts)
+-- Returns e.g. {"hour": 12, "battle": 40, "chat": 85}, with the same sliding-window
+-- estimate as rate_limit_hit()
+
+CREATE OR REPLACE FUNCTION public.rate_limit_usage(p_subject TEXT)
+RETURNS JSONB AS $$
+  WITH windows AS (
+    SELECT
+      bucket,
+      window_start,
+      count,
+      CASE WHEN bucket = 'hour' THEN 3600 ELSE 86400 END AS window_seconds
+    FROM public.rate_limit_counters
+    WHERE subject = p_subject
+      AND window_start >= NOW() - INTERVAL '2 days'
+  ),
+  estimates AS (
+    SELECT
+      bucket,
+      SUM(
+        CASE
+          -- Current window counts in full
+          WHEN window_start = to_timestamp(floor(extract(epoch FROM NOW()) / window_seconds) * window_seconds)
+            THEN count
+          -- Previous window counts for the part still inside the sliding window
+          WHEN window_start = to_timestamp(floor(extract(epoch FROM NOW()) / window_seconds) * window_seconds - window_seconds)
+            THEN count * (1 - (extract(epoch FROM NOW()) - floor(extract(epoch FROM NOW()) / window_seconds) * window_seconds) / window_seconds)
+          ELSE 0
+        END
+      ) AS estimate
+    FROM windows
+    GROUP BY bucket
+  )
+  SELECT COALESCE(jsonb_object_agg(bucket, floor(estimate)), '{}'::jsonb)
+  FROM estimates;
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- Service role only: the function takes any subject, and /api/usage resolves
+-- the caller's own subject on the server
+REVOKE EXECUTE ON FUNCTION public.rate_limit_usage(TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.rate_limit_usage(TEXT) TO service_role;
+
+COMMENT ON FUNCTION public.rate_limit_usage IS 'Sliding-window request counts per bucket for one rate limit subject';
@@ -0,0 +1,118 @@
+-- Rate limit denials report when the sliding window actually frees up, and the
+-- SECURITY DEFINER functions pin their search_path (lib/rateLimitStore.ts)
+
+-- When a sliding-window count at or over p_limit drops below it again, if no
+-- further requests are counted. The previous window's weight decays linearly:
+-- - current count under the limit: part-way through the current window, once
+--   the previous window's share has shrunk enough
+-- - current count at the limit: part-way through the next window, where the
+--   current count becomes the decaying previous one
+CREATE OR REPLACE FUNCTION public.rate_limit_reset_at(
+  p_subject TEXT,
+  p_bucket TEXT,
+  p_window_seconds INTEGER,
+  p_limit INTEGER,
+  p_now TIMESTAMP WITH TIME ZONE
+)
+RETURNS TIMESTAMP WITH TIME ZONE AS $$
+DECLARE
+  v_start TIMESTAMP WITH TIME ZONE := to_timestamp(floor(extract(epoch FROM p_now) / p_window_seconds) * p_window_seconds);
+  v_current INTEGER;
+  v_previous INTEGER;
+BEGIN
+  SELECT count INTO v_current FROM public.rate_limit_counters
+  WHERE subject = p_subject AND bucket = p_bucket AND window_start = v_start;
+
+  SELECT count INTO v_previous FROM public.rate_limit_counters
+  WHERE subject = p_subject AND bucket = p_bucket AND window_start = v_start - make_interval(secs => p_window_seconds);
+
+  v_current := COALESCE(v_current, 0);
+  v_previous := COALESCE(v_previous, 0);
+
+  IF p_limit <= 0 THEN
+    RETURN v_start + make_interval(secs => 2 * p_window_seconds);
+  END IF;
+
+  IF v_current < p_limit THEN
+    IF v_previous = 0 THEN
+      RETURN v_start;
+    END IF;
+    RETURN v_start + make_interval(secs => p_window_seconds * (1 - (p_limit - v_current)::DOUBLE PRECISION / v_previous));
+  END IF;
+
+  RETURN v_start + make_interval(secs => p_window_seconds * (2 - p_limit::DOUBLE PRECISION / v_current));
+END;
+$$ LANGUAGE plpgsql STABLE SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.rate_limit_hit(
+  p_subject TEXT,
+  p_day_bucket TEXT,
+  p_hour_limit INTEGER,
+  p_day_limit INTEGER,
+  p_min_interval_ms INTEGER DEFAULT 0
+)
+RETURNS JSONB AS $$
+DECLARE
+  v_now TIMESTAMP WITH TIME ZONE := clock_timestamp();
+  v_hour_start TIMESTAMP WITH TIME ZONE := to_timestamp(floor(extract(epoch FROM v_now) / 3600) * 3600);
+  v_day_start TIMESTAMP WITH TIME ZONE := to_timestamp(floor(extract(epoch FROM v_now) / 86400) * 86400);
+  v_hour NUMERIC;
+  v_day NUMERIC;
+  v_last TIMESTAMP WITH TIME ZONE;
+BEGIN
+  PERFORM pg_advisory_xact_lock(hashtext('rate_limit:' || p_subject));
+
+  v_hour := public.rate_limit_window_count(p_subject, 'hour', 3600, v_now);
+  v_day := public.rate_limit_window_count(p_subject, p_day_bucket, 86400, v_now);
+
+  IF v_hour >= p_hour_limit THEN
+    RETURN jsonb_build_object('allowed', false, 'reason', 'hour',
+      'hour_count', floor(v_hour), 'day_count', floor(v_day),
+      'reset_at', public.rate_limit_reset_at(p_subject, 'hour', 3600, p_hour_limit, v_now));
+  END IF;
+
+  IF v_day >= p_day_limit THEN
+    RETURN jsonb_build_object('allowed', false, 'reason', 'day',
+      'hour_count', floor(v_hour), 'day_count', floor(v_day),
+      'reset_at', public.rate_limit_reset_at(p_subject, p_day_bucket, 86400, p_day_limit, v_now));
+  END IF;
+
+  IF p_min_interval_ms > 0 THEN
+    SELECT last_request_at INTO v_last FROM public.rate_limit_last_request WHERE subject = p_subject;
+    IF v_last IS NOT NULL AND v_now - v_last < make_interval(secs => p_min_interval_ms / 1000.0) THEN
+      RETURN jsonb_build_object('allowed', false, 'reason', 'interval',
+        'hour_count', floor(v_hour), 'day_count', floor(v_day),
+        'reset_at', v_last + make_interval(secs => p_min_interval_ms / 1000.0));
+    END IF;
+  END IF;
+
+  INSERT INTO public.rate_limit_counters (subject, bucket, window_start, count)
+  VALUES (p_subject, 'hour', v_hour_start, 1), (p_subject, p_day_bucket, v_day_start, 1)
+  ON CONFLICT (subject, bucket, window_start) DO UPDATE SET count = public.rate_limit_counters.count + 1;
+
+  INSERT INTO public.rate_limit_last_request (subject, last_request_at)
+  VALUES (p_subject, v_now)
+  ON CONFLICT (subject) DO UPDATE SET last_request_at = EXCLUDED.last_request_at;
+
+  RETURN jsonb_build_object('allowed', true, 'reason', NULL,
+    'hour_count', floor(v_hour) + 1, 'day_count', floor(v_day) + 1, 'reset_at', v_day_start + INTERVAL '1 day');
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- A caller-controlled search_path must not redirect unqualified names inside
+-- the privileged functions
+ALTER FUNCTION public.cleanup_old_rate_limits() SET search_path = public;
+ALTER FUNCTION public.rate_limit_usage(TEXT) SET search_path = public;
+ALTER FUNCTION public.rate_limit_window_count(TEXT, TEXT, INTEGER, TIMESTAMP WITH TIME ZONE) SET search_path = public;
+
+-- Service role only, also for databases that applied 20250119 before it
+-- revoked these from PUBLIC: anon must not be able to count requests for
+-- an arbitrary subject and lock it out
+REVOKE EXECUTE ON FUNCTION public.rate_limit_hit(TEXT, TEXT, INTEGER, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.rate_limit_window_count(TEXT, TEXT, INTEGER, TIMESTAMP WITH TIME ZONE) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.rate_limit_reset_at(TEXT, TEXT, INTEGER, INTEGER, TIMESTAMP WITH TIME ZONE) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.rate_limit_hit(TEXT, TEXT, INTEGER, INTEGER, INTEGER) TO service_role;
+GRANT EXECUTE ON FUNCTION public.rate_limit_window_count(TEXT, TEXT, INTEGER, TIMESTAMP WITH TIME ZONE) TO service_role;
+GRANT EXECUTE ON FUNCTION public.rate_limit_reset_at(TEXT, TEXT, INTEGER, INTEGER, TIMESTAMP WITH TIME ZONE) TO service_role;
+
+COMMENT ON FUNCTION public.rate_limit_reset_at IS 'When a denied sliding-window limit frees up again';
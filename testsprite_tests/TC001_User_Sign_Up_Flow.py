@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,70 +51,70 @@ async def run_test():
         frame = context.pages[-1]
         # Click on the 'Sign Up' link to go to the sign-up page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Fill out the sign-up form with the provided email 'palbiraj4@gmail.com' and password 'Bir@j9836926459'.
         frame = context.pages[-1]
         # Enter the email address in the email input field
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Enter the password in the password input field
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div[2]/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Bir@j9836926459')
+        await actions.fill(elem, 'Bir@j9836926459')
         
 
         # -> Click the 'Continue' button to submit the sign-up form.
         frame = context.pages[-1]
         # Click the 'Continue' button to submit the sign-up form
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Refresh the sign-up page to clear the error and try signing up again with the same credentials.
         frame = context.pages[-1]
         # Click the 'Continue' button again to confirm no change
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[3]/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         frame = context.pages[-1]
         # Clear the email field
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[3]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await actions.fill(elem, '')
         
 
         frame = context.pages[-1]
         # Clear the password field
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[3]/form/div/div[2]/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await actions.fill(elem, '')
         
 
         frame = context.pages[-1]
         # Click 'Continue' with empty fields to check validation
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[3]/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         frame = context.pages[-1]
         # Re-enter the email address
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[3]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Re-enter the password
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[3]/form/div/div[2]/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Bir@j9836926459')
+        await actions.fill(elem, 'Bir@j9836926459')
         
 
         frame = context.pages[-1]
         # Click 'Continue' to attempt sign-up again
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[3]/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -122,7 +123,7 @@ async def run_test():
             await expect(frame.locator('text=Sign-up Successful! Welcome to Battle Mode').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The sign-up process did not complete successfully. The user was not redirected to the authenticated landing page or Battle Mode interface, and the user session was not established as expected.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,27 +51,27 @@ async def run_test():
         frame = context.pages[-1]
         # Click the 'Sign Up' link to go to the sign-up page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input valid email address and strong password into the form fields
         frame = context.pages[-1]
         # Input valid email address
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Input strong password
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div[2]/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPassw0rd!')
+        await actions.fill(elem, 'StrongPassw0rd!')
         
 
         # -> Submit the sign-up form by clicking the 'Continue' button
         frame = context.pages[-1]
         # Click the 'Continue' button to submit the sign-up form
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -79,7 +80,7 @@ async def run_test():
             await expect(frame.locator('text=Account creation failed due to invalid credentials').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test case failed: The user was not successfully registered or did not receive a confirmation message after sign-up as expected in the test plan.')
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
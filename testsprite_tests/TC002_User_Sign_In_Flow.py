@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,46 +51,46 @@ async def run_test():
         frame = context.pages[-1]
         # Click the 'Sign In' link to go to the sign-in page.
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input the valid existing user email 'palbiraj4@gmail.com' into the email field and click Continue.
         frame = context.pages[-1]
         # Input the valid existing user email into the email field.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click the Continue button to proceed to password input.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input the verification code received by email into the verification code field and click Continue.
         frame = context.pages[-1]
         # Input the verification code into the verification code field.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await actions.fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click the Continue button to submit the verification code.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input the verification code into the verification code field and click Continue.
         frame = context.pages[-1]
         # Input the password as verification code (assuming password is used as code here).
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Bir@j9836926459')
+        await actions.fill(elem, 'Bir@j9836926459')
         
 
         frame = context.pages[-1]
         # Click the Continue button to submit the verification code.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -98,7 +99,7 @@ async def run_test():
             await expect(frame.locator('text=Authentication Failed: Invalid Credentials').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Returning user sign-in through Clerk authentication did not succeed as expected. The test plan requires successful authentication and access to protected routes, but the test plan execution has failed.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,27 +51,27 @@ async def run_test():
         frame = context.pages[-1]
         # Click the Sign Up link to navigate to the sign-up page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input an already registered email and a valid password
         frame = context.pages[-1]
         # Input an already registered email address
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('registered@example.com')
+        await actions.fill(elem, 'registered@example.com')
         
 
         frame = context.pages[-1]
         # Input a valid password
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div[2]/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassword123!')
+        await actions.fill(elem, 'ValidPassword123!')
         
 
         # -> Click the Continue button to submit the sign-up form
         frame = context.pages[-1]
         # Click the Continue button to submit the sign-up form
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -79,7 +80,7 @@ async def run_test():
             await expect(frame.locator('text=Registration Successful! Welcome aboard')).to_be_visible(timeout=5000)
         except AssertionError:
             raise AssertionError('Test failed: Sign-up should not succeed with an already registered email. Expected an error message about the email already being in use, but the success message was not found.')
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,60 +51,60 @@ async def run_test():
         frame = context.pages[-1]
         # Click on the 'Sign In' link to navigate to the sign-in page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Enter invalid email 'palbiraj4@gmail.com' in the email input and click Continue to proceed to password entry or error.
         frame = context.pages[-1]
         # Enter invalid email address in the email input field
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed after entering email
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Enter an invalid verification code and attempt to continue to trigger an error message.
         frame = context.pages[-1]
         # Enter an invalid verification code
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('000000')
+        await actions.fill(elem, '000000')
         
 
         frame = context.pages[-1]
         # Click Continue button to submit the invalid verification code
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Attempt to use 'Use another method' link to test alternative sign-in method or conclude test if no further invalid credential tests are possible.
         frame = context.pages[-1]
         # Click 'Use another method' link to test alternative sign-in method or navigation
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Back' to return to the previous sign-in verification page to continue testing invalid credentials.
         frame = context.pages[-1]
         # Click 'Back' link to return to the previous sign-in verification page
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Enter an invalid verification code and attempt to submit to verify error handling and prevention of sign-in.
         frame = context.pages[-1]
         # Enter an invalid verification code
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await actions.fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click Continue button to submit the invalid verification code
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -115,7 +116,7 @@ async def run_test():
         await expect(frame.locator('text=Didn\'t receive a code? Resend').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Continue').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Use another method').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,59 +51,59 @@ async def run_test():
         frame = context.pages[-1]
         # Click on the 'Sign In' link to go to the sign-in page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input valid email into the email field
         frame = context.pages[-1]
         # Input valid email address into email field
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('validuser@example.com')
+        await actions.fill(elem, 'validuser@example.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed to password input
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a different valid email address to proceed with sign-in
         frame = context.pages[-1]
         # Input a different valid email address into email field
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed to password input
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click on 'Sign up' link to create a new account or check for test user creation options
         frame = context.pages[-1]
         # Click on 'Sign up' link to create a new account or find test user creation options
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a new valid email and password to create an account
         frame = context.pages[-1]
         # Input new valid email address for account creation
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('newtestuser@example.com')
+        await actions.fill(elem, 'newtestuser@example.com')
         
 
         frame = context.pages[-1]
         # Input valid password for account creation
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div[2]/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123!')
+        await actions.fill(elem, 'TestPassword123!')
         
 
         frame = context.pages[-1]
         # Click Continue button to submit account creation form
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -111,7 +112,7 @@ async def run_test():
             await expect(frame.locator('text=Welcome to the Battle Mode Interface').first).to_be_visible(timeout=30000)
         except AssertionError:
             raise AssertionError("Test plan execution failed: User sign-in was not successful, user was not redirected to the Battle Mode interface, and session was not created as expected.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
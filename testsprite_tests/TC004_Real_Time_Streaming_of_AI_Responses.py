@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,40 +51,40 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign In' link to open the login page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input the email address and click Continue to proceed with login.
         frame = context.pages[-1]
         # Input the email address for login
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed after entering email
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input the verification code and click Continue to complete login.
         frame = context.pages[-1]
         # Input the verification code to proceed with login
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await actions.fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click Continue button after entering verification code
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Request the user to provide the correct verification code or resend the code to email to proceed with login.
         frame = context.pages[-1]
         # Click 'Didn't receive a code? Resend' to resend the verification code to the email
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -92,7 +93,7 @@ async def run_test():
             await expect(frame.locator('text=AI Battle Mode Streaming Complete').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The AI Battle Mode did not stream responses from GPT-5-Nano, Grok-4, and DeepSeek v3.1 simultaneously with a visible typewriter effect and minimal latency as required by the test plan.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,34 +51,34 @@ async def run_test():
         frame = context.pages[-1]
         # Click on the 'Sign In' link to go to the sign-in page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input an invalid email into the email address field
         frame = context.pages[-1]
         # Input invalid email into the email address field
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid@example.com')
+        await actions.fill(elem, 'invalid@example.com')
         
 
         # -> Click the 'Continue' button to submit the sign-in form with invalid email
         frame = context.pages[-1]
         # Click the 'Continue' button to submit the sign-in form with invalid email
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a valid email address to proceed to password entry
         frame = context.pages[-1]
         # Input valid email into the email address field
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('validuser@example.com')
+        await actions.fill(elem, 'validuser@example.com')
         
 
         frame = context.pages[-1]
         # Click the 'Continue' button to proceed to password entry
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -86,7 +87,7 @@ async def run_test():
             await expect(frame.locator('text=Login Successful! Welcome back').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError("Test case failed: Sign-in did not succeed as expected with invalid email/password combinations. The login should fail and show an appropriate error message, but 'Login Successful! Welcome back' was not found on the page, confirming the failure.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -48,7 +49,7 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # -> Directly navigate to the Battle Mode chat interface URL while logged out to verify redirection to sign-in page.
         await page.goto('http://localhost:3000/battle-mode', timeout=10000)
-        await asyncio.sleep(3)
+        await actions.settle(page)
         
 
         # --> Assertions to verify final state
@@ -56,7 +57,7 @@ async def run_test():
             await expect(page.locator('text=Welcome to Battle Mode Chat!').first).to_be_visible(timeout=5000)
         except AssertionError:
             raise AssertionError('Test failed: Unauthenticated user was not redirected to sign-in page when accessing Battle Mode chat interface.')
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,7 +51,7 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Start Chatting Free' button to start a new chat
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -59,7 +60,7 @@ async def run_test():
             await expect(frame.locator('text=Conversation context lost').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError('Test failed: Conversation context was not preserved across multiple turns, indicating loss of dialogue continuity as per the test plan.')
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
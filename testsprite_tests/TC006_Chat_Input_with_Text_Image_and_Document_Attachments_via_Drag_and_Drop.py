@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,116 +51,116 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign In' to log in before accessing Battle Mode chat input.
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input the email address and click Continue to proceed with login.
         frame = context.pages[-1]
         # Input the email address for login.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with login.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input the verification code and click Continue to complete login and access Battle Mode chat input.
         frame = context.pages[-1]
         # Input the verification code to proceed with login.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await actions.fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click Continue button to complete login.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Didn't receive a code? Resend' to request a new verification code or use another method to proceed with login.
         frame = context.pages[-1]
         # Click 'Didn't receive a code? Resend' to request a new verification code.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Use another method to proceed with login since the verification code is not available.
         frame = context.pages[-1]
         # Click 'Use another method' to try alternative login options.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Back' to return to the previous sign-in page and try another approach or retry login.
         frame = context.pages[-1]
         # Click 'Back' to return to the previous sign-in page.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Edit' to change the email address and try logging in with a different email or account.
         frame = context.pages[-1]
         # Click 'Edit' to change the email address.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input the email address 'palbiraj4@gmail.com' and click Continue to proceed with login.
         frame = context.pages[-1]
         # Input the email address for login.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with login.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Request the user to provide the verification code received via email to input into the verification code field.
         frame = context.pages[-1]
         # Request user to input the verification code received via email.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await actions.fill(elem, '')
         
 
         # -> Request the user to provide the verification code received via email to input into the verification code field.
         frame = context.pages[-1]
         # Request user to input the verification code.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Please provide the verification code received via email to proceed with login.')
+        await actions.fill(elem, 'Please provide the verification code received via email to proceed with login.')
         
 
         # -> Request the user to provide the verification code received via email to input into the verification code field.
         frame = context.pages[-1]
         # Request user to input the verification code.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Please provide the verification code received via email to proceed with login.')
+        await actions.fill(elem, 'Please provide the verification code received via email to proceed with login.')
         
 
         # -> Request the user to provide the verification code received via email to input into the verification code field.
         frame = context.pages[-1]
         # Clear the verification code input field to prepare for user input.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await actions.fill(elem, '')
         
 
         # -> Request the user to provide the verification code received via email to input into the verification code field.
         frame = context.pages[-1]
         # Clear the verification code input field to prepare for user input.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await actions.fill(elem, '')
         
 
         # -> Request the user to provide the verification code received via email to input into the verification code field.
         frame = context.pages[-1]
         # Clear the verification code input field to prepare for user input.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await actions.fill(elem, '')
         
 
         # --> Assertions to verify final state
@@ -168,7 +169,7 @@ async def run_test():
             await expect(frame.locator('text=Upload Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test plan execution failed: The advanced chat input did not accept or correctly process text input, image uploads, or document attachments as expected.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
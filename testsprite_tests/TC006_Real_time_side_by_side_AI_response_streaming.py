@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,46 +51,46 @@ async def run_test():
         frame = context.pages[-1]
         # Click the 'Start Chatting Free' button to enter the Battle Mode chat interface
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a valid email address and click Continue to authenticate.
         frame = context.pages[-1]
         # Input a valid email address in the email field
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with sign-in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click the 'Sign up' link to create a new account for authentication.
         frame = context.pages[-1]
         # Click the 'Sign up' link to create a new account
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a valid email and password, then click Continue to create the account and proceed.
         frame = context.pages[-1]
         # Input a valid email address in the email field
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('validuser@example.com')
+        await actions.fill(elem, 'validuser@example.com')
         
 
         frame = context.pages[-1]
         # Input a strong password in the password field
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div[2]/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPassword123!')
+        await actions.fill(elem, 'StrongPassword123!')
         
 
         frame = context.pages[-1]
         # Click Continue button to submit the sign-up form
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -98,7 +99,7 @@ async def run_test():
             await expect(frame.locator('text=AI Model Response Panel XYZ').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: The three AI models (GPT-5-Nano, Grok-4, DeepSeek v3.1) did not respond simultaneously with streaming outputs and typewriter effect as expected in the Battle Mode chat interface.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
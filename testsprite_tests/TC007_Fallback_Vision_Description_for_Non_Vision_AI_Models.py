@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,96 +51,96 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Start Chatting Free' button to initiate chat for image upload.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input email address and click Continue to proceed with sign-in.
         frame = context.pages[-1]
         # Input email address for sign-in.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with sign-in.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Upload an image attachment with a prompt to test fallback text description generation.
         frame = context.pages[-1]
         # Use another method link to check for alternative sign-in options or image upload.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Back' to return to the previous sign-in step to try to proceed with sign-in and reach chat interface for image upload.
         frame = context.pages[-1]
         # Click 'Back' link to return to previous sign-in step.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Upload an image attachment with a prompt to test fallback text description generation after sign-in.
         frame = context.pages[-1]
         # Input a dummy verification code to proceed with sign-in.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await actions.fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click Continue button to submit verification code and proceed.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Try alternative sign-in method or resend code to proceed with sign-in and reach chat interface for image upload.
         frame = context.pages[-1]
         # Click 'Didn't receive a code? Resend' button to request a new verification code.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Try clicking 'Use another method' to explore alternative sign-in options that might allow proceeding without verification code.
         frame = context.pages[-1]
         # Click 'Use another method' link to explore alternative sign-in options.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Use another method' to explore alternative sign-in options that might allow proceeding without verification code.
         frame = context.pages[-1]
         # Click 'Use another method' link to explore alternative sign-in options.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Back' to return to the previous verification code input screen to try to proceed with sign-in or explore other options.
         frame = context.pages[-1]
         # Click 'Back' link to return to verification code input screen.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Since no valid verification code is available, click 'Use another method' to explore alternative sign-in options that might allow proceeding without code.
         frame = context.pages[-1]
         # Click 'Use another method' link to explore alternative sign-in options.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Get help' to explore support options that might assist in completing sign-in or bypassing verification.
         frame = context.pages[-1]
         # Click 'Get help' link to explore support options for sign-in issues.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Back' to return to the previous sign-in step to try to proceed with sign-in or explore other options.
         frame = context.pages[-1]
         # Click 'Back' link to return to previous sign-in step.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -149,7 +150,7 @@ async def run_test():
         await expect(frame.locator('text=Back').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Don’t have any of these?').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Get help').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,46 +51,46 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign In' to authenticate
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a valid email address in the email input field.
         frame = context.pages[-1]
         # Input a valid email address in the email input field.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Click the Continue button to proceed with sign-in.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click on 'Sign up' to create a new account since the email is not recognized.
         frame = context.pages[-1]
         # Click on 'Sign up' link to create a new account.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a valid email and password, then click Continue to create the account and proceed to Battle Mode chat.
         frame = context.pages[-1]
         # Input a valid email address in the email input field.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Input a valid password in the password input field.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div[2]/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123!')
+        await actions.fill(elem, 'TestPassword123!')
         
 
         frame = context.pages[-1]
         # Click the Continue button to create the account.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -98,7 +99,7 @@ async def run_test():
             await expect(frame.locator('text=Image upload successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: The chat input did not accept or upload the image attachment properly, or the AI response did not incorporate the multimodal input as expected.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,66 +51,66 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Start Chatting Free' button to start a chat session
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a test email address and click Continue to proceed to chat interface.
         frame = context.pages[-1]
         # Input test email address to sign in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed after entering email
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click on 'Start Chatting Free' button to attempt initiating a chat session again.
         frame = context.pages[-1]
         # Click on 'Start Chatting Free' button to start chat session
         elem = frame.locator('xpath=html/body/div[3]/main/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a valid email address and click Continue to proceed to chat interface.
         frame = context.pages[-1]
         # Input a valid email address to sign in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('validuser@example.com')
+        await actions.fill(elem, 'validuser@example.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed after entering valid email
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click on 'Sign up' link to navigate to the sign-up page to create an account or explore alternative ways to access chat interface.
         frame = context.pages[-1]
         # Click on 'Sign up' link to navigate to sign-up page
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a new email and password to create an account and proceed to chat interface.
         frame = context.pages[-1]
         # Input new email address for account creation
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testcreate@example.com')
+        await actions.fill(elem, 'testcreate@example.com')
         
 
         frame = context.pages[-1]
         # Input password for account creation
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div[2]/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123')
+        await actions.fill(elem, 'TestPassword123')
         
 
         frame = context.pages[-1]
         # Click Continue button to submit account creation form
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -118,7 +119,7 @@ async def run_test():
             await expect(frame.locator('text=Vision Input Supported').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: AI models do not support vision input, so fallback textual descriptions should be used and responses should generate without errors.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,47 +51,47 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Start Chatting Free' button to enter chat with AI responses.
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input email address and proceed with sign-in.
         frame = context.pages[-1]
         # Enter email address for sign-in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with sign-in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Enter verification code and click Continue to sign in.
         frame = context.pages[-1]
         # Enter verification code sent to email
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('983692')
+        await actions.fill(elem, '983692')
         
 
         frame = context.pages[-1]
         # Click Continue button to complete sign-in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Use another method' link to explore alternative sign-in options since verification code is not available.
         frame = context.pages[-1]
         # Click 'Use another method' link to try alternative sign-in options
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Get help' link to seek assistance for sign-in issues or alternative access.
         frame = context.pages[-1]
         # Click 'Get help' link to seek assistance for sign-in issues
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -99,7 +100,7 @@ async def run_test():
             await expect(frame.locator('text=Vote recorded successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The test plan to verify that users can upvote and downvote AI model responses and that these votes are recorded and persist correctly has failed. The expected confirmation message 'Vote recorded successfully' was not found on the page, indicating that the voting functionality did not work as intended.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,53 +51,53 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Start Chatting Free' button to start a chat battle
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input email address and click Continue to sign in.
         frame = context.pages[-1]
         # Input email address for sign-in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with sign-in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input verification code and click Continue to complete sign-in.
         frame = context.pages[-1]
         # Input verification code to sign in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await actions.fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click Continue button to complete sign-in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Request a new verification code by clicking 'Didn't receive a code? Resend' and then input the new code to continue.
         frame = context.pages[-1]
         # Click 'Didn't receive a code? Resend' to request a new verification code
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input the new verification code received via email and click Continue to complete sign-in.
         frame = context.pages[-1]
         # Input new verification code to sign in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('000000')
+        await actions.fill(elem, '000000')
         
 
         frame = context.pages[-1]
         # Click Continue button to complete sign-in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -105,7 +106,7 @@ async def run_test():
             await expect(frame.locator('text=Share Battle Results on LinkedIn').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Unable to validate sharing AI battle results through social media platforms and copying shareable links to clipboard as per the test plan.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,20 +51,20 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Start Your First Battle' button to complete AI battle session
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[5]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input email address and click Continue to sign in and proceed to battle session
         frame = context.pages[-1]
         # Input email address to sign in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test@example.com')
+        await actions.fill(elem, 'test@example.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with sign in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Locate and open the share modal to access the 'Copy Link' button
@@ -73,7 +74,7 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Start Your First Battle' button to try to open battle session or share modal
         elem = frame.locator('xpath=html/body/div[3]/main/div/div/div[5]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Look for any visible share modal or copy link button on this page or navigate back to homepage to try other options.
@@ -87,27 +88,27 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Start Your First Battle' button to try to access battle session or share modal
         elem = frame.locator('xpath=html/body/div[3]/main/div/div/div[5]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Start Your First Battle' to try to start battle session and access share modal for copy link button
         frame = context.pages[-1]
         # Click 'Start Your First Battle' button to start battle session or open share modal
         elem = frame.locator('xpath=html/body/div[3]/main/div/div/div[5]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Try to sign in with a valid email to access battle session and share modal for copy link button
         frame = context.pages[-1]
         # Input valid email address to sign in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('validuser@example.com')
+        await actions.fill(elem, 'validuser@example.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with sign in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -116,7 +117,7 @@ async def run_test():
             await expect(frame.locator('text=Copy Link to Clipboard Success!').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The 'Copy Link' button did not copy the accurate URL to clipboard or the toast notification confirming the successful copy did not appear as expected.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,68 +51,68 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign In' link to open login form
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input the email address and click Continue to proceed with login.
         frame = context.pages[-1]
         # Input the email address for login
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with login
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a dummy verification code and click Continue to complete login and reach chat interface.
         frame = context.pages[-1]
         # Input dummy verification code
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await actions.fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click Continue button to submit verification code
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Didn't receive a code? Resend' to trigger resend code action and check for toast notification.
         frame = context.pages[-1]
         # Click 'Didn't receive a code? Resend' button to trigger resend code action and check for toast notification
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Use another method' to try alternative login method and check for toast notifications.
         frame = context.pages[-1]
         # Click 'Use another method' link to try alternative login method and check for toast notifications
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Try clicking 'Use another method' to explore alternative login options and check for toast notifications.
         frame = context.pages[-1]
         # Click 'Use another method' link to try alternative login options and check for toast notifications
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Get help' to check if it triggers any toast notification or leads to a page where toast notifications can be tested.
         frame = context.pages[-1]
         # Click 'Get help' link to explore help options and check for toast notifications
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Email support' button to check for toast notification or any UI response.
         frame = context.pages[-1]
         # Click 'Email support' button to check for toast notification or UI response
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -120,7 +121,7 @@ async def run_test():
             await expect(frame.locator('text=Toast notification success! Message submitted.')).to_be_visible(timeout=30000)
         except AssertionError:
             raise AssertionError("Test case failed: Toast notifications for user actions such as message submit success, upload errors, or vote submissions did not appear as expected or did not disappear after timeout/manual dismissal.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,67 +51,67 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Battle Mode' link to open Battle Mode interface
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[5]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Try clicking the 'Start Your First Battle' button again or find another way to navigate to Battle Mode interface.
         frame = context.pages[-1]
         # Retry clicking 'Start Your First Battle' button to navigate to Battle Mode interface
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div[5]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input email address and continue to sign in.
         frame = context.pages[-1]
         # Input email address for sign-in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with sign-in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input verification code and continue to proceed to Battle Mode interface.
         frame = context.pages[-1]
         # Input a placeholder verification code to proceed
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await actions.fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click Continue button to submit verification code and proceed
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Try using 'Use another method' link to proceed to Battle Mode interface or alternative sign-in method.
         frame = context.pages[-1]
         # Click 'Use another method' link to try alternative sign-in method or proceed
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Back' to return to previous screen or explore 'Get help' if needed to proceed to Battle Mode interface.
         frame = context.pages[-1]
         # Click 'Back' link to return to previous screen
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a valid verification code and click Continue to proceed to Battle Mode interface.
         frame = context.pages[-1]
         # Input a valid verification code to proceed
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('654321')
+        await actions.fill(elem, '654321')
         
 
         frame = context.pages[-1]
         # Click Continue button to submit verification code and proceed
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -122,7 +123,7 @@ async def run_test():
         await expect(frame.locator('text=Didn\'t receive a code? Resend').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Continue').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Use another method').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,21 +51,21 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Start Chatting Free' button to open chat interface
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a test email to proceed to the next step or find a way to access chat input directly.
         frame = context.pages[-1]
         # Input test email to sign in
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test@example.com')
+        await actions.fill(elem, 'test@example.com')
         
 
         # -> Click Continue button to proceed to chat interface or next step where chat input is available.
         frame = context.pages[-1]
         # Click Continue button to proceed to chat interface
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -73,7 +74,7 @@ async def run_test():
             await expect(frame.locator('text=Clear chat input successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The keyboard shortcut to clear chat input did not clear the input immediately as expected.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,40 +51,40 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign In' link to go to login page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input email address and click Continue to proceed to password entry or next step.
         frame = context.pages[-1]
         # Input email address for login
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click Continue button after entering email
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input verification code and click Continue to complete login and access profile.
         frame = context.pages[-1]
         # Input verification code
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await actions.fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click Continue button after entering verification code
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Request user to provide the correct verification code or use 'Resend' option to get a new code.
         frame = context.pages[-1]
         # Click 'Didn't receive a code? Resend' to request a new verification code
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -92,7 +93,7 @@ async def run_test():
             await expect(frame.locator('text=Loading chat history...').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: Loading skeleton components for chat history and AI response streaming were not displayed as expected, indicating a failure in user experience improvement during data fetch and AI response streaming.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -48,12 +49,12 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # -> Navigate to sitemap.xml to verify it contains all accessible URLs.
         await page.goto('http://localhost:3000/sitemap.xml', timeout=10000)
-        await asyncio.sleep(3)
+        await actions.settle(page)
         
 
         # -> Navigate to robots.txt to verify expected crawl rules for search engines.
         await page.goto('http://localhost:3000/robots.txt', timeout=10000)
-        await asyncio.sleep(3)
+        await actions.settle(page)
         
 
         # --> Assertions to verify final state
@@ -64,7 +65,7 @@ async def run_test():
         await expect(frame.locator('text=Disallow: /chat/').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Disallow: /profile/').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Sitemap: https://chatbattles.ai/sitemap.xml').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
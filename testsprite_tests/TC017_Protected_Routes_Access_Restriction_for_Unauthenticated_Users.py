@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -48,17 +49,17 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # -> Attempt to navigate directly to Battle Mode chat URL to verify redirection to sign-in page.
         await page.goto('http://localhost:3000/battle-mode', timeout=10000)
-        await asyncio.sleep(3)
+        await actions.settle(page)
         
 
         # -> Attempt to access the Profile page directly to check for redirection to sign-in page.
         await page.goto('http://localhost:3000/profile', timeout=10000)
-        await asyncio.sleep(3)
+        await actions.settle(page)
         
 
         # -> Attempt to find the correct URL or method to access Battle Mode page to verify redirection for unauthenticated users.
         await page.goto('http://localhost:3000/battle', timeout=10000)
-        await asyncio.sleep(3)
+        await actions.settle(page)
         
 
         # -> Check the homepage or navigation menu for any links or buttons that lead to Battle Mode to find the correct URL or access method.
@@ -71,7 +72,7 @@ async def run_test():
             await expect(frame.locator('text=Welcome to the Battle Arena').first).to_be_visible(timeout=3000)
         except AssertionError:
             raise AssertionError('Test failed: Unauthenticated users should be redirected to the sign-in page when attempting to access Battle Mode or Profile pages, but the expected redirection did not occur.')
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
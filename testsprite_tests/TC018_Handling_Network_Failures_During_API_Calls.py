@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,109 +51,109 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign In' to go to login page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input email 'palbiraj4@gmail.com' and click Continue to proceed with login.
         frame = context.pages[-1]
         # Input email address for login
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with login
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Simulate network failure or API downtime during chat history fetch.
         frame = context.pages[-1]
         # Click Continue without entering code to simulate failure during chat history fetch
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a valid verification code to complete login and proceed to chat interface for failure simulations.
         frame = context.pages[-1]
         # Input a dummy verification code to proceed with login
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await actions.fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click Continue button to submit verification code and proceed
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Try alternative method to proceed with login or find a way to bypass verification to reach chat interface for failure simulations.
         frame = context.pages[-1]
         # Click 'Use another method' to try alternative login method or bypass verification
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Get help' to explore options for bypassing verification or alternative login methods.
         frame = context.pages[-1]
         # Click 'Get help' to explore alternative login or verification bypass options
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Go back to previous screen to try another approach to complete login or simulate failure scenarios.
         frame = context.pages[-1]
         # Click 'Back' to return to previous screen and try alternative login approach
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Back' to return to the initial sign-in page and attempt to restart login process or find alternative approach.
         frame = context.pages[-1]
         # Click 'Back' to return to previous sign-in page
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Resend' to request a new verification code and then input it to proceed with login for failure simulations.
         frame = context.pages[-1]
         # Click 'Resend' to request a new verification code
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input the new verification code to proceed with login and test API failure scenarios.
         frame = context.pages[-1]
         # Input a placeholder verification code to attempt login
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('000000')
+        await actions.fill(elem, '000000')
         
 
         frame = context.pages[-1]
         # Click Continue to submit verification code and proceed
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Since login cannot be completed, simulate network failure on chat history fetch API call by intercepting or blocking the request after login attempt, then verify error handling and user feedback.
         frame = context.pages[-1]
         # Click 'Use another method' to explore alternative login or error handling options
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click 'Back' to return to verification code input screen and attempt to restart login or simulate failure on login API calls.
         frame = context.pages[-1]
         # Click 'Back' to return to verification code input screen
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Since no valid verification code is available, simulate network failure on login API call by clicking 'Continue' without code and observe error handling and user feedback.
         frame = context.pages[-1]
         # Click 'Continue' without entering code to trigger login API call and simulate failure
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -164,7 +165,7 @@ async def run_test():
         await expect(frame.locator('text=Didn\'t receive a code? Resend').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Continue').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Use another method').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
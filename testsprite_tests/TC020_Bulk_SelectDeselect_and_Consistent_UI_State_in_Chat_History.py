@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,67 +51,67 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign In' to log in and access chat history.
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input email address and click Continue to proceed with sign-in.
         frame = context.pages[-1]
         # Input email address for sign-in.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('palbiraj4@gmail.com')
+        await actions.fill(elem, 'palbiraj4@gmail.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with sign-in.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input verification code and click Continue to complete sign-in.
         frame = context.pages[-1]
         # Input verification code to proceed with sign-in.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await actions.fill(elem, '123456')
         
 
         frame = context.pages[-1]
         # Click Continue button to complete sign-in.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a valid verification code and click Continue to complete sign-in and access chat history.
         frame = context.pages[-1]
         # Input a placeholder verification code to attempt sign-in.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('000000')
+        await actions.fill(elem, '000000')
         
 
         frame = context.pages[-1]
         # Click Continue button to submit verification code and proceed.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Use 'Didn't receive a code? Resend' option to request a new verification code or try alternative sign-in method.
         frame = context.pages[-1]
         # Click 'Didn't receive a code? Resend' to request a new verification code.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Use 'Use another method' option to try alternative sign-in method to access chat history page.
         frame = context.pages[-1]
         # Click 'Use another method' to try alternative sign-in method.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Navigate back to the main page or find a way to access chat history page with multiple conversation entries.
         frame = context.pages[-1]
         # Click 'Back' to return to previous sign-in step or main page.
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -119,7 +120,7 @@ async def run_test():
             await expect(frame.locator('text=Bulk selection successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Bulk selection checkboxes in chat history did not work correctly to select and deselect multiple conversations with accurate UI state updates.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -58,46 +59,46 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign In' link to access user account and chat history
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a valid email address and click Continue to sign in and access chat conversations
         frame = context.pages[-1]
         # Input valid email address to sign in
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Click Continue button to proceed with sign-in
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Click on 'Sign up' to create a new account or try a different valid email to sign in
         frame = context.pages[-1]
         # Click on 'Sign up' link to create a new account
         elem = frame.locator('xpath=html/body/div[2]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a valid email and password to create a new account and proceed to chat conversation list
         frame = context.pages[-1]
         # Input new email address for account creation
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('newuser@example.com')
+        await actions.fill(elem, 'newuser@example.com')
         
 
         frame = context.pages[-1]
         # Input password for account creation
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div[2]/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPassword123!')
+        await actions.fill(elem, 'StrongPassword123!')
         
 
         frame = context.pages[-1]
         # Click Continue button to create account and proceed
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -106,7 +107,7 @@ async def run_test():
             await expect(frame.locator('text=Batch Delete Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: The test plan to validate batch deletion of multiple chat conversations failed. The expected confirmation message 'Batch Delete Successful' was not found, indicating the deletion did not occur as intended.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
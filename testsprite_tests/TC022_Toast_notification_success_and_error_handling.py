@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -50,132 +51,132 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Sign In' to open login form and test toast notifications on login success or failure
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input invalid email and click Continue to trigger error toast notification for login failure.
         frame = context.pages[-1]
         # Input invalid email to trigger error toast on login attempt
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid-email')
+        await actions.fill(elem, 'invalid-email')
         
 
         frame = context.pages[-1]
         # Click Continue to submit invalid email and trigger error toast notification
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input a valid email and password to attempt login and trigger a success or error toast notification.
         frame = context.pages[-1]
         # Input valid email to test success or error toast on login attempt
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('validuser@example.com')
+        await actions.fill(elem, 'validuser@example.com')
         
 
         frame = context.pages[-1]
         # Click Continue to submit valid email and proceed to password input or login attempt
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Navigate back to homepage to perform actions that can trigger success toast notifications, such as submitting a prompt or voting.
         frame = context.pages[-1]
         # Click 'Sign up' link to navigate away from sign-in page and then navigate back to homepage to test success toasts
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Input valid email and password to attempt account creation and trigger success or error toast notifications.
         frame = context.pages[-1]
         # Input valid email for account creation to test success or error toast notifications
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
+        await actions.fill(elem, 'testuser@example.com')
         
 
         frame = context.pages[-1]
         # Input valid password for account creation
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div[2]/div/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123!')
+        await actions.fill(elem, 'TestPassword123!')
         
 
         frame = context.pages[-1]
         # Click Continue to submit sign-up form and trigger toast notifications for success or error
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Navigate back to the homepage to perform actions that can trigger success toast notifications, such as submitting a prompt or voting.
         frame = context.pages[-1]
         # Click 'Sign in' link to navigate back to sign-in page and then navigate to homepage for further tests
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Navigate to homepage or main chat interface to perform actions that trigger success toast notifications like submitting a prompt or voting.
         frame = context.pages[-1]
         # Click 'Sign up' link to navigate to sign-up page and then navigate to homepage or main chat interface for success toast tests
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Navigate to homepage or main chat interface to perform actions that can trigger success toast notifications like submitting a prompt or voting.
         frame = context.pages[-1]
         # Click 'Sign in' link to navigate to sign-in page and then navigate to homepage or main chat interface for success toast tests
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Attempt to sign in with valid credentials to trigger success toast notification or error notification if login fails.
         frame = context.pages[-1]
         # Input valid email to test success or error toast on login attempt
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('validuser@example.com')
+        await actions.fill(elem, 'validuser@example.com')
         
 
         frame = context.pages[-1]
         # Click Continue to submit valid email and proceed to next step
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div/div[2]/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Navigate to the homepage or main chat interface to perform actions that can trigger success toast notifications like submitting a prompt or voting.
         frame = context.pages[-1]
         # Click 'Sign up' link to navigate away from sign-in page and then navigate to homepage or main chat interface for success toast tests
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Navigate to homepage or main chat interface to perform actions that can trigger success toast notifications like submitting a prompt or voting.
         frame = context.pages[-1]
         # Click 'Sign in' link to navigate to sign-in page and then navigate to homepage or main chat interface for success toast tests
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Navigate to the main chat interface or homepage to perform actions that can trigger success toast notifications like submitting a prompt or voting.
         frame = context.pages[-1]
         # Click 'Sign up' link to navigate to sign-up page and then navigate to main chat interface or homepage for success toast tests
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         frame = context.pages[-1]
         # Click 'Sign in' link to navigate back to sign-in page and then navigate to main chat interface or homepage for success toast tests
         elem = frame.locator('xpath=html/body/div[3]/div[2]/div/div/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Navigate to the main chat interface or homepage to perform actions that can trigger success toast notifications like submitting a prompt or voting.
         await page.goto('http://localhost:3000', timeout=10000)
-        await asyncio.sleep(3)
+        await actions.settle(page)
         
 
         # -> Click 'Start Chatting Free' to enter chat interface and perform actions that trigger success toast notifications.
         frame = context.pages[-1]
         # Click 'Start Chatting Free' to enter chat interface for success toast tests
         elem = frame.locator('xpath=html/body/div[2]/main/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -184,7 +185,7 @@ async def run_test():
             await expect(frame.locator('text=Upload completed successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Toast notifications for successful actions and error conditions did not appear as expected during the test plan execution.")
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
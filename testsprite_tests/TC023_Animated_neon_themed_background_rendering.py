@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -54,7 +55,7 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'ChatBattles .ai' link or equivalent to navigate to chat page
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # -> Scroll down the chat page to verify the animated gradient background's smoothness and performance visually.
@@ -65,7 +66,7 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Home' or equivalent to navigate to profile page or main page with profile section
         elem = frame.locator('xpath=html/body/div[2]/nav/div/div/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await actions.click(elem, timeout=5000)
         
 
         # --> Assertions to verify final state
@@ -74,7 +75,7 @@ async def run_test():
             await expect(frame.locator('text=Animated Gradient Background Loaded Successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test case failed: The dynamic neon-themed animated gradient background did not load smoothly or perform well across devices and browsers as required by the test plan.')
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness import actions
 
 async def run_test():
     pw = None
@@ -48,17 +49,17 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # -> Fetch sitemap.xml and check for correct URLs
         await page.goto('http://localhost:3000/sitemap.xml', timeout=10000)
-        await asyncio.sleep(3)
+        await actions.settle(page)
         
 
         # -> Navigate to /robots.txt and verify its contents to ensure sensitive paths are disallowed
         await page.goto('http://localhost:3000/robots.txt', timeout=10000)
-        await asyncio.sleep(3)
+        await actions.settle(page)
         
 
         # -> Check another static informational page (e.g., /about) for presence of correct SEO metadata tags
         await page.goto('http://localhost:3000/about', timeout=10000)
-        await asyncio.sleep(3)
+        await actions.settle(page)
         
 
         # --> Assertions to verify final state
@@ -119,7 +120,7 @@ async def run_test():
         await expect(frame.locator('text=Terms').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Privacy').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=© 2025 ChatBattles.ai — Made with ⚡ by Biraj').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await actions.settle(page)
     
     finally:
         if context:
@@ -0,0 +1,34 @@
+"""
+Shared Playwright harness for the testsprite_tests suite.
+
+The generated TC*.py cases each start Playwright, launch Chromium and tear it
+down again. The harness loads those cases without their `asyncio.run(...)`
+entry point and hands them a shared, already-running browser so every case
+only pays for a fresh BrowserContext.
+
+Run from the testsprite_tests directory:
+
+    python -m harness            # whole suite
+    python -m harness -k TC004   # cases whose name contains "TC004"
+
+The runner names below are imported lazily so the stdlib-only tools in this
+package (mock_llm, codemod) work without Playwright installed.
+"""
+
+from typing import Any
+
+__all__ = [
+    "Case",
+    "CaseResult",
+    "SuiteConfig",
+    "discover_cases",
+    "run_suite",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name in __all__:
+        from . import runner
+
+        return getattr(runner, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,69 @@
+"""Command line entry point: `python -m harness` from testsprite_tests/."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from .mock_llm import DEFAULT_PORT
+from .runner import REPORT_PATH, SuiteConfig, discover_cases, format_summary, run
+from .vitals import VITALS_REPORT_PATH, VitalsCollector
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="harness", description="Run testsprite cases on a shared browser")
+    parser.add_argument("-k", "--keyword", help="only run cases whose name contains this text")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument(
+        "-n", "--workers", type=int, default=os.cpu_count() or 1, help="parallel browsers (default: CPU count)"
+    )
+    parser.add_argument(
+        "--mock-llm",
+        nargs="?",
+        type=int,
+        const=DEFAULT_PORT,
+        metavar="PORT",
+        help=f"serve the mock provider API during the run (default port {DEFAULT_PORT})",
+    )
+    parser.add_argument("--auth", action="store_true", help="sign in once and reuse the session (see harness/auth.py)")
+    parser.add_argument("--base-url", default="http://localhost:3000", help="app URL used for sign-in")
+    parser.add_argument("--vitals", action="store_true", help="record LCP/CLS/INP/long tasks/heap per page")
+    parser.add_argument("--vitals-thresholds", type=Path, help="JSON overrides for the vitals thresholds")
+    parser.add_argument("--report", type=Path, default=REPORT_PATH, help="where to write the JSON report")
+    args = parser.parse_args(argv)
+
+    cases = discover_cases(keyword=args.keyword)
+    if not cases:
+        print("No cases found", file=sys.stderr)
+        return 1
+
+    config = SuiteConfig(
+        headless=not args.headed,
+        workers=args.workers,
+        report_path=args.report,
+        mock_llm_port=args.mock_llm,
+        auth=args.auth,
+        base_url=args.base_url,
+        vitals=VitalsCollector.from_file(args.vitals_thresholds) if args.vitals or args.vitals_thresholds else None,
+    )
+    started = time.perf_counter()
+    results = run(cases, config)
+    print()
+    print(format_summary(results, time.perf_counter() - started))
+
+    vitals_ok = True
+    if config.vitals is not None:
+        violations = config.vitals.violations()
+        print(f"\nWeb Vitals: {len(config.vitals.records)} pages, {len(violations)} over threshold ({VITALS_REPORT_PATH})")
+        for violation in violations:
+            print(f"  {violation}")
+        vitals_ok = not violations
+
+    return 0 if vitals_ok and all(result.passed for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
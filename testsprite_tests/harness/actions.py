@@ -0,0 +1,123 @@
+"""
+Event-driven replacements for the fixed sleeps in generated cases.
+
+The generated cases do `await page.wait_for_timeout(3000)` before every
+click and fill. Playwright locators already wait for actionability, so the
+only thing the sleep bought was time for the *previous* action's side
+effects (navigation, /api/* calls, Clerk requests) to land. These helpers
+wait for exactly that: after each action they wait for the page to load and
+for its tracked requests to go quiet.
+
+    from harness import actions
+
+    await actions.click(elem, timeout=5000)
+    await actions.fill(elem, "hello")
+    await actions.settle(page)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Any, Optional, Set
+
+from playwright import async_api
+from playwright.async_api import expect
+
+# Requests that can change what the next action targets. Static assets and
+# long-lived streams (websocket, eventsource) are ignored.
+TRACKED_RESOURCE_TYPES = {"document", "xhr", "fetch"}
+
+QUIET_MS = 150
+# The 3000 ms sleep being replaced: a page that never goes quiet costs no more
+SETTLE_TIMEOUT_MS = 3000
+
+
+class _RequestTracker:
+    """Counts in-flight requests on a page so callers can wait for quiet."""
+
+    def __init__(self, page: async_api.Page):
+        self.pending: Set[async_api.Request] = set()
+        self.last_change = asyncio.get_running_loop().time()
+        page.on("request", self._on_start)
+        page.on("requestfinished", self._on_end)
+        page.on("requestfailed", self._on_end)
+
+    def _on_start(self, request: async_api.Request) -> None:
+        if request.resource_type in TRACKED_RESOURCE_TYPES:
+            self.pending.add(request)
+            self.last_change = asyncio.get_running_loop().time()
+
+    def _on_end(self, request: async_api.Request) -> None:
+        if request in self.pending:
+            self.pending.discard(request)
+            self.last_change = asyncio.get_running_loop().time()
+
+    async def wait_idle(self, quiet_ms: int, timeout_ms: int) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        while True:
+            now = loop.time()
+            if not self.pending and now - self.last_change >= quiet_ms / 1000:
+                return True
+            if now >= deadline:
+                return False
+            await asyncio.sleep(0.025)
+
+
+_trackers: "weakref.WeakKeyDictionary[async_api.Page, _RequestTracker]" = weakref.WeakKeyDictionary()
+
+
+def _tracker(page: async_api.Page) -> _RequestTracker:
+    tracker = _trackers.get(page)
+    if tracker is None:
+        tracker = _trackers[page] = _RequestTracker(page)
+    return tracker
+
+
+async def settle(page: async_api.Page, *, quiet_ms: int = QUIET_MS, timeout_ms: int = SETTLE_TIMEOUT_MS) -> None:
+    """
+    Wait for the DOM to be ready and tracked requests to go quiet.
+
+    Best effort: a page that never goes quiet (polling, a long battle call)
+    costs at most `timeout_ms` in total, the same as the old sleep by default.
+    """
+    tracker = _tracker(page)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+    except async_api.Error:
+        pass
+    # Both waits share the one budget
+    remaining_ms = max(0, timeout_ms - int((loop.time() - started) * 1000))
+    await tracker.wait_idle(quiet_ms, remaining_ms)
+
+
+async def click(elem: async_api.Locator, *, timeout: float = 5000, **kwargs: Any) -> None:
+    """Click once actionable, then let the resulting requests land."""
+    _tracker(elem.page)
+    await elem.click(timeout=timeout, **kwargs)
+    await settle(elem.page)
+
+
+async def fill(elem: async_api.Locator, value: str, *, timeout: Optional[float] = None, **kwargs: Any) -> None:
+    """Fill once editable, then let any input-driven requests land."""
+    _tracker(elem.page)
+    await elem.fill(value, timeout=timeout, **kwargs)
+    await settle(elem.page)
+
+
+async def wait_for_api(page: async_api.Page, path: str, *, timeout: float = 30000) -> async_api.Response:
+    """Wait for the next response whose URL contains `path` (e.g. "/api/a4f-battle")."""
+    return await page.wait_for_event("response", lambda response: path in response.url, timeout=timeout)
+
+
+async def wait_for_dom(page: async_api.Page, expression: str, arg: Any = None, *, timeout: float = 30000) -> None:
+    """Wait until a JavaScript predicate over the DOM is truthy."""
+    await page.wait_for_function(expression, arg=arg, timeout=timeout)
+
+
+async def expect_visible(locator: async_api.Locator, *, timeout: float = 30000) -> None:
+    """Assert that `locator` becomes visible, polling instead of sleeping."""
+    await expect(locator).to_be_visible(timeout=timeout)
@@ -0,0 +1,188 @@
+"""
+Sign in to Clerk once per run and reuse the session via storageState.
+
+Most cases need /chat or /profile, and driving the Clerk email-code UI from
+every case is what made them slow and flaky. Instead the harness signs in a
+test user once, saves Playwright's storageState, and starts every
+authenticated case from a context that already carries the session.
+
+Sign-in strategies, first match wins:
+
+1. Sign-in token (no UI): with CLERK_SECRET_KEY and E2E_CLERK_USER_ID (or
+   E2E_CLERK_USER_EMAIL to look the user up), create a one-time sign-in token
+   through the Clerk Backend API and open /sign-in?__clerk_ticket=<token>.
+2. Password through clerk-js: with E2E_CLERK_USER_EMAIL and
+   E2E_CLERK_USER_PASSWORD, call Clerk.client.signIn.create() in the page.
+   Works only if the instance does not require a second factor.
+
+When CLERK_SECRET_KEY is set, a Clerk testing token is also fetched and
+appended to Frontend API requests (what @clerk/testing does for JS), so bot
+protection does not block automated browsers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import time
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from playwright import async_api
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+STORAGE_STATE_PATH = SUITE_DIR / "tmp" / "auth_state.json"
+CLERK_API_URL = "https://api.clerk.com/v1"
+
+# Clerk's short-lived session JWT is refreshed by clerk-js from the
+# long-lived client cookie, so a saved state stays usable for a while.
+MAX_STATE_AGE_SECONDS = 50 * 60
+
+# Cases that test sign-up/sign-in or signed-out behaviour must not start
+# with a session.
+SIGNED_OUT_CASE = re.compile(
+    r"sign_?up|sign_?in|without_authentication|unauthenticated|protected_routes",
+    re.IGNORECASE,
+)
+
+_CLERK_FAPI = re.compile(r"^https://[^/]*clerk[^/]*/v1/")
+
+# Testing tokens are short-lived; share one across the run's contexts and refresh it periodically.
+TESTING_TOKEN_TTL_SECONDS = 30 * 60
+_testing_token: Optional[str] = None
+_testing_token_fetched_at = 0.0
+
+
+class AuthError(RuntimeError):
+    """Raised when no sign-in strategy is configured or sign-in fails."""
+
+
+def needs_auth(case_name: str) -> bool:
+    """True unless the case exercises the signed-out experience."""
+    return not SIGNED_OUT_CASE.search(case_name)
+
+
+def _backend_api(method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+    secret = os.environ.get("CLERK_SECRET_KEY")
+    if not secret:
+        raise AuthError("CLERK_SECRET_KEY is not set")
+    request = urllib.request.Request(
+        f"{CLERK_API_URL}{path}",
+        method=method,
+        data=json.dumps(payload).encode("utf-8") if payload is not None else None,
+        headers={"Authorization": f"Bearer {secret}", "Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=15) as response:
+        return json.loads(response.read() or b"null")
+
+
+async def _call_backend(method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(None, _backend_api, method, path, payload)
+
+
+async def _resolve_user_id() -> Optional[str]:
+    user_id = os.environ.get("E2E_CLERK_USER_ID")
+    if user_id:
+        return user_id
+    email = os.environ.get("E2E_CLERK_USER_EMAIL")
+    if not email or not os.environ.get("CLERK_SECRET_KEY"):
+        return None
+    users = await _call_backend("GET", "/users?" + urllib.parse.urlencode({"email_address": email}))
+    return users[0]["id"] if users else None
+
+
+async def install_testing_token(context: async_api.BrowserContext) -> None:
+    """Append a Clerk testing token to Frontend API requests made by `context`."""
+    global _testing_token, _testing_token_fetched_at
+    if not os.environ.get("CLERK_SECRET_KEY"):
+        return
+    if _testing_token is None or time.time() - _testing_token_fetched_at > TESTING_TOKEN_TTL_SECONDS:
+        _testing_token = (await _call_backend("POST", "/testing_tokens"))["token"]
+        _testing_token_fetched_at = time.time()
+    token = _testing_token
+
+    async def add_token(route: async_api.Route) -> None:
+        url = urllib.parse.urlsplit(route.request.url)
+        query = urllib.parse.parse_qsl(url.query, keep_blank_values=True)
+        query.append(("__clerk_testing_token", token))
+        await route.continue_(url=urllib.parse.urlunsplit(url._replace(query=urllib.parse.urlencode(query))))
+
+    await context.route(_CLERK_FAPI, add_token)
+
+
+async def _wait_for_session(page: async_api.Page, timeout: float) -> None:
+    await page.wait_for_function("() => Boolean(window.Clerk && window.Clerk.user)", timeout=timeout)
+
+
+async def _sign_in_with_ticket(page: async_api.Page, base_url: str, user_id: str, timeout: float) -> None:
+    ticket = await _call_backend("POST", "/sign_in_tokens", {"user_id": user_id, "expires_in_seconds": 300})
+    await page.goto(f"{base_url}/sign-in?__clerk_ticket={urllib.parse.quote(ticket['token'])}")
+    await _wait_for_session(page, timeout)
+
+
+async def _sign_in_with_password(page: async_api.Page, base_url: str, email: str, password: str, timeout: float) -> None:
+    await page.goto(f"{base_url}/sign-in")
+    await page.wait_for_function("() => Boolean(window.Clerk && window.Clerk.loaded)", timeout=timeout)
+    status = await page.evaluate(
+        """async ([identifier, password]) => {
+            const attempt = await window.Clerk.client.signIn.create({ identifier, password });
+            if (attempt.status === 'complete') {
+                await window.Clerk.setActive({ session: attempt.createdSessionId });
+            }
+            return attempt.status;
+        }""",
+        [email, password],
+    )
+    if status != "complete":
+        raise AuthError(f"Password sign-in stopped at '{status}'; use a sign-in token (CLERK_SECRET_KEY) instead")
+    await _wait_for_session(page, timeout)
+
+
+def _state_is_fresh(path: Path, max_age: float) -> bool:
+    return path.exists() and time.time() - path.stat().st_mtime < max_age
+
+
+async def ensure_storage_state(
+    pw: async_api.Playwright,
+    base_url: str,
+    *,
+    path: Path = STORAGE_STATE_PATH,
+    max_age: float = MAX_STATE_AGE_SECONDS,
+    timeout: float = 30000,
+) -> Path:
+    """Return a signed-in storageState file, signing in only if the saved one is stale."""
+    if _state_is_fresh(path, max_age):
+        print(f"Reusing signed-in state from {path}")
+        return path
+
+    started = time.perf_counter()
+    browser = await pw.chromium.launch(headless=True)
+    try:
+        context = await browser.new_context()
+        await install_testing_token(context)
+        page = await context.new_page()
+
+        user_id = await _resolve_user_id()
+        email = os.environ.get("E2E_CLERK_USER_EMAIL")
+        password = os.environ.get("E2E_CLERK_USER_PASSWORD")
+        if user_id and os.environ.get("CLERK_SECRET_KEY"):
+            await _sign_in_with_ticket(page, base_url, user_id, timeout)
+        elif email and password:
+            await _sign_in_with_password(page, base_url, email, password, timeout)
+        else:
+            raise AuthError(
+                "Set CLERK_SECRET_KEY with E2E_CLERK_USER_ID/E2E_CLERK_USER_EMAIL, "
+                "or E2E_CLERK_USER_EMAIL with E2E_CLERK_USER_PASSWORD"
+            )
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        await context.storage_state(path=str(path))
+    finally:
+        await browser.close()
+
+    print(f"Signed in and saved state to {path} in {time.perf_counter() - started:.2f}s")
+    return path
@@ -0,0 +1,177 @@
+"""
+Time-to-first-token and inter-token latency benchmark for /api/chat-stream.
+
+Opens `--streams` concurrent SSE streams per model, for `--rounds` rounds,
+and times every `data:` frame as it comes off the socket:
+
+    python -m harness.bench_stream --streams 8 --rounds 3
+    python -m harness.bench_stream --models gemini-2.5-flash-lite --streams 20
+
+Reported per model: time to first content frame (TTFT), inter-frame gap
+distribution, bytes per frame, total stream duration and stream errors. The
+gap distribution is where per-chunk cost in the route (cleanModelResponse,
+JSON encoding) shows up, so compare runs against the mock provider to keep
+provider jitter out of the numbers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .http_client import post_json
+from .stats import distribution
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = SUITE_DIR / "tmp" / "bench_stream.json"
+
+DEFAULT_MODELS = [
+    "openai/gpt-oss-120b",
+    "provider-3/llama-4-scout",
+    "deepseek/deepseek-chat-v3.1:free",
+    "gemini-2.5-flash-lite",
+]
+
+
+@dataclass
+class StreamSample:
+    model: str
+    status: int = 0
+    ttft: Optional[float] = None
+    duration: float = 0.0
+    gaps: List[float] = field(default_factory=list)
+    frame_bytes: List[int] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+async def _stream_once(url: str, model: str, prompt: str, headers: Dict[str, str], timeout: float) -> StreamSample:
+    sample = StreamSample(model)
+    started = time.perf_counter()
+    last_frame: Optional[float] = None
+    buffer = b""
+
+    async def consume() -> None:
+        nonlocal last_frame, buffer
+        response = await post_json(url, {"prompt": prompt, "modelId": model}, headers=headers)
+        sample.status = response.status
+        try:
+            async for chunk in response.iter_chunks():
+                arrived = time.perf_counter()
+                buffer += chunk
+                while b"\n\n" in buffer:
+                    frame, buffer = buffer.split(b"\n\n", 1)
+                    if not frame.startswith(b"data: "):
+                        continue
+                    data = frame[len(b"data: "):]
+                    if data == b"[DONE]":
+                        return
+                    payload: Dict[str, Any] = json.loads(data)
+                    if "error" in payload:
+                        sample.error = str(payload["error"])
+                        return
+                    sample.frame_bytes.append(len(frame) + 2)
+                    if sample.ttft is None:
+                        sample.ttft = arrived - started
+                    elif last_frame is not None:
+                        sample.gaps.append(arrived - last_frame)
+                    last_frame = arrived
+            if response.status != 200:
+                sample.error = f"HTTP {response.status}"
+        finally:
+            await response.close()
+
+    try:
+        await asyncio.wait_for(consume(), timeout)
+    except asyncio.TimeoutError:
+        sample.error = "timeout"
+    except (OSError, asyncio.IncompleteReadError, ValueError, IndexError) as error:
+        # Truncated body or malformed status/chunk line
+        sample.error = f"{type(error).__name__}: {error}"
+    sample.duration = time.perf_counter() - started
+    return sample
+
+
+def summarize(samples: List[StreamSample]) -> Dict[str, Any]:
+    ok = [sample for sample in samples if sample.error is None and sample.ttft is not None]
+    gaps = [gap for sample in ok for gap in sample.gaps]
+    frame_bytes = [float(size) for sample in ok for size in sample.frame_bytes]
+    return {
+        "streams": len(samples),
+        "errors": len(samples) - len(ok),
+        "error_messages": sorted({sample.error for sample in samples if sample.error}),
+        "ttft": distribution([sample.ttft for sample in ok if sample.ttft is not None]),
+        "inter_chunk_gap": distribution(gaps),
+        "bytes_per_frame": distribution(frame_bytes),
+        "frames_per_stream": distribution([float(len(sample.frame_bytes)) for sample in ok]),
+        "duration": distribution([sample.duration for sample in ok]),
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    url = args.url.rstrip("/") + "/api/chat-stream"
+    headers: Dict[str, str] = {"Accept": "text/event-stream"}
+    if args.cookie:
+        headers["Cookie"] = args.cookie
+
+    per_model: Dict[str, List[StreamSample]] = {model: [] for model in args.models}
+    for round_index in range(args.rounds):
+        print(f"Round {round_index + 1}/{args.rounds}...", file=sys.stderr)
+        tasks = []
+        for model in args.models:
+            for stream_index in range(args.streams):
+                stream_headers = dict(headers)
+                if args.spread_ips:
+                    stream_headers["X-Forwarded-For"] = f"10.20.{round_index % 256}.{stream_index % 256}"
+                tasks.append(_stream_once(url, model, args.prompt, stream_headers, args.timeout))
+        for sample in await asyncio.gather(*tasks):
+            per_model[sample.model].append(sample)
+
+    return {model: summarize(samples) for model, samples in per_model.items()}
+
+
+def format_table(report: Dict[str, Dict[str, Any]]) -> str:
+    header = (
+        f"{'model':<34} {'ok':>5} {'ttft p50':>9} {'ttft p95':>9} {'gap p50':>9} "
+        f"{'gap p99':>9} {'B/frame':>8} {'dur p50':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for model, stats in report.items():
+        ok = stats["streams"] - stats["errors"]
+        lines.append(
+            f"{model:<34} {ok:>2}/{stats['streams']:<2} "
+            f"{stats['ttft']['p50'] * 1000:>7.0f}ms {stats['ttft']['p95'] * 1000:>7.0f}ms "
+            f"{stats['inter_chunk_gap']['p50'] * 1000:>7.1f}ms {stats['inter_chunk_gap']['p99'] * 1000:>7.1f}ms "
+            f"{stats['bytes_per_frame']['mean']:>8.1f} {stats['duration']['p50']:>7.2f}s"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.bench_stream", description="TTFT / inter-token benchmark for /api/chat-stream")
+    parser.add_argument("--url", default="http://localhost:3000", help="app base URL")
+    parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS, help="modelId values to stream")
+    parser.add_argument("--streams", type=int, default=4, help="concurrent streams per model per round")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--prompt", default="Write a 150 word overview of how TCP congestion control works.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-stream timeout in seconds")
+    parser.add_argument("--cookie", help="Cookie header for a signed-in session")
+    parser.add_argument("--spread-ips", action="store_true", help="distinct X-Forwarded-For per stream")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="JSON results path")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_benchmark(args))
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(format_table(report))
+    print(f"\nWrote {args.output}", file=sys.stderr)
+    return 0 if all(stats["errors"] == 0 for stats in report.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Rewrite generated cases to use `harness.actions` instead of fixed sleeps.
+
+    python -m harness.codemod            # rewrite every TC*.py in place
+    python -m harness.codemod --check    # report files that still need it
+
+Rewrites, line by line (comments and layout are left alone):
+
+    await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        -> await actions.click(elem, timeout=5000)
+    await page.wait_for_timeout(3000); await elem.fill('x')
+        -> await actions.fill(elem, 'x')
+    await asyncio.sleep(3)
+        -> await actions.settle(page)
+
+Running it twice is a no-op, so it can be re-applied after testsprite
+regenerates the suite.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_LINE = "from harness import actions"
+EXPECT_IMPORT = "from playwright.async_api import expect"
+
+_SLEEP_THEN_ACTION = re.compile(
+    r"^(?P<indent>\s*)await \w+\.wait_for_timeout\(\d+\);\s*"
+    r"await (?P<target>\w+)\.(?P<action>click|fill)\((?P<args>.*)\)\s*$"
+)
+_BARE_SLEEP = re.compile(r"^(?P<indent>\s*)await (?:asyncio\.sleep|page\.wait_for_timeout)\([\d.]+\)\s*$")
+
+
+def _rewrite_line(line: str) -> str:
+    match = _SLEEP_THEN_ACTION.match(line)
+    if match:
+        args = match["args"].strip()
+        joined = f"{match['target']}, {args}" if args else match["target"]
+        return f"{match['indent']}await actions.{match['action']}({joined})"
+
+    match = _BARE_SLEEP.match(line)
+    if match:
+        return f"{match['indent']}await actions.settle(page)"
+
+    return line
+
+
+def rewrite_source(source: str) -> Tuple[str, int]:
+    """Return the rewritten source and the number of lines changed."""
+    lines = source.split("\n")
+    rewritten = [_rewrite_line(line) for line in lines]
+    changed = sum(1 for before, after in zip(lines, rewritten) if before != after)
+
+    if changed and IMPORT_LINE not in rewritten:
+        try:
+            position = rewritten.index(EXPECT_IMPORT) + 1
+        except ValueError:
+            position = 0
+        rewritten.insert(position, IMPORT_LINE)
+
+    return "\n".join(rewritten), changed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.codemod", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", type=Path, help="files to rewrite (default: every TC*.py)")
+    parser.add_argument("--check", action="store_true", help="only report files that would change")
+    args = parser.parse_args(argv)
+
+    files = args.files or sorted(SUITE_DIR.glob("TC*.py"))
+    pending = 0
+    for path in files:
+        source = path.read_text(encoding="utf-8")
+        rewritten, changed = rewrite_source(source)
+        if not changed:
+            continue
+        pending += 1
+        if args.check:
+            print(f"{path.name}: {changed} sleeps")
+        else:
+            path.write_text(rewritten, encoding="utf-8")
+            print(f"{path.name}: rewrote {changed} sleeps")
+
+    return 1 if args.check and pending else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Minimal asyncio HTTP/1.1 client for the load and streaming benchmarks.
+
+Standard library only, one connection per request, and body chunks are
+yielded as they arrive off the socket so streaming timings (TTFT,
+inter-chunk gaps) are measured at the client rather than after buffering.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+
+@dataclass
+class Response:
+    status: int
+    headers: Dict[str, str]
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Yield body bytes as they arrive (handles chunked, sized and close-delimited bodies)."""
+        if self.headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await self.reader.readline()
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    await self.reader.readline()
+                    return
+                data = await self.reader.readexactly(size)
+                await self.reader.readexactly(2)
+                yield data
+        elif "content-length" in self.headers:
+            remaining = int(self.headers["content-length"])
+            while remaining > 0:
+                data = await self.reader.read(min(remaining, 65536))
+                if not data:
+                    return
+                remaining -= len(data)
+                yield data
+        else:
+            while True:
+                data = await self.reader.read(65536)
+                if not data:
+                    return
+                yield data
+
+    async def read(self) -> bytes:
+        return b"".join([chunk async for chunk in self.iter_chunks()])
+
+    async def json(self) -> Any:
+        return json.loads(await self.read())
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def open_request(
+    method: str,
+    url: str,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    body: Optional[bytes] = None,
+) -> Response:
+    """Send a request and return once the response headers are in."""
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    host = parts.hostname or "localhost"
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    reader, writer = await asyncio.open_connection(host, port, ssl=secure or None)
+    request_headers = {
+        "Host": parts.netloc,
+        "Connection": "close",
+        "Accept": "*/*",
+        **(headers or {}),
+    }
+    if body is not None:
+        request_headers["Content-Length"] = str(len(body))
+    head = f"{method} {path} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in request_headers.items()) + "\r\n"
+    writer.write(head.encode("latin-1") + (body or b""))
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        writer.close()
+        raise ConnectionError(f"empty response from {url}")
+    status = int(status_line.split(b" ", 2)[1])
+    response_headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        response_headers[name.strip().lower()] = value.strip()
+    return Response(status, response_headers, reader, writer)
+
+
+async def post_json(
+    url: str,
+    payload: Any,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """POST a JSON body; the caller reads and closes the response."""
+    return await open_request(
+        "POST",
+        url,
+        headers={"Content-Type": "application/json", **(headers or {})},
+        body=json.dumps(payload).encode("utf-8"),
+    )
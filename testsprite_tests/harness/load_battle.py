@@ -0,0 +1,206 @@
+"""
+Concurrency ramp against POST /api/a4f-battle.
+
+Each step runs N virtual users that send battle requests back to back for a
+fixed duration, then reports latency percentiles, error rate and throughput
+for that step:
+
+    python -m harness.load_battle --steps 1,10,50,200 --step-duration 30
+    python -m harness.load_battle --history 4 --attachment image --spread-ips
+
+Anonymous requests are IP rate limited (50/hour), so a local run against
+`npm run dev` either uses --spread-ips (a distinct X-Forwarded-For per
+virtual user) or a signed-in --cookie. Pair it with the mock provider
+(`python -m harness.mock_llm`) to load the route rather than the providers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .http_client import post_json
+from .stats import distribution
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = SUITE_DIR / "tmp" / "load_battle.json"
+
+# 1x1 transparent PNG, enough to exercise the vision-analysis path.
+TINY_PNG = (
+    "data:image/png;base64,"
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+@dataclass
+class Sample:
+    latency: float
+    status: int
+    ok: bool
+    model_errors: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class StepResult:
+    concurrency: int
+    duration: float
+    requests: int
+    errors: int
+    error_rate: float
+    model_errors: int
+    throughput: float
+    latency: Dict[str, float] = field(default_factory=dict)
+    statuses: Dict[str, int] = field(default_factory=dict)
+
+
+def build_payload(index: int, history: int, attachment: Optional[str]) -> Dict[str, Any]:
+    """Battle request body with optional history and attachment."""
+    payload: Dict[str, Any] = {"prompt": f"Load test prompt #{index}: explain HTTP keep-alive in two sentences."}
+    if history:
+        turns: List[Dict[str, str]] = []
+        for turn in range(history):
+            role = "user" if turn % 2 == 0 else "assistant"
+            turns.append({"role": role, "content": f"Earlier {role} message {turn} for context."})
+        payload["conversationHistory"] = turns
+    if attachment == "image":
+        payload["attachments"] = [{"type": "image", "data": TINY_PNG, "filename": "pixel.png"}]
+    elif attachment == "document":
+        payload["attachments"] = [{"type": "document", "data": "Quarterly notes.\n" * 50, "filename": "notes.txt"}]
+    return payload
+
+
+async def _exchange(url: str, payload: Dict[str, Any], headers: Dict[str, str]) -> Tuple[int, bytes]:
+    response = await post_json(url, payload, headers=headers)
+    try:
+        return response.status, await response.read()
+    finally:
+        await response.close()
+
+
+async def _send(url: str, payload: Dict[str, Any], headers: Dict[str, str], timeout: float) -> Sample:
+    started = time.perf_counter()
+    try:
+        # One deadline for the whole request, connect through last byte
+        status, body = await asyncio.wait_for(_exchange(url, payload, headers), timeout)
+        latency = time.perf_counter() - started
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return Sample(latency, status, False, error="non-JSON response")
+        results = data.get("results") or []
+        model_errors = sum(1 for result in results if str(result.get("text", "")).startswith("⚠️ Error"))
+        ok = status == 200 and bool(data.get("success"))
+        return Sample(latency, status, ok, model_errors, None if ok else str(data.get("error")))
+    except (asyncio.TimeoutError, OSError) as error:
+        return Sample(time.perf_counter() - started, 0, False, error=type(error).__name__)
+    except (asyncio.IncompleteReadError, ValueError, IndexError) as error:
+        # Truncated or malformed response: the server breaking under load is a
+        # failed sample, not a reason to abort the ramp
+        return Sample(time.perf_counter() - started, 0, False, error=type(error).__name__)
+
+
+async def _virtual_user(
+    user: int,
+    args: argparse.Namespace,
+    deadline: float,
+    samples: List[Sample],
+) -> None:
+    headers: Dict[str, str] = {}
+    if args.cookie:
+        headers["Cookie"] = args.cookie
+    if args.spread_ips:
+        headers["X-Forwarded-For"] = f"10.{(user >> 16) & 255}.{(user >> 8) & 255}.{user & 255}"
+    url = args.url.rstrip("/") + "/api/a4f-battle"
+    sent = 0
+    while time.perf_counter() < deadline:
+        payload = build_payload(user * 100000 + sent, args.history, args.attachment)
+        samples.append(await _send(url, payload, headers, args.timeout))
+        sent += 1
+
+
+async def run_step(concurrency: int, args: argparse.Namespace) -> StepResult:
+    samples: List[Sample] = []
+    started = time.perf_counter()
+    deadline = started + args.step_duration
+    await asyncio.gather(*(_virtual_user(user, args, deadline, samples) for user in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        statuses[str(sample.status)] = statuses.get(str(sample.status), 0) + 1
+    errors = sum(1 for sample in samples if not sample.ok)
+    return StepResult(
+        concurrency=concurrency,
+        duration=elapsed,
+        requests=len(samples),
+        errors=errors,
+        error_rate=errors / len(samples) if samples else 0.0,
+        model_errors=sum(sample.model_errors for sample in samples),
+        throughput=len(samples) / elapsed if elapsed else 0.0,
+        latency=distribution([sample.latency for sample in samples if sample.ok]),
+        statuses=statuses,
+    )
+
+
+def format_table(steps: List[StepResult]) -> str:
+    header = f"{'conc':>5} {'reqs':>6} {'rps':>7} {'err%':>6} {'model_err':>9} {'p50':>8} {'p95':>8} {'p99':>8}"
+    lines = [header, "-" * len(header)]
+    for step in steps:
+        lines.append(
+            f"{step.concurrency:>5} {step.requests:>6} {step.throughput:>7.2f} {step.error_rate * 100:>5.1f}% "
+            f"{step.model_errors:>9} {step.latency['p50']:>7.2f}s {step.latency['p95']:>7.2f}s {step.latency['p99']:>7.2f}s"
+        )
+    return "\n".join(lines)
+
+
+async def run_ramp(args: argparse.Namespace) -> List[StepResult]:
+    steps: List[StepResult] = []
+    for concurrency in args.steps:
+        print(f"Step: {concurrency} concurrent users for {args.step_duration:.0f}s...", file=sys.stderr)
+        steps.append(await run_step(concurrency, args))
+    return steps
+
+
+def _parse_steps(value: str) -> List[int]:
+    steps = [int(part) for part in value.split(",") if part.strip()]
+    if not steps or any(step < 1 for step in steps):
+        raise argparse.ArgumentTypeError("steps must be positive integers, e.g. 1,10,50")
+    return steps
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="harness.load_battle", description="Concurrency ramp against /api/a4f-battle")
+    parser.add_argument("--url", default="http://localhost:3000", help="app base URL")
+    parser.add_argument("--steps", type=_parse_steps, default=[1, 10, 50], help="comma-separated concurrency levels")
+    parser.add_argument("--step-duration", type=float, default=30.0, help="seconds per step")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-request timeout in seconds")
+    parser.add_argument("--history", type=int, default=0, help="conversationHistory items per request")
+    parser.add_argument("--attachment", choices=["image", "document"], help="attach an image or document")
+    parser.add_argument("--cookie", help="Cookie header for a signed-in session")
+    parser.add_argument("--spread-ips", action="store_true", help="distinct X-Forwarded-For per virtual user")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="JSON results path")
+    args = parser.parse_args(argv)
+
+    steps = asyncio.run(run_ramp(args))
+    report = {
+        "url": args.url,
+        "history": args.history,
+        "attachment": args.attachment,
+        "steps": [asdict(step) for step in steps],
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(format_table(steps))
+    print(f"\nWrote {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
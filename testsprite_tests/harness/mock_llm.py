@@ -0,0 +1,422 @@
+"""
+Local stand-in for the AI providers, for deterministic and offline runs.
+
+Speaks just enough of two APIs for the app's clients:
+
+- OpenAI chat completions (`POST .../chat/completions`, streaming and not),
+  used by a4fClient, groqClient and openRouterClient
+- Gemini `POST .../models/{model}:generateContent` and
+  `:streamGenerateContent?alt=sse`, used by googleClient
+
+Point the app at it with the base URL env vars (any non-empty API keys work):
+
+    A4F_BASE_URL=http://127.0.0.1:8787/v1
+    GROQ_BASE_URL=http://127.0.0.1:8787/v1
+    OPENROUTER_BASE_URL=http://127.0.0.1:8787/v1
+    GOOGLE_API_BASE_URL=http://127.0.0.1:8787
+
+and start it with `python -m harness.mock_llm` or `python -m harness --mock-llm`.
+
+Per-model behaviour comes from a JSON profile file (`--profiles`, or the
+MOCK_LLM_PROFILES env var) keyed by model id, with "*" as the default:
+
+    {
+      "*": {"latency_ms": 200, "tokens_per_second": 80},
+      "provider-3/llama-4-scout": {"latency_ms": 35000},
+      "deepseek/deepseek-chat-v3.1:free": {"error_rate": 0.2, "error_status": 429}
+    }
+
+This module only uses the standard library so it runs without Playwright.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+
+_FILLER = (
+    "This is a deterministic mock response from the local provider stand-in. "
+    "It streams at a configurable rate so latency and rendering can be measured "
+    "without calling a live model."
+).split()
+
+_GEMINI_PATH = re.compile(r"/models/(?P<model>[^/:]+):(?P<method>generateContent|streamGenerateContent)$")
+
+_STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+}
+
+
+@dataclass
+class ModelProfile:
+    """How a mocked model behaves."""
+
+    # Delay before the first token (or the whole body, when not streaming).
+    latency_ms: float = 200
+    tokens_per_second: float = 80
+    response_tokens: int = 60
+    # Fraction of requests answered with `error_status` instead of a completion.
+    error_rate: float = 0.0
+    error_status: int = 500
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ModelProfile":
+        known = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+class Profiles:
+    """Profile lookup by model id with a "*" fallback."""
+
+    def __init__(self, profiles: Optional[Dict[str, ModelProfile]] = None):
+        self.profiles = profiles or {}
+        self.default = self.profiles.get("*", ModelProfile())
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "Profiles":
+        if not path:
+            return cls()
+        with open(path, encoding="utf-8") as handle:
+            raw = json.load(handle)
+        return cls({model: ModelProfile.from_dict(values) for model, values in raw.items()})
+
+    def get(self, model: str) -> ModelProfile:
+        return self.profiles.get(model, self.default)
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: str
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self) -> Dict[str, Any]:
+        return json.loads(self.body or b"{}")
+
+
+class MockLLMServer:
+    """asyncio HTTP server answering OpenAI- and Gemini-style requests."""
+
+    def __init__(self, profiles: Optional[Profiles] = None, *, seed: int = 0):
+        self.profiles = profiles or Profiles()
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> "MockLLMServer":
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self
+
+    @property
+    def port(self) -> int:
+        assert self._server is not None, "server not started"
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        assert self._server is not None, "server not started"
+        async with self._server:
+            await self._server.serve_forever()
+
+    # HTTP plumbing
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await self._read_request(reader)
+            if request is not None:
+                self.request_count += 1
+                await self._route(request, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        if not lines or not lines[0]:
+            return None
+        method, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", "0") or 0)
+        body = await reader.readexactly(length) if length else b""
+        path, _, query = target.partition("?")
+        return Request(method.upper(), path, query, headers, body)
+
+    @staticmethod
+    async def _write_head(writer: asyncio.StreamWriter, status: int, content_type: str) -> None:
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, 'Status')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                "Cache-Control: no-cache\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+        )
+        await writer.drain()
+
+    async def _write_json(self, writer: asyncio.StreamWriter, status: int, payload: Any) -> None:
+        await self._write_head(writer, status, "application/json")
+        writer.write(json.dumps(payload).encode("utf-8"))
+        await writer.drain()
+
+    async def _route(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        if request.method == "GET" and request.path in ("/", "/health"):
+            await self._write_json(writer, 200, {"ok": True, "requests": self.request_count})
+            return
+        if request.method == "POST" and request.path.endswith("/chat/completions"):
+            await self._openai_chat(request, writer)
+            return
+        match = _GEMINI_PATH.search(request.path)
+        if request.method == "POST" and match:
+            await self._gemini(request, writer, match["model"], stream=match["method"] == "streamGenerateContent")
+            return
+        await self._write_json(writer, 404, {"error": {"message": f"No mock for {request.method} {request.path}"}})
+
+    # Completion behaviour
+
+    def _should_fail(self, profile: ModelProfile) -> bool:
+        return profile.error_rate > 0 and self.random.random() < profile.error_rate
+
+    @staticmethod
+    def _completion_tokens(prompt: str, profile: ModelProfile) -> List[str]:
+        """Deterministic reply: echo the prompt's first words, then filler."""
+        words = ["Mock", "reply", "to:"] + prompt.split()[:8]
+        while len(words) < profile.response_tokens:
+            words.extend(_FILLER)
+        words = words[: profile.response_tokens]
+        return [word if index == 0 else " " + word for index, word in enumerate(words)]
+
+    @staticmethod
+    async def _pace(profile: ModelProfile, started: float, emitted: int) -> None:
+        """Sleep until token `emitted` is due under the profile's token rate."""
+        if profile.tokens_per_second <= 0:
+            return
+        due = started + emitted / profile.tokens_per_second
+        delay = due - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _prompt_tokens(text: str) -> int:
+        return max(1, len(text.split()))
+
+    # OpenAI chat completions
+
+    @staticmethod
+    def _openai_prompt(body: Dict[str, Any]) -> Tuple[str, str]:
+        """Return (last user message text, all message text)."""
+        texts = []
+        last_user = ""
+        for message in body.get("messages", []):
+            content = message.get("content", "")
+            if isinstance(content, list):
+                content = " ".join(part.get("text", "") for part in content if part.get("type") == "text")
+            texts.append(str(content))
+            if message.get("role") == "user":
+                last_user = str(content)
+        return last_user, " ".join(texts)
+
+    async def _openai_chat(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        body = request.json()
+        model = body.get("model", "unknown")
+        profile = self.profiles.get(model)
+        last_user, all_text = self._openai_prompt(body)
+
+        await asyncio.sleep(profile.latency_ms / 1000)
+        if self._should_fail(profile):
+            await self._write_json(
+                writer,
+                profile.error_status,
+                {"error": {"message": f"Injected {profile.error_status} for {model}", "type": "mock_error", "code": profile.error_status}},
+            )
+            return
+
+        tokens = self._completion_tokens(last_user, profile)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        usage = {
+            "prompt_tokens": self._prompt_tokens(all_text),
+            "completion_tokens": len(tokens),
+            "total_tokens": self._prompt_tokens(all_text) + len(tokens),
+        }
+
+        if not body.get("stream"):
+            await asyncio.sleep(len(tokens) / profile.tokens_per_second if profile.tokens_per_second > 0 else 0)
+            await self._write_json(
+                writer,
+                200,
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}, "finish_reason": "stop"}
+                    ],
+                    "usage": usage,
+                },
+            )
+            return
+
+        await self._write_head(writer, 200, "text/event-stream")
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> bytes:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(payload)}\n\n".encode("utf-8")
+
+        started = time.monotonic()
+        writer.write(chunk({"role": "assistant", "content": ""}))
+        for index, token in enumerate(tokens):
+            await self._pace(profile, started, index + 1)
+            writer.write(chunk({"content": token}))
+            await writer.drain()
+        writer.write(chunk({}, "stop"))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model, "choices": [], "usage": usage}
+            writer.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+        writer.write(b"data: [DONE]\n\n")
+        await writer.drain()
+
+    # Gemini generateContent
+
+    @staticmethod
+    def _gemini_prompt(body: Dict[str, Any]) -> Tuple[str, str]:
+        texts = []
+        last_user = ""
+        for content in body.get("contents", []):
+            text = " ".join(part.get("text", "") for part in content.get("parts", []) if "text" in part)
+            texts.append(text)
+            if content.get("role", "user") == "user":
+                last_user = text
+        return last_user, " ".join(texts)
+
+    async def _gemini(self, request: Request, writer: asyncio.StreamWriter, model: str, *, stream: bool) -> None:
+        body = request.json()
+        profile = self.profiles.get(model)
+        last_user, all_text = self._gemini_prompt(body)
+
+        await asyncio.sleep(profile.latency_ms / 1000)
+        if self._should_fail(profile):
+            await self._write_json(
+                writer,
+                profile.error_status,
+                {"error": {"code": profile.error_status, "message": f"Injected {profile.error_status} for {model}", "status": "UNAVAILABLE"}},
+            )
+            return
+
+        tokens = self._completion_tokens(last_user, profile)
+        prompt_tokens = self._prompt_tokens(all_text)
+
+        def response(text: str, emitted: int, finished: bool) -> Dict[str, Any]:
+            candidate: Dict[str, Any] = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+            if finished:
+                candidate["finishReason"] = "STOP"
+            return {
+                "candidates": [candidate],
+                "usageMetadata": {
+                    "promptTokenCount": prompt_tokens,
+                    "candidatesTokenCount": emitted,
+                    "totalTokenCount": prompt_tokens + emitted,
+                },
+                "modelVersion": model,
+            }
+
+        if not stream:
+            await asyncio.sleep(len(tokens) / profile.tokens_per_second if profile.tokens_per_second > 0 else 0)
+            await self._write_json(writer, 200, response("".join(tokens), len(tokens), True))
+            return
+
+        await self._write_head(writer, 200, "text/event-stream")
+        started = time.monotonic()
+        for index, token in enumerate(tokens):
+            await self._pace(profile, started, index + 1)
+            payload = response(token, index + 1, index == len(tokens) - 1)
+            writer.write(f"data: {json.dumps(payload)}\r\n\r\n".encode("utf-8"))
+            await writer.drain()
+
+
+async def start_mock_llm(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    profiles_path: Optional[str] = None,
+    seed: int = 0,
+) -> MockLLMServer:
+    """Start a server in the running event loop; call `close()` when done."""
+    profiles = Profiles.load(profiles_path or os.environ.get("MOCK_LLM_PROFILES"))
+    return await MockLLMServer(profiles, seed=seed).start(host, port)
+
+
+def env_for(server: MockLLMServer, host: str = DEFAULT_HOST) -> Dict[str, str]:
+    """Env vars that point the Next.js app at `server`."""
+    base = f"http://{host}:{server.port}"
+    return {
+        "A4F_BASE_URL": f"{base}/v1",
+        "GROQ_BASE_URL": f"{base}/v1",
+        "OPENROUTER_BASE_URL": f"{base}/v1",
+        "GOOGLE_API_BASE_URL": base,
+    }
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = await start_mock_llm(args.host, args.port, args.profiles, args.seed)
+    print(f"Mock LLM listening on http://{args.host}:{server.port}")
+    for name, value in env_for(server, args.host).items():
+        print(f"  {name}={value}")
+    await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="harness.mock_llm", description="Local OpenAI/Gemini-compatible mock provider")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--profiles", help="JSON file of per-model profiles (default: $MOCK_LLM_PROFILES)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for error injection")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Request interception helpers for failure and latency injection.
+
+Every helper takes a Page or BrowserContext and one of the app's API routes
+(by short name or as a glob), so cases can put the UI under a slow or
+failing backend deterministically:
+
+    from harness import network
+
+    await network.delay(page, "battle", 8000)            # slow provider fan-out
+    await network.fail(page, "chats", 500)               # history fetch breaks
+    await network.rate_limit(page, "battle")             # app-shaped 429
+    await network.drop(page, "votes")                    # connection reset
+    await network.pace_stream(context, "chat_stream", frame_delay_ms=250)
+    await network.throttle_bandwidth(page, download_kbps=400, latency_ms=300)
+
+`route()` cannot stream a fulfilled body, so stream pacing is done in the
+page instead: an init script wraps `fetch` and re-emits matching response
+bodies frame by frame (SSE) or in fixed-size chunks, with a delay between
+each. It must be installed before the page loads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Union
+
+from playwright import async_api
+
+Target = Union[async_api.Page, async_api.BrowserContext]
+
+ROUTES: Dict[str, str] = {
+    "battle": "**/api/a4f-battle",
+    "chat_stream": "**/api/chat-stream",
+    "chats": "**/api/chats**",
+    "votes": "**/api/votes**",
+}
+
+
+def _pattern(route: str) -> str:
+    return ROUTES.get(route, route)
+
+
+async def _install(target: Target, route: str, handler: Any, times: Optional[int]) -> None:
+    if times is None:
+        await target.route(_pattern(route), handler)
+    else:
+        await target.route(_pattern(route), handler, times=times)
+
+
+async def delay(target: Target, route: str, ms: float, *, times: Optional[int] = None) -> None:
+    """Hold matching requests for `ms` before sending them on."""
+
+    async def handler(intercepted: async_api.Route) -> None:
+        await asyncio.sleep(ms / 1000)
+        await intercepted.continue_()
+
+    await _install(target, route, handler, times)
+
+
+async def drop(target: Target, route: str, *, error: str = "connectionreset", times: Optional[int] = None) -> None:
+    """Abort matching requests as a network error (fetch rejects in the page)."""
+
+    async def handler(intercepted: async_api.Route) -> None:
+        await intercepted.abort(error)
+
+    await _install(target, route, handler, times)
+
+
+async def respond(
+    target: Target,
+    route: str,
+    status: int,
+    body: Any,
+    *,
+    delay_ms: float = 0,
+    times: Optional[int] = None,
+) -> None:
+    """Answer matching requests with a canned JSON response."""
+
+    async def handler(intercepted: async_api.Route) -> None:
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        await intercepted.fulfill(status=status, content_type="application/json", body=json.dumps(body))
+
+    await _install(target, route, handler, times)
+
+
+async def fail(
+    target: Target,
+    route: str,
+    status: int = 500,
+    *,
+    message: str = "The AI service is temporarily unavailable. Please try again.",
+    delay_ms: float = 0,
+    times: Optional[int] = None,
+) -> None:
+    """Canned error in the app's `{ success: false, error }` shape."""
+    await respond(target, route, status, {"success": False, "error": message}, delay_ms=delay_ms, times=times)
+
+
+async def rate_limit(
+    target: Target,
+    route: str,
+    *,
+    limit: int = 100,
+    reset_in_seconds: int = 3600,
+    message: str = "Hourly rate limit exceeded. Please wait a moment before trying again.",
+    times: Optional[int] = None,
+) -> None:
+    """429 shaped like the routes' own rate-limit response."""
+    reset_at = (datetime.now(timezone.utc) + timedelta(seconds=reset_in_seconds)).isoformat()
+    body = {
+        "success": False,
+        "error": message,
+        "rateLimit": {"remaining": 0, "limit": limit, "resetAt": reset_at},
+    }
+    await respond(target, route, 429, body, times=times)
+
+
+_PACE_SCRIPT = """
+(({ pattern, frameDelayMs, chunkBytes }) => {
+  const matcher = new RegExp(pattern);
+  const originalFetch = window.fetch.bind(window);
+  const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+  window.fetch = async (...args) => {
+    const response = await originalFetch(...args);
+    const url = typeof args[0] === 'string' ? args[0] : (args[0] && args[0].url) || '';
+    if (!matcher.test(new URL(url, location.href).pathname) || !response.body) {
+      return response;
+    }
+
+    const isEventStream = (response.headers.get('content-type') || '').includes('text/event-stream');
+    const reader = response.body.getReader();
+    let pending = new Uint8Array(0);
+
+    const nextPiece = () => {
+      if (isEventStream) {
+        for (let i = 0; i + 1 < pending.length; i++) {
+          if (pending[i] === 10 && pending[i + 1] === 10) {
+            const piece = pending.slice(0, i + 2);
+            pending = pending.slice(i + 2);
+            return piece;
+          }
+        }
+        return null;
+      }
+      if (pending.length >= chunkBytes) {
+        const piece = pending.slice(0, chunkBytes);
+        pending = pending.slice(chunkBytes);
+        return piece;
+      }
+      return null;
+    };
+
+    const paced = new ReadableStream({
+      async pull(controller) {
+        while (true) {
+          const piece = nextPiece();
+          if (piece) {
+            await sleep(frameDelayMs);
+            controller.enqueue(piece);
+            return;
+          }
+          const { done, value } = await reader.read();
+          if (done) {
+            if (pending.length) {
+              await sleep(frameDelayMs);
+              controller.enqueue(pending);
+              pending = new Uint8Array(0);
+            }
+            controller.close();
+            return;
+          }
+          const merged = new Uint8Array(pending.length + value.length);
+          merged.set(pending);
+          merged.set(value, pending.length);
+          pending = merged;
+        }
+      },
+      cancel(reason) {
+        return reader.cancel(reason);
+      },
+    });
+
+    return new Response(paced, {
+      status: response.status,
+      statusText: response.statusText,
+      headers: response.headers,
+    });
+  };
+})
+"""
+
+
+def _path_regex(route: str) -> str:
+    """Turn a ROUTES glob like '**/api/chats**' into a pathname regex."""
+    path = _pattern(route).replace("**", "")
+    return "^" + "".join("\\" + char if char in ".^$*+?()[]{}|\\" else char for char in path)
+
+
+async def pace_stream(target: Target, route: str, *, frame_delay_ms: float = 200, chunk_bytes: int = 1024) -> None:
+    """
+    Re-emit matching fetch response bodies slowly: one SSE frame per
+    `frame_delay_ms` for event streams, otherwise `chunk_bytes` at a time.
+    Affects pages loaded after the call.
+    """
+    args = {"pattern": _path_regex(route), "frameDelayMs": frame_delay_ms, "chunkBytes": chunk_bytes}
+    await target.add_init_script(script=f"{_PACE_SCRIPT}({json.dumps(args)});")
+
+
+async def throttle_bandwidth(
+    page: async_api.Page,
+    *,
+    download_kbps: float,
+    upload_kbps: Optional[float] = None,
+    latency_ms: float = 0,
+) -> async_api.CDPSession:
+    """Chromium-only whole-page bandwidth and latency limits via CDP."""
+    session = await page.context.new_cdp_session(page)
+    await session.send(
+        "Network.emulateNetworkConditions",
+        {
+            "offline": False,
+            "latency": latency_ms,
+            "downloadThroughput": download_kbps * 1024 / 8,
+            "uploadThroughput": (upload_kbps if upload_kbps is not None else download_kbps) * 1024 / 8,
+        },
+    )
+    return session
+
+
+async def clear(target: Target, route: Optional[str] = None) -> None:
+    """Remove interception for one route, or all of them."""
+    if route is None:
+        for pattern in ROUTES.values():
+            await target.unroute(pattern)
+    else:
+        await target.unroute(_pattern(route))
@@ -0,0 +1,324 @@
+"""
+Case discovery, loading and execution against a shared browser.
+
+Each generated case calls `async_api.async_playwright().start()` and
+`pw.chromium.launch(...)` itself. Instead of editing 45 files, the runner
+swaps the module-level `async_api` name for a shim whose playwright/browser
+objects are thin wrappers around the worker's real browser: `launch()` hands
+back the shared browser, `new_context()` creates a real context, and
+`close()`/`stop()` only clean up what the case itself opened.
+"""
+
+from __future__ import annotations
+
+import ast
+import asyncio
+import json
+import os
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from playwright import async_api
+
+from .auth import ensure_storage_state, install_testing_token, needs_auth
+from .mock_llm import env_for, start_mock_llm
+from .schedule import load_durations, longest_first
+from .vitals import VitalsCollector
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+REPORT_PATH = SUITE_DIR / "tmp" / "harness_report.json"
+TESTSPRITE_RESULTS_PATH = SUITE_DIR / "tmp" / "test_results.json"
+
+# Same flags the generated cases use, minus --single-process: one renderer
+# process shared by many contexts would serialize every case on it.
+BROWSER_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+]
+
+ContextHook = Callable[[async_api.BrowserContext], Awaitable[None]]
+
+
+@dataclass
+class Case:
+    """A single generated test case file."""
+
+    name: str
+    path: Path
+
+
+@dataclass
+class CaseResult:
+    """Outcome of one case run."""
+
+    name: str
+    passed: bool
+    wall_time: float
+    error: Optional[str] = None
+
+
+@dataclass
+class SuiteConfig:
+    """Options shared by every case in a run."""
+
+    headless: bool = True
+    base_url: str = "http://localhost:3000"
+    # Each worker owns one browser; cases never share a context.
+    workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+    # Extra keyword arguments merged into every browser.new_context() call.
+    context_options: Dict[str, Any] = field(default_factory=dict)
+    # Awaited with each new context before the case gets to use it.
+    context_hooks: List[ContextHook] = field(default_factory=list)
+    report_path: Optional[Path] = REPORT_PATH
+    # Port for an in-process mock provider server (see mock_llm); None = off.
+    mock_llm_port: Optional[int] = None
+    # Sign in once and start authenticated cases from the saved storageState.
+    auth: bool = False
+    storage_state: Optional[Path] = None
+    # Collects Web Vitals for every page visited; None = off.
+    vitals: Optional[VitalsCollector] = None
+
+    def context_options_for(self, case: "Case") -> Dict[str, Any]:
+        options = dict(self.context_options)
+        if self.storage_state is not None and needs_auth(case.name):
+            options.setdefault("storage_state", str(self.storage_state))
+        return options
+
+
+def discover_cases(root: Path = SUITE_DIR, pattern: str = "TC*.py", keyword: Optional[str] = None) -> List[Case]:
+    """Find case files under `root`, sorted by file name."""
+    cases = [Case(name=path.stem, path=path) for path in sorted(root.glob(pattern))]
+    if keyword:
+        cases = [case for case in cases if keyword.lower() in case.name.lower()]
+    return cases
+
+
+def _is_entry_point(node: ast.stmt) -> bool:
+    """True for a top-level `asyncio.run(...)` statement."""
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def load_case(case: Case) -> Dict[str, Any]:
+    """
+    Execute a case file without its `asyncio.run(run_test())` line and
+    return the resulting module namespace.
+    """
+    tree = ast.parse(case.path.read_text(encoding="utf-8"), filename=str(case.path))
+    tree.body = [node for node in tree.body if not _is_entry_point(node)]
+    namespace: Dict[str, Any] = {"__name__": f"testsprite_case_{case.name}", "__file__": str(case.path)}
+    exec(compile(tree, str(case.path), "exec"), namespace)
+    if "run_test" not in namespace:
+        raise RuntimeError(f"{case.path.name} does not define run_test()")
+    return namespace
+
+
+class _BrowserShim:
+    """Stands in for the browser a case launches; backed by the shared one."""
+
+    def __init__(self, browser: async_api.Browser, config: SuiteConfig, case: Case):
+        self._browser = browser
+        self._config = config
+        self._case = case
+        self._options = config.context_options_for(case)
+        self.contexts: List[async_api.BrowserContext] = []
+
+    async def new_context(self, **kwargs: Any) -> async_api.BrowserContext:
+        context = await self._browser.new_context(**{**self._options, **kwargs})
+        self.contexts.append(context)
+        if self._config.vitals is not None:
+            await self._config.vitals.install(context, self._case.name)
+            self._flush_vitals_on_close(context)
+        for hook in self._config.context_hooks:
+            await hook(context)
+        return context
+
+    async def new_page(self, **kwargs: Any) -> async_api.Page:
+        context = await self.new_context(**kwargs)
+        return await context.new_page()
+
+    def _flush_vitals_on_close(self, context: async_api.BrowserContext) -> None:
+        """
+        Read the open pages' vitals whenever the context is closed. Cases
+        close their own context in a `finally`, before the shim's close(),
+        so flushing there would find no pages left.
+        """
+        vitals = self._config.vitals
+        case = self._case.name
+        close = context.close
+
+        async def close_after_flush(**kwargs: Any) -> None:
+            try:
+                await vitals.flush(context, case)
+            except async_api.Error:
+                pass
+            await close(**kwargs)
+
+        context.close = close_after_flush  # type: ignore[method-assign]
+
+    async def close(self) -> None:
+        for context in self.contexts:
+            try:
+                await context.close()
+            except async_api.Error:
+                pass
+        self.contexts.clear()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._browser, name)
+
+
+class _BrowserTypeShim:
+    def __init__(self, browser: _BrowserShim):
+        self._browser = browser
+
+    async def launch(self, **_: Any) -> _BrowserShim:
+        return self._browser
+
+
+class _PlaywrightShim:
+    def __init__(self, browser: _BrowserShim):
+        self.chromium = _BrowserTypeShim(browser)
+
+    async def start(self) -> "_PlaywrightShim":
+        return self
+
+    async def stop(self) -> None:
+        pass
+
+    async def __aenter__(self) -> "_PlaywrightShim":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        pass
+
+
+class _AsyncApiShim:
+    """`playwright.async_api` with async_playwright() bound to a shared browser."""
+
+    def __init__(self, browser: _BrowserShim):
+        self._playwright = _PlaywrightShim(browser)
+
+    def async_playwright(self) -> _PlaywrightShim:
+        return self._playwright
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(async_api, name)
+
+
+async def run_case(browser: async_api.Browser, case: Case, config: SuiteConfig) -> CaseResult:
+    """Run one case against `browser`, always closing the contexts it opened."""
+    shim = _BrowserShim(browser, config, case)
+    started = time.perf_counter()
+    try:
+        namespace = load_case(case)
+        namespace["async_api"] = _AsyncApiShim(shim)
+        await namespace["run_test"]()
+        return CaseResult(case.name, True, time.perf_counter() - started)
+    except Exception as error:
+        message = f"{type(error).__name__}: {error}".strip()
+        traceback.print_exc()
+        return CaseResult(case.name, False, time.perf_counter() - started, message)
+    finally:
+        await shim.close()
+
+
+async def _worker(
+    index: int,
+    pw: async_api.Playwright,
+    queue: "asyncio.Queue[Case]",
+    config: SuiteConfig,
+    results: Dict[str, CaseResult],
+) -> None:
+    """Launch one browser and keep pulling cases until the queue is empty."""
+    launch_started = time.perf_counter()
+    browser = await pw.chromium.launch(headless=config.headless, args=BROWSER_ARGS)
+    print(f"[worker {index}] browser launched in {time.perf_counter() - launch_started:.2f}s")
+    try:
+        while True:
+            try:
+                case = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result = await run_case(browser, case, config)
+            print(f"[worker {index}] {_format_line(result)}")
+            results[case.name] = result
+    finally:
+        await browser.close()
+
+
+async def run_suite(cases: List[Case], config: Optional[SuiteConfig] = None) -> List[CaseResult]:
+    """
+    Run `cases` across `config.workers` browsers, longest past duration
+    first. Results are returned in the order `cases` was given.
+    """
+    config = config or SuiteConfig()
+    durations = load_durations(config.report_path or REPORT_PATH, TESTSPRITE_RESULTS_PATH)
+    queue: "asyncio.Queue[Case]" = asyncio.Queue()
+    for case in longest_first(cases, durations, name=lambda case: case.name):
+        queue.put_nowait(case)
+
+    mock_llm = None
+    if config.mock_llm_port is not None:
+        mock_llm = await start_mock_llm(port=config.mock_llm_port)
+        print("Mock LLM running; start the app with:")
+        for name, value in env_for(mock_llm).items():
+            print(f"  {name}={value}")
+
+    results: Dict[str, CaseResult] = {}
+    workers = max(1, min(config.workers, len(cases)))
+    try:
+        async with async_api.async_playwright() as pw:
+            if config.auth:
+                config.storage_state = await ensure_storage_state(pw, config.base_url)
+                config.context_hooks.append(install_testing_token)
+            await asyncio.gather(*(_worker(index, pw, queue, config, results) for index in range(workers)))
+    finally:
+        if mock_llm is not None:
+            await mock_llm.close()
+
+    ordered = [results[case.name] for case in cases if case.name in results]
+    if config.report_path:
+        write_report(ordered, config.report_path)
+    if config.vitals is not None:
+        config.vitals.write_report()
+    return ordered
+
+
+def _format_line(result: CaseResult) -> str:
+    status = "PASS" if result.passed else "FAIL"
+    return f"{status}  {result.wall_time:7.2f}s  {result.name}"
+
+
+def format_summary(results: List[CaseResult], elapsed: Optional[float] = None) -> str:
+    """Per-case wall time table plus totals."""
+    lines = [_format_line(result) for result in results]
+    passed = sum(1 for result in results if result.passed)
+    total_time = sum(result.wall_time for result in results)
+    totals = f"{passed}/{len(results)} passed, {total_time:.2f}s total case time"
+    if elapsed is not None:
+        totals += f", {elapsed:.2f}s elapsed"
+    lines.append(totals)
+    return "\n".join(lines)
+
+
+def write_report(results: List[CaseResult], path: Path) -> None:
+    """Write machine-readable results next to the testsprite artifacts."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps([asdict(result) for result in results], indent=2), encoding="utf-8")
+
+
+def run(cases: List[Case], config: Optional[SuiteConfig] = None) -> List[CaseResult]:
+    """Synchronous entry point used by the CLI."""
+    return asyncio.run(run_suite(cases, config))
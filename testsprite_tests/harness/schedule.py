@@ -0,0 +1,71 @@
+"""
+Case ordering for parallel runs.
+
+Cases are handed out longest-first (LPT scheduling) so a slow case never
+starts last and leaves the other workers idle. Past durations come from the
+harness's own report when available, otherwise from the testsprite
+`tmp/test_results.json` export (`modified - created` of each test run).
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from typing import Callable, Dict, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def normalize_name(name: str) -> str:
+    """'TC009-Chat History Search, ...' and 'TC009_Chat_History_Search_...' map to the same key."""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _load_json(path: Path) -> list:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+def load_durations(report_path: Path, testsprite_path: Path) -> Dict[str, float]:
+    """Past duration in seconds per normalized case name."""
+    durations: Dict[str, float] = {}
+
+    for entry in _load_json(testsprite_path):
+        try:
+            elapsed = _parse_timestamp(entry["modified"]) - _parse_timestamp(entry["created"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        durations[normalize_name(entry.get("title", ""))] = max(elapsed.total_seconds(), 0.0)
+
+    # Harness timings are measured directly, so they win over the export.
+    for entry in _load_json(report_path):
+        if isinstance(entry.get("wall_time"), (int, float)):
+            durations[normalize_name(entry.get("name", ""))] = float(entry["wall_time"])
+
+    return durations
+
+
+def longest_first(items: Sequence[T], durations: Dict[str, float], name: Callable[[T], str]) -> List[T]:
+    """
+    Order items by descending past duration. Items with no history are
+    assumed to take the median known duration.
+    """
+    keys = [normalize_name(name(item)) for item in items]
+    known = [durations[key] for key in keys if key in durations]
+    default = median(known) if known else 0.0
+
+    def expected(item: T) -> float:
+        return durations.get(normalize_name(name(item)), default)
+
+    # sorted() is stable, so equal estimates keep discovery order.
+    return sorted(items, key=expected, reverse=True)
@@ -0,0 +1,77 @@
+"""
+Runner tests against in-memory stand-ins for the browser objects:
+
+    python -m pytest harness/test_runner.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from harness.runner import Case, SuiteConfig, _BrowserShim  # noqa: E402
+from harness.vitals import VitalsCollector  # noqa: E402
+
+SNAPSHOT = {"url": "http://localhost:3000/", "lcp": 900, "cls": 0.01, "inp": 40, "longTasks": 1, "longTaskMs": 20, "heap": 0}
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.reported = False
+
+    async def evaluate(self, _script: str) -> Optional[Dict[str, Any]]:
+        # Same contract as the observer script: one snapshot per document
+        if self.reported:
+            return None
+        self.reported = True
+        return dict(SNAPSHOT)
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.pages: List[FakePage] = []
+
+    async def expose_binding(self, _name: str, _callback: Any) -> None:
+        pass
+
+    async def add_init_script(self, script: str) -> None:
+        pass
+
+    async def new_page(self) -> FakePage:
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+    async def close(self) -> None:
+        self.pages.clear()
+
+
+class FakeBrowser:
+    async def new_context(self, **_: Any) -> FakeContext:
+        return FakeContext()
+
+
+def test_pages_open_when_the_case_closes_its_context_are_recorded():
+    vitals = VitalsCollector()
+    config = SuiteConfig(vitals=vitals, report_path=None)
+    shim = _BrowserShim(FakeBrowser(), config, Case(name="TC000_Fake", path=Path("TC000_Fake.py")))
+
+    async def case_body() -> None:
+        context = await shim.new_context()
+        try:
+            await context.new_page()
+        finally:
+            # Generated cases close their own context before the shim does
+            await context.close()
+        await shim.close()
+
+    asyncio.run(case_body())
+
+    assert len(vitals.records) == 1
+    assert vitals.records[0].case == "TC000_Fake"
+    assert vitals.records[0].lcp_ms == 900
@@ -0,0 +1,183 @@
+"""
+Web Vitals capture for every page a case visits.
+
+An init script installs PerformanceObservers in each document (LCP, CLS,
+INP from Event Timing, long tasks) and reports a snapshot through an exposed
+binding when the document is hidden or unloaded. Pages still open when the
+case ends are read directly before their context closes. Records go to
+`tmp/vitals_report.json` and are checked against thresholds:
+
+    python -m harness --vitals
+    python -m harness --vitals --vitals-thresholds thresholds.json
+
+A threshold file overrides any of DEFAULT_THRESHOLDS, e.g.
+`{"lcp_ms": 3000, "long_tasks": 10}`. Client-side navigations (next/link)
+stay in one document, so their metrics are attributed to the URL the
+document was loaded with.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from playwright import async_api
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+VITALS_REPORT_PATH = SUITE_DIR / "tmp" / "vitals_report.json"
+
+# "Good" boundaries from web.dev for the Core Web Vitals; the rest are
+# budgets for this app (AnimatedBackground, framer-motion, the BattleCard
+# typewriter).
+DEFAULT_THRESHOLDS: Dict[str, float] = {
+    "lcp_ms": 2500,
+    "cls": 0.1,
+    "inp_ms": 200,
+    "long_tasks": 20,
+    "long_task_ms": 1000,
+    "heap_mb": 150,
+}
+
+_BINDING = "__harnessReportVitals"
+
+_OBSERVER_SCRIPT = """
+(() => {
+  if (window.__harnessVitals) return;
+  const vitals = window.__harnessVitals = {
+    url: location.href, lcp: 0, cls: 0, inp: 0, longTasks: 0, longTaskMs: 0, reported: false,
+  };
+  const observe = (type, callback, options = {}) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(callback))
+        .observe({ type, buffered: true, ...options });
+    } catch (error) { /* entry type not supported */ }
+  };
+
+  observe('largest-contentful-paint', (entry) => {
+    vitals.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+  });
+
+  // CLS: largest session window (shifts < 1s apart, window <= 5s).
+  let windowValue = 0, windowStart = 0, windowLast = 0;
+  observe('layout-shift', (entry) => {
+    if (entry.hadRecentInput) return;
+    if (windowValue && entry.startTime - windowLast < 1000 && entry.startTime - windowStart < 5000) {
+      windowValue += entry.value;
+    } else {
+      windowValue = entry.value;
+      windowStart = entry.startTime;
+    }
+    windowLast = entry.startTime;
+    vitals.cls = Math.max(vitals.cls, windowValue);
+  });
+
+  // INP approximation: slowest interaction seen.
+  observe('event', (entry) => {
+    if (entry.interactionId) vitals.inp = Math.max(vitals.inp, entry.duration);
+  }, { durationThreshold: 16 });
+
+  observe('longtask', (entry) => {
+    vitals.longTasks += 1;
+    vitals.longTaskMs += Math.max(0, entry.duration - 50);
+  });
+
+  window.__harnessSnapshotVitals = () => ({
+    url: vitals.url,
+    lcp: vitals.lcp,
+    cls: vitals.cls,
+    inp: vitals.inp,
+    longTasks: vitals.longTasks,
+    longTaskMs: vitals.longTaskMs,
+    heap: (performance.memory && performance.memory.usedJSHeapSize) || 0,
+  });
+
+  const report = () => {
+    if (vitals.reported || !window.%(binding)s) return;
+    vitals.reported = true;
+    window.%(binding)s(window.__harnessSnapshotVitals());
+  };
+  addEventListener('pagehide', report);
+  addEventListener('visibilitychange', () => { if (document.visibilityState === 'hidden') report(); });
+})();
+""" % {"binding": _BINDING}
+
+
+@dataclass
+class PageVitals:
+    case: str
+    url: str
+    lcp_ms: float
+    cls: float
+    inp_ms: float
+    long_tasks: int
+    long_task_ms: float
+    heap_mb: float
+
+    @classmethod
+    def from_snapshot(cls, case: str, snapshot: Dict[str, Any]) -> "PageVitals":
+        return cls(
+            case=case,
+            url=snapshot.get("url", ""),
+            lcp_ms=round(float(snapshot.get("lcp") or 0), 1),
+            cls=round(float(snapshot.get("cls") or 0), 4),
+            inp_ms=round(float(snapshot.get("inp") or 0), 1),
+            long_tasks=int(snapshot.get("longTasks") or 0),
+            long_task_ms=round(float(snapshot.get("longTaskMs") or 0), 1),
+            heap_mb=round(float(snapshot.get("heap") or 0) / (1024 * 1024), 2),
+        )
+
+
+class VitalsCollector:
+    """Installs the observers per context and gathers the per-page records."""
+
+    def __init__(self, thresholds: Optional[Dict[str, float]] = None):
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.records: List[PageVitals] = []
+
+    @classmethod
+    def from_file(cls, path: Optional[Path]) -> "VitalsCollector":
+        if path is None:
+            return cls()
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    async def install(self, context: async_api.BrowserContext, case: str) -> None:
+        async def on_report(_source: Dict[str, Any], snapshot: Dict[str, Any]) -> None:
+            self.records.append(PageVitals.from_snapshot(case, snapshot))
+
+        await context.expose_binding(_BINDING, on_report)
+        await context.add_init_script(script=_OBSERVER_SCRIPT)
+
+    async def flush(self, context: async_api.BrowserContext, case: str) -> None:
+        """Read pages that are still open before their context closes."""
+        for page in context.pages:
+            try:
+                snapshot = await page.evaluate(
+                    "() => window.__harnessVitals && !window.__harnessVitals.reported"
+                    " ? (window.__harnessVitals.reported = true, window.__harnessSnapshotVitals()) : null"
+                )
+            except async_api.Error:
+                continue
+            if snapshot:
+                self.records.append(PageVitals.from_snapshot(case, snapshot))
+
+    def violations(self) -> List[str]:
+        problems = []
+        for record in self.records:
+            for metric, limit in self.thresholds.items():
+                value = getattr(record, metric, None)
+                if value is not None and value > limit:
+                    problems.append(f"{record.case} {record.url}: {metric}={value} > {limit}")
+        return problems
+
+    def write_report(self, path: Path = VITALS_REPORT_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "thresholds": self.thresholds,
+            "violations": self.violations(),
+            "pages": [asdict(record) for record in self.records],
+        }
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")